@@ -1 +1 @@
-__all__ = ['adaptable_heap_priority_queue', 'heap_priority_queue', 'sorted_priority_queue', 'unsorted_priority_queue']
+__all__ = ['adaptable_heap_priority_queue', 'array_sorted_priority_queue', 'bucket_priority_queue', 'concurrent_priority_queue', 'fast_heap_priority_queue', 'heap_priority_queue', 'indexed_priority_queue', 'instrumented_priority_queue', 'pairing_heap_priority_queue', 'sorted_priority_queue', 'top_k_priority_queue', 'unsorted_priority_queue']
@@ -20,10 +20,15 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from ch09.heap_priority_queue import HeapPriorityQueue
+from exceptions import Empty
 
 
 class AdaptableHeapPriorityQueue(HeapPriorityQueue):
-    """A locator-based priority queue implemented with a binary heap."""
+    """A locator-based priority queue implemented with a binary heap.
+
+    The heap arity can be raised as for HeapPriorityQueue, e.g. AdaptableHeapPriorityQueue(arity=4);
+    a shallower heap makes update, which mostly moves entries up, cheaper.
+    """
 
     # ------------------------------ nested Locator class ------------------------------
     class Locator(HeapPriorityQueue._Item):
@@ -48,6 +53,18 @@ class AdaptableHeapPriorityQueue(HeapPriorityQueue):
         else:
             self._downheap(j)
 
+    def _add_items(self, items):
+        for j, token in enumerate(items, len(self._data)):
+            token._index = j  # locators keep their index as they are moved by the heap
+        super()._add_items(items)
+
+    def _own_items(self, items):
+        # 来自另一个自适应队列的 locator 保持有效; 普通的 _Item 需要包装成新的 locator。
+        # (检查类级别的 Locator: 插桩后的队列会为每个实例派生自己的 Locator 子类)
+        return [item if isinstance(item, AdaptableHeapPriorityQueue.Locator)
+                else self.Locator(item._key, item._value, None)
+                for item in items]
+
     # ------------------------------ public behaviors ------------------------------
     def add(self, key, value):
         """Add a key-value pair."""
@@ -80,6 +97,46 @@ class AdaptableHeapPriorityQueue(HeapPriorityQueue):
             self._bubble(j)  # fix item displaced by the swap
         return (loc._key, loc._value)
 
+    # ------------------------------ bulk operations ------------------------------
+    def add_many(self, pairs):
+        """Add every (k,v) tuple of an iterable, and return the list of their locators."""
+        tokens = [self.Locator(k, v, None) for k, v in pairs]  # indices are set by _add_items
+        self._add_items(tokens)
+        return tokens
+
+    def pushpop(self, key, value):
+        """Add a key-value pair, then remove and return (k,v) tuple with minimum key."""
+        return self.pushpop_locator(key, value)[0]
+
+    def pushpop_locator(self, key, value):
+        """Add a key-value pair, then remove and return (k,v) tuple with minimum key.
+
+        Return a ((k,v), token) tuple, where token is the locator of the added pair,
+        or None if the added pair is the one returned.
+        """
+        if self._data and self._data[0]._key < key:
+            token = self.Locator(key, value, 0)
+            return (self._replace_min(token), token)
+        return ((key, value), None)
+
+    def replace(self, key, value):
+        """Remove and return (k,v) tuple with minimum key, then add a key-value pair.
+
+        Raise Empty exception if empty.
+        """
+        return self.replace_locator(key, value)[0]
+
+    def replace_locator(self, key, value):
+        """Remove and return (k,v) tuple with minimum key, then add a key-value pair.
+
+        Return a ((k,v), token) tuple, where token is the locator of the added pair.
+        Raise Empty exception if empty.
+        """
+        if self.is_empty():
+            raise Empty('Priority queue is empty.')
+        token = self.Locator(key, value, 0)
+        return (self._replace_min(token), token)
+
 
 if __name__ == '__main__':
     a = dict()
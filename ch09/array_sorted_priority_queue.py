@@ -0,0 +1,99 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_right
+from ch09.priority_queue_base import PriorityQueueBase
+from exceptions import Empty
+
+
+class ArraySortedPriorityQueue(PriorityQueueBase):
+    """A min-oriented priority queue implemented with a sorted array.
+
+    Keys and values are kept in two parallel Python lists, sorted by key. The
+    insertion point is found by binary search, and the insertion itself is one
+    list.insert, whose element shifting runs in C. Removed minimums are not
+    deleted from the front of the lists; instead the index _front of the first
+    live item advances, as the head of a ring buffer does, and the dead prefix is
+    discarded once it is as long as the live part. So remove_min is O(1) amortized.
+
+    Items with equal keys are removed in the order they were added.
+    """
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _compact(self):
+        """Discard the prefix of removed items."""
+        del self._keys[:self._front]
+        del self._values[:self._front]
+        self._front = 0
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self):
+        """Create a new empty Priority Queue."""
+        self._keys = []
+        self._values = []
+        self._front = 0  # index of the item with minimum key
+
+    def __len__(self):
+        """Return the number of items in the priority queue."""
+        return len(self._keys) - self._front
+
+    def add(self, key, value):
+        """Add a key-value pair."""
+        # 时间复杂度: O(log n) 次比较, 加上 O(n) 的元素移动(由C实现的 list.insert 完成)
+        j = bisect_right(self._keys, key, self._front)  # after any equal keys
+        self._keys.insert(j, key)
+        self._values.insert(j, value)
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: O(1)
+        if self.is_empty():
+            raise Empty('Priority queue is empty.')
+        return (self._keys[self._front], self._values[self._front])
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: 均摊 O(1)
+        if self.is_empty():
+            raise Empty('Priority queue is empty.')
+        j = self._front
+        key, value = self._keys[j], self._values[j]
+        self._values[j] = None  # do not keep the value alive
+        self._front = j + 1
+        if 2 * self._front >= len(self._keys):
+            self._compact()
+        return (key, value)
+
+
+if __name__ == '__main__':
+    pq = ArraySortedPriorityQueue()
+    for k, v in [(5, 'A'), (9, 'C'), (3, 'B'), (7, 'Q'), (5, 'D')]:
+        pq.add(k, v)
+    print(pq.remove_min(), pq._front, pq._keys)
+    while not pq.is_empty():
+        print(pq.remove_min(), end=' ')
+    print()
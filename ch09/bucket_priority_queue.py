@@ -0,0 +1,244 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch09.priority_queue_base import PriorityQueueBase
+from exceptions import Empty
+
+_INFINITY = float('inf')
+
+
+class BucketPriorityQueue(PriorityQueueBase):
+    """A min-oriented priority queue for monotone, non-negative integer keys, using buckets.
+
+    Monotone means that no key smaller than the most recently removed minimum may
+    be added, as is the case for the distances of Dijkstra's algorithm. A key of
+    float('inf') is also allowed; such items are kept in a separate bucket.
+
+    Two bucket layouts are supported:
+      radix heap (default)  bucket 0 holds keys equal to the last minimum, and bucket
+                            i > 0 holds keys whose highest bit that differs from the
+                            last minimum is bit i-1. An item only ever moves to lower
+                            buckets, so remove_min costs O(log C) amortized, where C
+                            is the largest key.
+      Dial (span=C)         every key lies in [last, last + C], e.g. C is the largest
+                            edge weight; a circular array of C+1 buckets holds one key
+                            value each, so add is O(1) and remove_min scans at most C
+                            buckets.
+    """
+
+    # ------------------------------ nested _Item class ------------------------------
+    class _Item(PriorityQueueBase._Item):
+        """Item that knows the bucket holding it and its index there."""
+        __slots__ = '_bucket', '_index'
+
+        def __init__(self, k, v):
+            super().__init__(k, v)
+            self._bucket = None
+            self._index = None
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _validate_key(self, k):
+        """Raise ValueError if key k would break monotonicity (or the span in Dial mode)."""
+        if k < self._last:
+            raise ValueError('key {0} is smaller than the last minimum {1}'.format(k, self._last))
+        if self._span is not None and k != _INFINITY and k > self._last + self._span:
+            raise ValueError('key {0} exceeds the span of the buckets'.format(k))
+
+    def _place(self, item):
+        """Put item into the bucket for its key."""
+        k = item._key
+        if k == _INFINITY:
+            bucket = self._infinite
+        elif self._span is None:
+            b = (k ^ self._last).bit_length()
+            while b >= len(self._buckets):
+                self._buckets.append([])
+            bucket = self._buckets[b]
+        else:
+            bucket = self._buckets[k % (self._span + 1)]
+        item._bucket = bucket
+        item._index = len(bucket)
+        bucket.append(item)
+
+    def _unplace(self, item):
+        """Remove item from its bucket in O(1) time, moving the bucket's last item into its place."""
+        bucket = item._bucket
+        last = bucket.pop()
+        if last is not item:
+            bucket[item._index] = last
+            last._index = item._index
+        item._bucket = item._index = None
+
+    def _first_bucket(self):
+        """Return index of the first nonempty bucket (or None if all finite buckets are empty)."""
+        buckets = self._buckets
+        if self._span is None:
+            for b in range(len(buckets)):
+                if buckets[b]:
+                    return b
+        else:
+            start = self._last % len(buckets)
+            for step in range(len(buckets)):  # circular scan from the bucket of the last minimum
+                b = (start + step) % len(buckets)
+                if buckets[b]:
+                    return b
+        return None
+
+    def _min_item(self):
+        """Return an item with minimum key, without changing the queue."""
+        b = self._first_bucket()
+        if b is None:
+            return self._infinite[-1]
+        if self._span is None and b > 0:
+            return min(self._buckets[b])  # bucket b may hold several keys
+        return self._buckets[b][-1]  # every key of this bucket is the minimum
+
+    def _settle(self):
+        """Advance the last minimum to the minimum key, and return a bucket holding only minimum keys."""
+        b = self._first_bucket()
+        if b is None:
+            return self._infinite  # only infinite keys are left
+        buckets = self._buckets
+        if self._span is None:
+            if b > 0:  # redistribute bucket b around its minimum key
+                items = buckets[b]
+                buckets[b] = []
+                self._last = min(items)._key
+                for item in items:
+                    self._place(item)  # each item moves to a lower bucket
+                b = 0
+        else:
+            self._last += (b - self._last) % len(buckets)
+        return buckets[b]
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self, span=None):
+        """Create a new empty Priority Queue.
+
+        span  if None (default), use a radix heap; otherwise use Dial's circular array
+              of span+1 buckets, which requires every key to lie within span of the
+              last minimum
+        """
+        self._span = span
+        self._buckets = [[]] if span is None else [[] for _ in range(span + 1)]
+        self._infinite = []  # items with key float('inf')
+        self._last = 0  # the last minimum removed; keys may not be smaller
+        self._n = 0
+
+    def __len__(self):
+        """Return the number of items in the priority queue."""
+        return self._n
+
+    def add(self, key, value):
+        """Add a key-value pair."""
+        # 时间复杂度: O(1)
+        self._validate_key(key)
+        self._place(self._Item(key, value))
+        self._n += 1
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        if self._n == 0:
+            raise Empty('Priority queue is empty.')
+        item = self._min_item()
+        return (item._key, item._value)
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: 基数堆为均摊 O(log C); Dial 模式为 O(C)，C 是键的跨度
+        if self._n == 0:
+            raise Empty('Priority queue is empty.')
+        item = self._settle()[-1]
+        self._unplace(item)
+        self._n -= 1
+        return (item._key, item._value)
+
+
+class AdaptableBucketPriorityQueue(BucketPriorityQueue):
+    """A locator-based bucket priority queue for monotone integer keys.
+
+    Its API matches AdaptableHeapPriorityQueue, so it can be passed as pq_type to
+    ch14.shortest_paths.shortest_path_lengths when edge weights are integers. Use
+    functools.partial(AdaptableBucketPriorityQueue, span=C) for Dial's algorithm
+    with integer edge weights of at most C.
+    """
+
+    # ------------------------------ nested Locator class ------------------------------
+    class Locator(BucketPriorityQueue._Item):
+        """Token for locating an entry of the priority queue."""
+        __slots__ = '_container'
+
+        def __init__(self, k, v, container):
+            super().__init__(k, v)
+            self._container = container
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _validate(self, loc):
+        """Raise ValueError unless loc locates an entry of this queue."""
+        if loc._container is not self or loc._bucket is None:
+            raise ValueError('Invalid locator')
+
+    # ------------------------------ public behaviors ------------------------------
+    def add(self, key, value):
+        """Add a key-value pair, and return its Locator."""
+        # 时间复杂度: O(1)
+        self._validate_key(key)
+        token = self.Locator(key, value, self)
+        self._place(token)
+        self._n += 1
+        return token
+
+    def update(self, loc, newkey, newval):
+        """Update the key and value for the entry identified by Locator loc."""
+        # 时间复杂度: O(1)
+        self._validate(loc)
+        self._validate_key(newkey)
+        self._unplace(loc)
+        loc._key = newkey
+        loc._value = newval
+        self._place(loc)
+
+    def remove(self, loc):
+        """Remove and return the (k,v) pair identified by Locator loc."""
+        # 时间复杂度: O(1)
+        self._validate(loc)
+        self._unplace(loc)
+        self._n -= 1
+        return (loc._key, loc._value)
+
+
+if __name__ == '__main__':
+    for span in (None, 10):
+        pq = AdaptableBucketPriorityQueue(span)
+        locs = [pq.add(k, 'v%d' % k) for k in (5, 0, 9, 3, 7)]
+        inf = pq.add(float('inf'), 'far')
+        print(pq.remove_min(), end=' ')
+        pq.update(locs[2], 4, 'v9->4')
+        pq.update(inf, 8, 'far->8')
+        while not pq.is_empty():
+            print(pq.remove_min(), end=' ')
+        print()
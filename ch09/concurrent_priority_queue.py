@@ -0,0 +1,235 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from collections import deque
+from itertools import count
+from threading import Condition, Lock
+
+from ch09.fast_heap_priority_queue import FastHeapPriorityQueue
+from ch09.priority_queue_base import PriorityQueueBase
+from exceptions import Empty, Full
+
+
+class BlockingPriorityQueue(PriorityQueueBase):
+    """A thread-safe priority queue in which get waits until an item is available.
+
+    Items are kept in a FastHeapPriorityQueue under the key (key, sequence number), so
+    items with equal keys are removed in FIFO order. Producers and consumers are
+    woken through condition variables rather than by polling. If maxsize > 0,
+    put waits while the queue is full.
+
+    Subclasses can override class variable _PQType to change the underlying queue.
+    """
+    _PQType = FastHeapPriorityQueue  # underlying priority queue; can be redefined by subclass
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _full(self):
+        return 0 < self._maxsize <= len(self._pq)
+
+    def _wait(self, condition, ready, block, timeout, error):
+        """Wait on condition (whose lock is held) until ready() is true.
+
+        Raise error at once if block is False, or once timeout seconds have passed.
+        """
+        if not block:
+            if not ready():
+                raise error
+        elif not condition.wait_for(ready, timeout):
+            raise error
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self, maxsize=0):
+        """Create a new empty Priority Queue, holding at most maxsize items if maxsize > 0."""
+        self._pq = self._PQType()
+        self._maxsize = maxsize
+        self._count = count()  # sequence numbers, for FIFO order among equal keys
+        self._mutex = Lock()
+        self._not_empty = Condition(self._mutex)
+        self._not_full = Condition(self._mutex)
+
+    def __len__(self):
+        """Return the number of items in the priority queue."""
+        with self._mutex:
+            return len(self._pq)
+
+    def put(self, key, value, block=True, timeout=None):
+        """Add a key-value pair, waiting while the queue is full.
+
+        Raise Full exception if no room became available (at once if block is
+        False, otherwise after timeout seconds unless timeout is None).
+        """
+        with self._not_full:
+            self._wait(self._not_full, lambda: not self._full(), block, timeout, Full('Priority queue is full.'))
+            self._pq.add((key, next(self._count)), value)
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        """Remove and return (k,v) tuple with minimum key, waiting while the queue is empty.
+
+        Raise Empty exception if no item became available (at once if block is
+        False, otherwise after timeout seconds unless timeout is None).
+        """
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: len(self._pq) > 0, block, timeout,
+                       Empty('Priority queue is empty.'))
+            (key, seq), value = self._pq.remove_min()
+            self._not_full.notify()
+            return (key, value)
+
+    def add(self, key, value):
+        """Add a key-value pair (raise Full exception if the queue is full)."""
+        self.put(key, value, block=False)
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        with self._mutex:
+            (key, seq), value = self._pq.min()  # may raise Empty
+            return (key, value)
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        return self.get(block=False)
+
+
+class AsyncPriorityQueue(PriorityQueueBase):
+    """A priority queue for asyncio tasks, in which get can be awaited until an item is available.
+
+    As for BlockingPriorityQueue, equal keys are removed in FIFO order and, if
+    maxsize > 0, put waits while the queue is full. Waiting tasks are woken through
+    futures, in the order in which they started waiting. The queue is not
+    thread-safe; use it from the tasks of one event loop. For a timeout, wrap a
+    call in asyncio.wait_for.
+    """
+    _PQType = FastHeapPriorityQueue  # underlying priority queue; can be redefined by subclass
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _full(self):
+        return 0 < self._maxsize <= len(self._pq)
+
+    def _wakeup_next(self, waiters):
+        """Wake the first task of waiters that is still waiting."""
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def _wait(self, waiters, blocked):
+        """Wait, as one of waiters, while blocked() is true."""
+        while blocked():
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:  # the waiter itself only ever receives a result
+                waiter.cancel()  # no-op if the waiter was already woken
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                if not blocked() and not waiter.cancelled():
+                    self._wakeup_next(waiters)  # pass on the wakeup this task received
+                raise
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self, maxsize=0):
+        """Create a new empty Priority Queue, holding at most maxsize items if maxsize > 0."""
+        self._pq = self._PQType()
+        self._maxsize = maxsize
+        self._count = count()  # sequence numbers, for FIFO order among equal keys
+        self._getters = deque()  # futures of tasks waiting in get
+        self._putters = deque()  # futures of tasks waiting in put
+
+    def __len__(self):
+        """Return the number of items in the priority queue."""
+        return len(self._pq)
+
+    def put_nowait(self, key, value):
+        """Add a key-value pair (raise Full exception if the queue is full)."""
+        if self._full():
+            raise Full('Priority queue is full.')
+        self._pq.add((key, next(self._count)), value)
+        self._wakeup_next(self._getters)
+
+    def get_nowait(self):
+        """Remove and return (k,v) tuple with minimum key (raise Empty exception if empty)."""
+        (key, seq), value = self._pq.remove_min()  # may raise Empty
+        self._wakeup_next(self._putters)
+        return (key, value)
+
+    async def put(self, key, value):
+        """Add a key-value pair, waiting while the queue is full."""
+        await self._wait(self._putters, self._full)
+        self.put_nowait(key, value)
+
+    async def get(self):
+        """Remove and return (k,v) tuple with minimum key, waiting while the queue is empty."""
+        await self._wait(self._getters, self._pq.is_empty)
+        return self.get_nowait()
+
+    def add(self, key, value):
+        """Add a key-value pair (raise Full exception if the queue is full)."""
+        self.put_nowait(key, value)
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        (key, seq), value = self._pq.min()  # may raise Empty
+        return (key, value)
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        return self.get_nowait()
+
+
+if __name__ == '__main__':
+    from threading import Thread
+
+    pq = BlockingPriorityQueue()
+    consumer = Thread(target=lambda: print('thread got', pq.get(timeout=1)))
+    consumer.start()
+    pq.put(1, 'first')
+    consumer.join()
+    for v in 'abc':
+        pq.put(5, v)  # equal keys come out in FIFO order
+    print([pq.get() for _ in range(3)])
+
+
+    async def demo():
+        apq = AsyncPriorityQueue()
+        task = asyncio.ensure_future(apq.get())
+        await asyncio.sleep(0)  # the task is now waiting
+        apq.put_nowait(2, 'x')
+        print('task got', await task)
+
+    asyncio.run(demo())
@@ -0,0 +1,128 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import queue
+import sys
+from random import random
+from threading import Thread
+from time import perf_counter
+
+from ch09.concurrent_priority_queue import AsyncPriorityQueue, BlockingPriorityQueue
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 100000
+
+PRODUCERS = 4
+CONSUMERS = 4
+MAXSIZE = 1000  # bounded, so producers also contend for room
+STOP = float('inf')  # key of the sentinel that stops a consumer
+
+
+class StdlibQueue:
+    """queue.PriorityQueue adapted to the put(key, value) / get() interface, as a reference."""
+
+    def __init__(self, maxsize=0):
+        self._q = queue.PriorityQueue(maxsize)
+        self._count = iter(range(sys.maxsize))  # ties never compare values
+
+    def put(self, key, value):
+        self._q.put((key, next(self._count), value))
+
+    def get(self):
+        key, seq, value = self._q.get()
+        return (key, value)
+
+
+class StdlibAsyncQueue:
+    """asyncio.PriorityQueue adapted to the put(key, value) / get() interface, as a reference."""
+
+    def __init__(self, maxsize=0):
+        self._q = asyncio.PriorityQueue(maxsize)
+        self._count = iter(range(sys.maxsize))
+
+    async def put(self, key, value):
+        await self._q.put((key, next(self._count), value))
+
+    async def get(self):
+        key, seq, value = await self._q.get()
+        return (key, value)
+
+
+def run_threads(pq_type):
+    """Move maxN items from PRODUCERS threads to CONSUMERS threads; return items per second."""
+    pq = pq_type(MAXSIZE)
+    per_producer = maxN // PRODUCERS
+
+    def produce():
+        for j in range(per_producer):
+            pq.put(random(), j)
+
+    def consume():
+        while pq.get()[0] != STOP:
+            pass
+
+    producers = [Thread(target=produce) for _ in range(PRODUCERS)]
+    consumers = [Thread(target=consume) for _ in range(CONSUMERS)]
+    start = perf_counter()
+    for t in producers + consumers:
+        t.start()
+    for t in producers:
+        t.join()
+    for _ in consumers:
+        pq.put(STOP, None)
+    for t in consumers:
+        t.join()
+    return per_producer * PRODUCERS / (perf_counter() - start)
+
+
+async def run_tasks(pq_type):
+    """Move maxN items from PRODUCERS tasks to CONSUMERS tasks; return items per second."""
+    pq = pq_type(MAXSIZE)
+    per_producer = maxN // PRODUCERS
+
+    async def produce():
+        for j in range(per_producer):
+            await pq.put(random(), j)
+
+    async def consume():
+        while (await pq.get())[0] != STOP:
+            pass
+
+    start = perf_counter()
+    consumers = [asyncio.ensure_future(consume()) for _ in range(CONSUMERS)]
+    await asyncio.gather(*(produce() for _ in range(PRODUCERS)))
+    for _ in consumers:
+        await pq.put(STOP, None)
+    await asyncio.gather(*consumers)
+    return per_producer * PRODUCERS / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    # 生产者/消费者并发下的吞吐量(单位: 个/秒)
+    print('n = {0}, producers = {1}, consumers = {2}, maxsize = {3}'.format(maxN, PRODUCERS, CONSUMERS, MAXSIZE))
+    print('{0:<32}{1:>14}'.format('queue', 'items/s'))
+    for pq_type in (StdlibQueue, BlockingPriorityQueue):
+        print('{0:<32}{1:>14.0f}'.format('threads: ' + pq_type.__name__, run_threads(pq_type)))
+    for pq_type in (StdlibAsyncQueue, AsyncPriorityQueue):
+        print('{0:<32}{1:>14.0f}'.format('asyncio: ' + pq_type.__name__, asyncio.run(run_tasks(pq_type))))
@@ -0,0 +1,74 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import heapq
+import sys
+from random import random
+from time import perf_counter
+
+from ch09.fast_heap_priority_queue import FastHeapPriorityQueue
+from ch09.heap_priority_queue import HeapPriorityQueue
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 100000
+
+
+def run_pq(pq_type, keys):
+    """Add every key to a new pq_type, then remove them all; return elapsed time of each phase."""
+    pq = pq_type()
+    start = perf_counter()
+    for k in keys:
+        pq.add(k, None)
+    add = perf_counter() - start
+    start = perf_counter()
+    for _ in range(len(keys)):
+        pq.remove_min()
+    remove = perf_counter() - start
+    return add, remove
+
+
+def run_heapq(keys):
+    """The same workload on a list of (k,v) tuples with the heapq module."""
+    heap = []
+    start = perf_counter()
+    for k in keys:
+        heapq.heappush(heap, (k, None))
+    add = perf_counter() - start
+    start = perf_counter()
+    for _ in range(len(keys)):
+        heapq.heappop(heap)
+    remove = perf_counter() - start
+    return add, remove
+
+
+if __name__ == '__main__':
+    # add 与 remove_min 的耗时对比(单位: 秒)
+    keys = [random() for _ in range(maxN)]
+    print('n = {0}'.format(maxN))
+    print('{0:<24}{1:>10}{2:>12}'.format('priority queue', 'add', 'remove_min'))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    print('{0:<24}{1:>10.3f}{2:>12.3f}'.format('heapq', *run_heapq(keys)))
+    for pq_type in (HeapPriorityQueue, FastHeapPriorityQueue):
+        print('{0:<24}{1:>10.3f}{2:>12.3f}'.format(pq_type.__name__, *run_pq(pq_type, keys)))
+    gc.enable()
@@ -0,0 +1,64 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from random import random, randrange
+from time import perf_counter
+
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 100000
+
+ARITIES = (2, 4, 8)
+UPDATES_PER_REMOVE = (0, 1, 4, 16)  # operation mix: updates (decrease-key) per remove_min
+
+
+def run(arity, updates_per_remove):
+    """Fill an adaptable heap with maxN entries, then drain it, performing decrease-key
+    updates between removals as in Dijkstra's algorithm; return the elapsed time."""
+    start = perf_counter()
+    pq = AdaptableHeapPriorityQueue(arity=arity)
+    locators = [pq.add(1.0 + random(), j) for j in range(maxN)]
+    alive = maxN
+    while alive > 0:
+        key, j = pq.remove_min()
+        locators[j] = None
+        alive -= 1
+        for _ in range(updates_per_remove if alive > 0 else 0):
+            loc = locators[randrange(maxN)]
+            if loc is not None:
+                new_key = key + (loc._key - key) * random()  # decrease, but never below the last minimum
+                pq.update(loc, new_key, loc._value)
+    return perf_counter() - start
+
+
+if __name__ == '__main__':
+    # 不同的堆阶数(arity) 在不同操作比例下的耗时对比(单位: 秒)
+    print('n = {0}'.format(maxN))
+    print('{0:<22}'.format('updates per remove') + ''.join('{0:>10}'.format('d=%d' % d) for d in ARITIES))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    for mix in UPDATES_PER_REMOVE:
+        print('{0:<22}'.format(mix) + ''.join('{0:>10.3f}'.format(run(d, mix)) for d in ARITIES))
+    gc.enable()
@@ -0,0 +1,76 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+import tracemalloc
+from random import random
+from time import perf_counter
+
+from ch09.heap_priority_queue import HeapPriorityQueue
+from ch09.top_k_priority_queue import TopKPriorityQueue
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 1000000
+
+K = 100
+
+
+def stream(n):
+    """Generate n (key,value) tuples with random keys."""
+    for j in range(n):
+        yield (random(), j)
+
+
+def full_heap(pairs):
+    """Push every pair into a HeapPriorityQueue (keys negated), then pop the K largest."""
+    pq = HeapPriorityQueue()
+    for k, v in pairs:
+        pq.add(-k, v)
+    return [(-k, v) for k, v in (pq.remove_min() for _ in range(K))]
+
+
+def top_k(pairs):
+    """Offer every pair to a TopKPriorityQueue of capacity K."""
+    return TopKPriorityQueue(K, pairs).results()
+
+
+def measure(fn):
+    """Return elapsed time and peak traced memory (in MB) of fn over a fresh stream."""
+    tracemalloc.start()
+    start = perf_counter()
+    fn(stream(maxN))
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+if __name__ == '__main__':
+    # 流式数据取 top-k 的耗时与内存峰值对比
+    print('n = {0}, k = {1}'.format(maxN, K))
+    print('{0:<24}{1:>10}{2:>12}'.format('approach', 'time (s)', 'peak (MB)'))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    for fn in (full_heap, top_k):
+        print('{0:<24}{1:>10.3f}{2:>12.2f}'.format(fn.__name__, *measure(fn)))
+    gc.enable()
@@ -0,0 +1,128 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch09.priority_queue_base import PriorityQueueBase
+from exceptions import Empty
+
+
+class FastHeapPriorityQueue(PriorityQueueBase):
+    """A min-oriented priority queue implemented with a binary heap held in two parallel lists.
+
+    Keys are stored in _keys and values in _values, so sifting compares keys
+    directly rather than through _Item.__lt__. Sifting is iterative and moves a
+    "hole" along the path, writing each displaced entry once instead of swapping.
+    """
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _upheap(self, j):
+        """Move the entry at index j up until its parent's key is not larger."""
+        keys, values = self._keys, self._values
+        key, value = keys[j], values[j]  # entry moves out, leaving a hole at j
+        while j > 0:
+            parent = (j - 1) >> 1
+            if not key < keys[parent]:
+                break
+            keys[j] = keys[parent]  # parent drops into the hole
+            values[j] = values[parent]
+            j = parent
+        keys[j] = key
+        values[j] = value
+
+    def _downheap(self, j):
+        """Move the entry at index j down until no child has a smaller key."""
+        keys, values = self._keys, self._values
+        n = len(keys)
+        key, value = keys[j], values[j]
+        child = 2 * j + 1
+        while child < n:
+            if child + 1 < n and keys[child + 1] < keys[child]:
+                child += 1  # right child is smaller
+            if not keys[child] < key:
+                break
+            keys[j] = keys[child]  # smaller child rises into the hole
+            values[j] = values[child]
+            j = child
+            child = 2 * j + 1
+        keys[j] = key
+        values[j] = value
+
+    def _heapify(self):
+        for j in range((len(self._keys) - 2) // 2, -1, -1):  # from PARENT of last leaf to root
+            self._downheap(j)
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self, contents=()):
+        """Create a new Priority Queue.
+
+        By default, queue will be empty. If contents is given, it should be as an
+        iterable sequence of (k,v) tuples specifying the initial contents.
+        """
+        contents = list(contents)
+        self._keys = [k for k, v in contents]
+        self._values = [v for k, v in contents]
+        self._heapify()
+
+    def __len__(self):
+        """Return the number of items in the priority queue."""
+        return len(self._keys)
+
+    def add(self, key, value):
+        """Add a key-value pair to the priority queue."""
+        # 时间复杂度: O(log n)*
+        self._keys.append(key)
+        self._values.append(value)
+        self._upheap(len(self._keys) - 1)
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: O(1)
+        if not self._keys:
+            raise Empty('Priority queue is empty.')
+        return (self._keys[0], self._values[0])
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: O(log n)*
+        keys, values = self._keys, self._values
+        if not keys:
+            raise Empty('Priority queue is empty.')
+        key, value = keys.pop(), values.pop()  # last entry leaves the list
+        if keys:  # it replaces the root, which is returned
+            key, keys[0] = keys[0], key
+            value, values[0] = values[0], value
+            self._downheap(0)
+        return (key, value)
+
+
+if __name__ == '__main__':
+    pq = FastHeapPriorityQueue([(5, 'A'), (9, 'C'), (3, 'B')])
+    pq.add(7, 'Q')
+    pq.add(3, 'D')
+    print(pq._keys)
+    while not pq.is_empty():
+        print(pq.remove_min(), end=' ')
+    print()
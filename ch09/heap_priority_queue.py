@@ -24,7 +24,12 @@ from exceptions import Empty
 
 
 class HeapPriorityQueue(PriorityQueueBase):  # base class defines _Item
-    """A min-oriented priority queue implemented with a binary heap."""
+    """A min-oriented priority queue implemented with a binary heap.
+
+    More generally, the heap is d-ary: each node has up to arity children (2 by default).
+    A larger arity makes the tree shallower, so upheap is cheaper, while downheap
+    compares more children per level.
+    """
 
     # ------------------------------ nonpublic behaviors ------------------------------
     def _parent(self, j):
@@ -33,13 +38,15 @@ class HeapPriorityQueue(PriorityQueueBase):  # base class defines _Item
         :param j: 索引
         :return: 索引j对应的节点的父节点的索引
         """
-        return (j - 1) // 2
+        return (j - 1) // self._arity
 
     def _left(self, j):
-        return 2 * j + 1
+        """Return index of the first (leftmost) child of j."""
+        return self._arity * j + 1
 
     def _right(self, j):
-        return 2 * j + 2
+        """Return index of the second child of j."""
+        return self._arity * j + 2
 
     def _has_left(self, j):
         # 最大索引为 len(self._data)-1
@@ -59,21 +66,54 @@ class HeapPriorityQueue(PriorityQueueBase):  # base class defines _Item
             self._upheap(parent)  # recur at position of parent
 
     def _downheap(self, j):
-        # 在完全二叉树中，节点p有左孩子才可能有右孩子。
+        # 在完全d叉树中，节点p有左孩子才可能有其他孩子; 其孩子的索引是连续的。
         if self._has_left(j):
             left = self._left(j)
-            small_child = left  # although right may be smaller
-            if self._has_right(j):
-                right = self._right(j)
-                if self._data[right] < self._data[left]:
-                    small_child = right
+            small_child = left  # although another child may be smaller
+            for child in range(left + 1, min(left + self._arity, len(self._data))):
+                if self._data[child] < self._data[small_child]:
+                    small_child = child
             if self._data[small_child] < self._data[j]:
                 self._swap(j, small_child)
                 self._downheap(small_child)  # recur at position of small child
 
+    def _heapify(self):
+        """Restore the heap-order property of the whole array, bottom-up, in O(n) time."""
+        start = self._parent(len(self._data) - 1)  # start at PARENT of last leaf
+        for j in range(start, -1, -1):  # going to and including the root
+            self._downheap(j)
+
+    def _add_items(self, items):
+        """Add a list of items, choosing between per-item upheap and one heapify."""
+        n = len(self._data) + len(items)
+        self._data.extend(items)
+        # 逐个upheap约需 m·log n 次比较，而整体heapify只需 O(n+m)。
+        if len(items) * n.bit_length() > n:
+            self._heapify()
+        else:
+            for j in range(n - len(items), n):
+                self._upheap(j)
+
+    def _own_items(self, items):
+        """Return a list of the items of another heap, as items of this queue."""
+        return list(items)
+
+    def _replace_min(self, item):
+        """Put item at the root in place of the minimum, and return the former minimum (k,v) tuple."""
+        old = self._data[0]
+        self._data[0] = item
+        self._downheap(0)
+        return (old._key, old._value)
+
     # ------------------------------ public behaviors ------------------------------
-    def __init__(self):
-        """Create a new empty Priority Queue."""
+    def __init__(self, arity=2):
+        """Create a new empty Priority Queue.
+
+        arity  maximum number of children of a heap node (default 2, a binary heap)
+        """
+        if arity < 2:
+            raise ValueError('arity must be at least 2')
+        self._arity = arity
         self._data = []
 
     def __len__(self):
@@ -110,22 +150,73 @@ class HeapPriorityQueue(PriorityQueueBase):  # base class defines _Item
         self._downheap(0)  # then fix new root
         return (item._key, item._value)
 
+    # ------------------------------ bulk operations ------------------------------
+    def add_many(self, pairs):
+        """Add every (k,v) tuple of an iterable.
+
+        A batch that is large relative to the heap is appended and heapified as a
+        whole; a small batch is upheaped item by item.
+        """
+        # 时间复杂度: O(min(n + m, m log(n + m))), m是批量数据的个数
+        self._add_items([self._Item(k, v) for k, v in pairs])
+
+    def pop_many(self, k):
+        """Remove and return a list of the (k,v) tuples with the k smallest keys, in increasing order.
+
+        Fewer than k tuples are returned if the priority queue holds fewer than k items.
+        """
+        # 时间复杂度: O(k log n)
+        if k >= len(self._data):  # draining everything: one sort beats repeated downheaps
+            items = sorted(self._data)
+            self._data = []
+            return [(item._key, item._value) for item in items]
+        return [self.remove_min() for _ in range(k)]
+
+    def pushpop(self, key, value):
+        """Add a key-value pair, then remove and return (k,v) tuple with minimum key.
+
+        Faster than add followed by remove_min: it downheaps at most once.
+        """
+        # 时间复杂度: O(log n)
+        if self._data and self._data[0]._key < key:
+            return self._replace_min(self._Item(key, value))
+        return (key, value)  # the new pair would be the minimum itself
+
+    def replace(self, key, value):
+        """Remove and return (k,v) tuple with minimum key, then add a key-value pair.
+
+        Raise Empty exception if empty. Unlike pushpop, the returned tuple may have
+        a larger key than the added one.
+        """
+        # 时间复杂度: O(log n)
+        if self.is_empty():
+            raise Empty('Priority queue is empty.')
+        return self._replace_min(self._Item(key, value))
+
+    def merge(self, other):
+        """Move all items of another HeapPriorityQueue into this one, leaving other empty.
+
+        Raise TypeError, leaving both queues unchanged, if other is not a HeapPriorityQueue.
+        """
+        # 时间复杂度: O(n + m)
+        if not isinstance(other, HeapPriorityQueue):
+            raise TypeError('can only merge a HeapPriorityQueue')
+        items = self._own_items(other._data)  # converted before other is changed
+        other._data = []
+        self._add_items(items)
+
 
 class BottomUpConstructHeap(HeapPriorityQueue):
     """书中没有该类，书中的代码是直接修改 HeapPriorityQueue 类的 __init__() 方法。"""
 
-    def __init__(self, contents=()):
+    def __init__(self, contents=(), arity=2):
         """Create a new empty Priority Queue.
 
         By default, queue will be empty. If contents is given, it should be as an
         iterable sequence of (k,v) tuples specifying the initial contents.
+        arity is the maximum number of children of a heap node (default 2).
         """
-        super().__init__()
+        super().__init__(arity)
         self._data = [self._Item(k, v) for k, v in contents]  # empty by default
         if len(self._data) > 1:
             self._heapify()
-
-    def _heapify(self):
-        start = self._parent(len(self._data) - 1)  # start at PARENT of last leaf
-        for j in range(start, -1, -1):  # going to and including the root
-            self._downheap(j)
@@ -0,0 +1,178 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+from ch09.priority_queue_base import PriorityQueueBase
+from exceptions import Empty
+
+
+class IndexedPriorityQueue(PriorityQueueBase):
+    """A min-oriented binary heap of integer ids 0..capacity-1, addressed by id instead of by Locator.
+
+    The value of every entry is its id. Three flat arrays replace per-entry objects:
+      _heap  ids in heap order
+      _pos   position of each id in _heap (-1 if the id is not in the queue)
+      _keys  key of each id
+    so an entry can be found, updated or removed through its id in O(log n) time.
+    """
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _upheap(self, j):
+        """Move the id at position j up until its parent's key is not larger."""
+        heap, pos, keys = self._heap, self._pos, self._keys
+        i = heap[j]
+        key = keys[i]
+        while j > 0:
+            parent = (j - 1) >> 1
+            p = heap[parent]
+            if not key < keys[p]:
+                break
+            heap[j] = p  # parent drops into the hole
+            pos[p] = j
+            j = parent
+        heap[j] = i
+        pos[i] = j
+
+    def _downheap(self, j):
+        """Move the id at position j down until no child has a smaller key."""
+        heap, pos, keys = self._heap, self._pos, self._keys
+        n = len(heap)
+        i = heap[j]
+        key = keys[i]
+        child = 2 * j + 1
+        while child < n:
+            if child + 1 < n and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            c = heap[child]
+            if not keys[c] < key:
+                break
+            heap[j] = c  # smaller child rises into the hole
+            pos[c] = j
+            j = child
+            child = 2 * j + 1
+        heap[j] = i
+        pos[i] = j
+
+    def _position(self, i):
+        """Return the heap position of id i (raise KeyError if i is not in the queue)."""
+        j = self._pos[i] if 0 <= i < len(self._pos) else -1
+        if j < 0:
+            raise KeyError('Id not in queue: ' + repr(i))
+        return j
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self, capacity):
+        """Create a new empty Priority Queue for ids 0..capacity-1."""
+        self._heap = array('q')
+        self._pos = array('q', [-1]) * capacity
+        self._keys = [None] * capacity
+
+    def __len__(self):
+        """Return the number of items in the priority queue."""
+        return len(self._heap)
+
+    def contains(self, i):
+        """Return True if id i is in the priority queue."""
+        return 0 <= i < len(self._pos) and self._pos[i] >= 0
+
+    __contains__ = contains
+
+    def key_of(self, i):
+        """Return the key of id i (raise KeyError if i is not in the queue)."""
+        self._position(i)
+        return self._keys[i]
+
+    def add(self, key, i):
+        """Add id i with the given key (raise ValueError if i is already in the queue)."""
+        # 时间复杂度: O(log n)
+        if self.contains(i):
+            raise ValueError('Id already in queue: ' + repr(i))
+        if not 0 <= i < len(self._pos):
+            raise IndexError('Id out of range: ' + repr(i))
+        self._keys[i] = key
+        self._heap.append(i)
+        self._upheap(len(self._heap) - 1)
+
+    def min(self):
+        """Return but do not remove (k,i) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        if not self._heap:
+            raise Empty('Priority queue is empty.')
+        i = self._heap[0]
+        return (self._keys[i], i)
+
+    def remove_min(self):
+        """Remove and return (k,i) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: O(log n)
+        if not self._heap:
+            raise Empty('Priority queue is empty.')
+        return self.remove(self._heap[0])
+
+    def decrease_key(self, i, key):
+        """Lower the key of id i to key (raise ValueError if key is larger than the current key)."""
+        # 时间复杂度: O(log n)
+        j = self._position(i)
+        if self._keys[i] < key:
+            raise ValueError('New key is larger than the current key.')
+        self._keys[i] = key
+        self._upheap(j)
+
+    def update(self, i, key):
+        """Change the key of id i to key, whether it is smaller or larger."""
+        # 时间复杂度: O(log n)
+        j = self._position(i)
+        self._keys[i] = key
+        self._upheap(j)
+        if self._pos[i] == j:  # it did not move up, so it may need to move down
+            self._downheap(j)
+
+    def remove(self, i):
+        """Remove id i and return its (k,i) tuple."""
+        # 时间复杂度: O(log n)
+        j = self._position(i)
+        last = self._heap.pop()
+        self._pos[i] = -1
+        key = self._keys[i]
+        self._keys[i] = None
+        if last != i:  # the last id fills position j
+            self._heap[j] = last
+            self._pos[last] = j
+            self._upheap(j)
+            if self._pos[last] == j:
+                self._downheap(j)
+        return (key, i)
+
+
+if __name__ == '__main__':
+    pq = IndexedPriorityQueue(6)
+    for i, k in enumerate([5, 9, 3, 7, 8, 1]):
+        pq.add(k, i)
+    pq.decrease_key(1, 2)
+    pq.update(2, 10)
+    print(pq.remove(3), 3 in pq, pq.key_of(1))
+    while not pq.is_empty():
+        print(pq.remove_min(), end=' ')
+    print()
@@ -0,0 +1,154 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from time import perf_counter_ns
+
+_OPERATIONS = ('add', 'min', 'remove_min', 'update', 'remove')  # public operations that are timed
+
+
+class PQStats:
+    """Counters and latency histograms collected by an instrumented priority queue."""
+
+    def __init__(self):
+        self.comparisons = 0  # calls of _Item.__lt__
+        self.swaps = 0  # calls of _swap
+        self.sift_depths = {}  # levels moved by one upheap/downheap -> number of such sifts
+        self.latencies = {}  # operation -> {bucket -> count}; bucket b counts calls of < 2^b ns
+
+    def record_sift(self, depth):
+        self.sift_depths[depth] = self.sift_depths.get(depth, 0) + 1
+
+    def record_latency(self, operation, ns):
+        histogram = self.latencies.setdefault(operation, {})
+        b = ns.bit_length()
+        histogram[b] = histogram.get(b, 0) + 1
+
+    def snapshot(self):
+        """Return the statistics as a dict of plain numbers, e.g. for export to a metrics system.
+
+        Latencies are reported per operation as {upper bound in ns: number of calls}.
+        """
+        return {
+            'comparisons': self.comparisons,
+            'swaps': self.swaps,
+            'sifts': sum(self.sift_depths.values()),
+            'sift_depths': dict(sorted(self.sift_depths.items())),
+            'calls': {op: sum(h.values()) for op, h in self.latencies.items()},
+            'latency_ns': {op: {2 ** b: c for b, c in sorted(h.items())} for op, h in self.latencies.items()},
+        }
+
+
+class _InstrumentedMixin:
+    """Overrides of the nonpublic hooks of the ch09 queues that update a PQStats."""
+
+    def __init__(self, *args, **kwargs):
+        stats = self._stats = PQStats()
+        self._sifting = False  # True while an outermost upheap/downheap is running
+
+        def counting(item_type):
+            """Return a subclass of item_type whose __lt__ counts comparisons in stats."""
+            def __lt__(a, b):
+                stats.comparisons += 1
+                return item_type.__lt__(a, b)
+
+            return type(item_type.__name__, (item_type,), {'__slots__': (), '__lt__': __lt__})
+
+        self._Item = counting(self._Item)  # per-instance classes, so each queue has its own counters
+        if hasattr(self, 'Locator'):
+            self.Locator = counting(self.Locator)
+        super().__init__(*args, **kwargs)
+
+    def _swap(self, i, j):
+        self._stats.swaps += 1
+        super()._swap(i, j)
+
+    def _sift(self, sift, j):
+        """Run sift(j) and record its depth, unless it is a recursive call of a running sift."""
+        if self._sifting:
+            return sift(j)
+        self._sifting = True
+        before = self._stats.swaps
+        try:
+            sift(j)
+        finally:
+            self._sifting = False
+        self._stats.record_sift(self._stats.swaps - before)  # every level moved is one swap
+
+    def _upheap(self, j):
+        self._sift(super()._upheap, j)
+
+    def _downheap(self, j):
+        self._sift(super()._downheap, j)
+
+    def stats(self):
+        """Return a snapshot of the collected statistics (see PQStats.snapshot)."""
+        return self._stats.snapshot()
+
+    def reset_stats(self):
+        """Discard the collected statistics."""
+        self._stats.__init__()
+
+
+def _timed(operation, method):
+    """Return a wrapper of method that records its latency under the given operation name."""
+    def wrapper(self, *args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._stats.record_latency(operation, perf_counter_ns() - start)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def instrumented(pq_type):
+    """Return a subclass of the priority queue class pq_type that collects statistics.
+
+    Instances count key comparisons, swaps and sift depths, and keep a latency
+    histogram of each public operation; call stats() for a snapshot. Instrumentation
+    is opt-in: pq_type itself is not changed, so uninstrumented queues pay nothing.
+
+    For example:  pq = instrumented(HeapPriorityQueue)()
+    """
+    namespace = {'__doc__': 'Instrumented version of {0}.'.format(pq_type.__name__)}
+    for operation in _OPERATIONS:
+        if hasattr(pq_type, operation):
+            namespace[operation] = _timed(operation, getattr(pq_type, operation))
+    return type('Instrumented' + pq_type.__name__, (_InstrumentedMixin, pq_type), namespace)
+
+
+if __name__ == '__main__':
+    from random import random
+    from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+    from ch09.heap_priority_queue import HeapPriorityQueue
+    from ch09.sorted_priority_queue import SortedPriorityQueue
+    from ch09.unsorted_priority_queue import UnsortedPriorityQueue
+
+    for pq_type in (HeapPriorityQueue, AdaptableHeapPriorityQueue, SortedPriorityQueue, UnsortedPriorityQueue):
+        pq = instrumented(pq_type)()
+        for _ in range(200):
+            pq.add(random(), None)
+        while not pq.is_empty():
+            pq.remove_min()
+        s = pq.stats()
+        print(type(pq).__name__, s['comparisons'], s['swaps'], s['sifts'], s['calls'])
@@ -0,0 +1,216 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch09.priority_queue_base import PriorityQueueBase
+from exceptions import Empty
+
+
+class PairingHeapPriorityQueue(PriorityQueueBase):
+    """A locator-based priority queue implemented with a pairing heap.
+
+    The heap is a tree in which every node's key is no smaller than its parent's.
+    Each node keeps its leftmost child, its right sibling, and a back link to its
+    left sibling (or to its parent, if it is the leftmost child).
+
+    add and merge link two trees in O(1) time. remove_min links the children of
+    the root in two passes, in O(log n) amortized time; update to a smaller key
+    cuts the node's subtree and links it with the root, which costs O(1) plus
+    an amortized charge that is sub-logarithmic.
+
+    The API matches AdaptableHeapPriorityQueue: add returns a Locator that can be
+    passed to update and remove.
+    """
+
+    # ------------------------------ nested Locator class ------------------------------
+    class Locator(PriorityQueueBase._Item):
+        """Token for locating an entry of the priority queue."""
+        __slots__ = '_child', '_next', '_prev', '_owner'
+
+        def __init__(self, k, v, owner):
+            super().__init__(k, v)
+            self._child = None  # leftmost child
+            self._next = None  # right sibling
+            self._prev = None  # left sibling, or parent of a leftmost child
+            self._owner = owner  # _Owner of the queue holding this entry (None once removed)
+
+    class _Owner:
+        """Identity of a queue that locators refer to; merged queues are chained to the survivor."""
+        __slots__ = '_parent'
+
+        def __init__(self):
+            self._parent = None
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    def _validate(self, loc):
+        """Raise ValueError unless loc locates an entry of this queue."""
+        owner = loc._owner
+        if owner is not None:
+            while owner._parent is not None:  # follow the chain left by merges
+                owner = owner._parent
+            loc._owner = owner  # shorten the chain for the next call
+        if owner is not self._owner:
+            raise ValueError('Invalid locator')
+
+    @staticmethod
+    def _link(a, b):
+        """Link the trees rooted at a and b, and return the root of the result."""
+        if b._key < a._key:
+            a, b = b, a
+        b._next = a._child  # b becomes the leftmost child of a
+        if a._child is not None:
+            a._child._prev = b
+        b._prev = a
+        a._child = b
+        return a
+
+    def _cut(self, node):
+        """Detach the subtree rooted at node (which is not the root) from the heap."""
+        prev = node._prev
+        if prev._child is node:  # node is a leftmost child; prev is its parent
+            prev._child = node._next
+        else:
+            prev._next = node._next
+        if node._next is not None:
+            node._next._prev = prev
+        node._prev = node._next = None
+
+    def _merge_pairs(self, first):
+        """Link a list of sibling trees into one tree in two passes, and return its root."""
+        # 第一趟: 从左到右两两合并; 第二趟: 从右到左依次合并到结果中。
+        pairs = []
+        while first is not None:
+            a = first
+            b = a._next
+            if b is None:
+                first = None
+            else:
+                first = b._next
+                b._prev = b._next = None
+            a._prev = a._next = None
+            pairs.append(a if b is None else self._link(a, b))
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
+
+    def _detach(self, loc):
+        """Remove loc from the heap, keeping its descendants."""
+        if loc is self._root:
+            self._root = self._merge_pairs(loc._child)
+        else:
+            self._cut(loc)
+            subtree = self._merge_pairs(loc._child)
+            if subtree is not None:
+                self._root = self._link(self._root, subtree)
+        loc._child = None
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self):
+        """Create a new empty Priority Queue."""
+        self._root = None
+        self._n = 0
+        self._owner = self._Owner()
+
+    def __len__(self):
+        """Return the number of items in the priority queue."""
+        return self._n
+
+    def add(self, key, value):
+        """Add a key-value pair, and return its Locator."""
+        # 时间复杂度: O(1)
+        token = self.Locator(key, value, self._owner)
+        self._root = token if self._root is None else self._link(self._root, token)
+        self._n += 1
+        return token
+
+    def min(self):
+        """Return but do not remove (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: O(1)
+        if self._root is None:
+            raise Empty('Priority queue is empty.')
+        return (self._root._key, self._root._value)
+
+    def remove_min(self):
+        """Remove and return (k,v) tuple with minimum key.
+
+        Raise Empty exception if empty.
+        """
+        # 时间复杂度: 均摊 O(log n)
+        if self._root is None:
+            raise Empty('Priority queue is empty.')
+        return self.remove(self._root)
+
+    def update(self, loc, newkey, newval):
+        """Update the key and value for the entry identified by Locator loc."""
+        # 时间复杂度: 减小键时为 O(1) 加上均摊的次对数代价; 增大键时为均摊 O(log n)
+        self._validate(loc)
+        if newkey < loc._key:
+            if loc is not self._root:
+                self._cut(loc)  # its subtree stays heap-ordered
+                loc._key = newkey
+                self._root = self._link(self._root, loc)
+        elif loc._child is not None:  # a larger key may violate the order with its children
+            self._detach(loc)
+            loc._key = newkey
+            self._root = loc if self._root is None else self._link(self._root, loc)
+        loc._key = newkey
+        loc._value = newval
+
+    def remove(self, loc):
+        """Remove and return the (k,v) pair identified by Locator loc."""
+        self._validate(loc)
+        self._detach(loc)
+        loc._owner = None
+        self._n -= 1
+        return (loc._key, loc._value)
+
+    def merge(self, other):
+        """Move all items of another PairingHeapPriorityQueue into this one, leaving other empty.
+
+        Locators of other's entries remain valid, now for this queue.
+        """
+        # 时间复杂度: O(1)
+        if other is self or other._root is None:
+            return
+        self._root = other._root if self._root is None else self._link(self._root, other._root)
+        self._n += other._n
+        other._owner._parent = self._owner  # other's locators now resolve to this queue
+        other._root = None
+        other._n = 0
+        other._owner = self._Owner()
+
+
+if __name__ == '__main__':
+    pq = PairingHeapPriorityQueue()
+    locs = {v: pq.add(k, v) for k, v in [(5, 'A'), (9, 'C'), (3, 'B'), (7, 'Q')]}
+    pq.update(locs['C'], 1, 'C')
+    other = PairingHeapPriorityQueue()
+    other.add(4, 'D')
+    pq.merge(other)
+    print(pq.remove(locs['A']), len(pq))
+    while not pq.is_empty():
+        print(pq.remove_min(), end=' ')
+    print()
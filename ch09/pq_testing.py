@@ -0,0 +1,70 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import heapq
+from random import Random
+
+import pytest
+
+from ch14.graph import Graph
+from exceptions import Empty
+
+
+def fuzz(pq, steps, seed, keys=1000):
+    """Apply random adds and removals to pq and to a heapq list, checking that they agree.
+
+    Values are (key, serial) pairs, so every returned pair can be checked for consistency
+    while equal keys may leave in any order.
+    """
+    rng = Random(seed)
+    ref = []
+    for serial in range(steps):
+        if rng.random() < 0.55 or not ref:
+            k = rng.randrange(keys)
+            pq.add(k, (k, serial))
+            heapq.heappush(ref, k)
+        else:
+            k, v = pq.remove_min()
+            assert k == heapq.heappop(ref) and v[0] == k
+        assert len(pq) == len(ref)
+        if ref:
+            k, v = pq.min()
+            assert k == ref[0] and v[0] == k
+    while ref:
+        assert pq.remove_min()[0] == heapq.heappop(ref)
+    assert pq.is_empty()
+    with pytest.raises(Empty):
+        pq.min()
+    with pytest.raises(Empty):
+        pq.remove_min()
+
+
+def random_graph(rng, n, m):
+    """Return a connected random graph with n vertices and up to n-1+m weighted edges, and its vertices."""
+    g = Graph()
+    verts = [g.insert_vertex(j) for j in range(n)]
+    for j in range(1, n):  # a random spanning tree keeps the graph connected
+        g.insert_edge(verts[rng.randrange(j)], verts[j], rng.randrange(1, 100))
+    for _ in range(m):
+        u, v = rng.sample(verts, 2)
+        if g.get_edge(u, v) is None:
+            g.insert_edge(u, v, rng.randrange(1, 100))
+    return g, verts
@@ -0,0 +1,49 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch09.array_sorted_priority_queue import ArraySortedPriorityQueue
+from ch09.pq_testing import fuzz
+from ch09.sorted_priority_queue import SortedPriorityQueue
+
+
+def test_agrees_with_heapq():
+    fuzz(ArraySortedPriorityQueue(), 5000, 30)
+    fuzz(ArraySortedPriorityQueue(), 5000, 31, keys=5)
+
+
+def test_equal_keys_leave_in_insertion_order():
+    pq = ArraySortedPriorityQueue()
+    ref = SortedPriorityQueue()
+    for j in range(30):
+        pq.add(j % 3, j)
+        ref.add(j % 3, j)
+    assert [pq.remove_min() for _ in range(30)] == [ref.remove_min() for _ in range(30)]
+
+
+def test_removed_prefix_is_discarded():
+    pq = ArraySortedPriorityQueue()
+    for j in range(1000):
+        pq.add(j, j)
+        pq.add(j, j)
+        pq.remove_min()
+        assert len(pq._keys) <= 2 * len(pq) + 1
+        assert pq._front <= len(pq)
+    assert [pq.remove_min()[0] for _ in range(len(pq))] == sorted(2 * list(range(500, 1000)))
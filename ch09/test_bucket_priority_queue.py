@@ -0,0 +1,124 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import heapq
+from functools import partial
+from random import Random
+
+import pytest
+
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ch09.bucket_priority_queue import AdaptableBucketPriorityQueue, BucketPriorityQueue
+from ch09.pq_testing import random_graph
+from ch14.shortest_paths import shortest_path_lengths
+from exceptions import Empty
+
+SPANS = (None, 1, 7, 100)
+INF = float('inf')
+
+
+def _monotone_fuzz(pq, span, steps, seed):
+    """Compare pq with a heapq list under random monotone operations."""
+    rng = Random(seed)
+    reach = 100 if span is None else span
+    last = 0
+    ref = []
+    for serial in range(steps):
+        if rng.random() < 0.55 or not ref:
+            k = INF if rng.random() < 0.05 else last + rng.randrange(reach + 1)
+            pq.add(k, (k, serial))
+            heapq.heappush(ref, k)
+        else:
+            k, v = pq.remove_min()
+            assert k == heapq.heappop(ref) and v[0] == k
+            if k != INF:
+                last = k
+        assert len(pq) == len(ref)
+        if ref:
+            assert pq.min()[0] == ref[0]
+    while ref:
+        assert pq.remove_min()[0] == heapq.heappop(ref)
+    with pytest.raises(Empty):
+        pq.remove_min()
+
+
+def test_agrees_with_heapq():
+    for span in SPANS:
+        _monotone_fuzz(BucketPriorityQueue(span), span, 5000, 24)
+        _monotone_fuzz(AdaptableBucketPriorityQueue(span), span, 5000, 25)
+
+
+def test_rejects_keys_out_of_range():
+    for span in SPANS:
+        pq = BucketPriorityQueue(span)
+        pq.add(1, 'a')
+        assert pq.remove_min() == (1, 'a')
+        pq.add(2, 'b')
+        with pytest.raises(ValueError):
+            pq.add(0, 'c')  # smaller than the last minimum
+        pq.add(1, 'd')  # equal to it is allowed
+        pq.add(INF, 'e')
+        assert [pq.remove_min() for _ in range(3)] == [(1, 'd'), (2, 'b'), (INF, 'e')]
+    pq = BucketPriorityQueue(span=10)
+    with pytest.raises(ValueError):
+        pq.add(11, 'f')
+
+
+def test_locators_agree_with_dict():
+    for span in SPANS:
+        rng = Random(26)
+        reach = 100 if span is None else span
+        pq = AdaptableBucketPriorityQueue(span)
+        live = {}  # locator -> key
+        last = 0
+        for serial in range(3000):
+            op = rng.random()
+            if op < 0.4 or not live:
+                k = last + rng.randrange(reach + 1)
+                live[pq.add(k, serial)] = k
+            elif op < 0.65:
+                loc = rng.choice(list(live))
+                k = last + rng.randrange(reach + 1)
+                pq.update(loc, k, serial)
+                live[loc] = k
+            elif op < 0.8:
+                loc = rng.choice(list(live))
+                assert pq.remove(loc)[0] == live.pop(loc)
+                with pytest.raises(ValueError):
+                    pq.remove(loc)
+            else:
+                k, v = pq.remove_min()
+                assert k == min(live.values())
+                del live[next(loc for loc in live if loc._value == v)]
+                last = k
+            assert len(pq) == len(live)
+        stranger = AdaptableBucketPriorityQueue(span).add(0, 0)  # locator of another queue
+        with pytest.raises(ValueError):
+            pq.update(stranger, last, 0)
+
+
+def test_dijkstra_with_integer_weights():
+    rng = Random(27)
+    for _ in range(5):
+        g, verts = random_graph(rng, 60, 200)  # weights from 1 to 99
+        expected = shortest_path_lengths(g, verts[0], AdaptableHeapPriorityQueue)
+        assert shortest_path_lengths(g, verts[0], AdaptableBucketPriorityQueue) == expected
+        assert shortest_path_lengths(g, verts[0], partial(AdaptableBucketPriorityQueue, span=99)) == expected
@@ -0,0 +1,123 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from threading import Thread
+
+import pytest
+
+from ch09.concurrent_priority_queue import AsyncPriorityQueue, BlockingPriorityQueue
+from ch09.pq_testing import fuzz
+from exceptions import Empty, Full
+
+
+def test_single_thread_agrees_with_heapq():
+    fuzz(BlockingPriorityQueue(), 3000, 28)
+    fuzz(AsyncPriorityQueue(), 3000, 29)
+
+
+def test_equal_keys_leave_in_fifo_order():
+    pq = BlockingPriorityQueue()
+    for j, v in enumerate('abcdef'):
+        pq.put(j % 2, v)
+    assert [pq.get() for _ in range(6)] == [(0, 'a'), (0, 'c'), (0, 'e'), (1, 'b'), (1, 'd'), (1, 'f')]
+
+
+def test_blocking_timeouts():
+    pq = BlockingPriorityQueue(maxsize=2)
+    with pytest.raises(Empty):
+        pq.get(block=False)
+    with pytest.raises(Empty):
+        pq.get(timeout=0.01)
+    pq.put(1, 'a')
+    pq.add(2, 'b')
+    with pytest.raises(Full):
+        pq.put(3, 'c', timeout=0.01)
+    with pytest.raises(Full):
+        pq.add(3, 'c')
+    assert len(pq) == 2 and pq.min() == (1, 'a')
+
+
+def test_producers_and_consumers():
+    pq = BlockingPriorityQueue(maxsize=10)  # producers block often
+    got = []
+
+    def produce(t):
+        for j in range(500):
+            pq.put(j, (t, j))
+
+    def consume():
+        for _ in range(1000):
+            got.append(pq.get(timeout=10))
+
+    threads = [Thread(target=produce, args=(t,)) for t in range(4)] + [Thread(target=consume) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(pq) == 0
+    assert sorted(v for k, v in got) == sorted((t, j) for t in range(4) for j in range(500))
+
+
+def test_async_producers_and_consumers():
+    async def run():
+        pq = AsyncPriorityQueue(maxsize=3)
+        got = []
+
+        async def produce(t):
+            for j in range(100):
+                await pq.put(j, (t, j))
+
+        async def consume():
+            for _ in range(200):
+                got.append(await pq.get())
+
+        await asyncio.gather(*[produce(t) for t in range(4)], consume(), consume())
+        return pq, got
+
+    pq, got = asyncio.run(run())
+    assert len(pq) == 0
+    assert sorted(v for k, v in got) == sorted((t, j) for t in range(4) for j in range(100))
+
+
+def test_async_cancelled_getter_does_not_lose_wakeup():
+    async def run():
+        pq = AsyncPriorityQueue()
+        first = asyncio.ensure_future(pq.get())
+        second = asyncio.ensure_future(pq.get())
+        await asyncio.sleep(0)  # both tasks are waiting
+        pq.put_nowait(1, 'x')  # wakes the first task...
+        first.cancel()  # ...which is cancelled before it runs
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await asyncio.wait_for(second, 1)
+
+    assert asyncio.run(run()) == (1, 'x')
+
+
+def test_async_nowait():
+    pq = AsyncPriorityQueue(maxsize=1)
+    pq.put_nowait(1, 'a')
+    with pytest.raises(Full):
+        pq.put_nowait(2, 'b')
+    assert pq.get_nowait() == (1, 'a')
+    with pytest.raises(Empty):
+        pq.get_nowait()
@@ -0,0 +1,40 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from random import Random
+
+from ch09.fast_heap_priority_queue import FastHeapPriorityQueue
+from ch09.pq_testing import fuzz
+
+
+def test_agrees_with_heapq():
+    fuzz(FastHeapPriorityQueue(), 5000, 14)
+    fuzz(FastHeapPriorityQueue(), 5000, 15, keys=5)  # many equal keys
+
+
+def test_contents_are_heapified():
+    rng = Random(16)
+    keys = [rng.randrange(100) for _ in range(500)]
+    pq = FastHeapPriorityQueue((k, str(k)) for k in keys)
+    assert len(pq) == len(keys)
+    assert all(not pq._keys[j] < pq._keys[(j - 1) // 2] for j in range(1, len(keys)))
+    out = [pq.remove_min() for _ in range(len(keys))]
+    assert out == [(k, str(k)) for k in sorted(keys)]
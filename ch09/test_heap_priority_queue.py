@@ -0,0 +1,167 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import heapq
+from random import Random
+
+import pytest
+
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ch09.fast_heap_priority_queue import FastHeapPriorityQueue
+from ch09.heap_priority_queue import BottomUpConstructHeap, HeapPriorityQueue
+from ch09.pq_testing import fuzz
+from exceptions import Empty
+
+ARITIES = (2, 3, 4, 8)
+
+
+def _check_heap(pq):
+    """Check the heap-order property of every node of a d-ary heap."""
+    data = pq._data
+    assert all(not data[j] < data[pq._parent(j)] for j in range(1, len(data)))
+
+
+def test_every_arity_agrees_with_heapq():
+    for arity in ARITIES:
+        for pq_type in (HeapPriorityQueue, AdaptableHeapPriorityQueue):
+            fuzz(pq_type(arity=arity), 3000, arity)
+
+
+def test_bottom_up_construction():
+    rng = Random(17)
+    keys = [rng.randrange(50) for _ in range(300)]
+    for arity in ARITIES:
+        pq = BottomUpConstructHeap(((k, k) for k in keys), arity=arity)
+        _check_heap(pq)
+        assert [pq.remove_min()[0] for _ in keys] == sorted(keys)
+
+
+def test_arity_must_be_at_least_two():
+    with pytest.raises(ValueError):
+        HeapPriorityQueue(arity=1)
+    with pytest.raises(ValueError):
+        AdaptableHeapPriorityQueue(arity=0)
+
+
+def test_adaptable_locators_with_every_arity():
+    for arity in ARITIES:
+        rng = Random(arity)
+        pq = AdaptableHeapPriorityQueue(arity=arity)
+        live = {}  # locator -> key
+        for serial in range(2000):
+            op = rng.random()
+            if op < 0.4 or not live:
+                k = rng.randrange(1000)
+                live[pq.add(k, serial)] = k
+            elif op < 0.7:
+                loc = rng.choice(list(live))
+                k = rng.randrange(1000)
+                pq.update(loc, k, serial)
+                live[loc] = k
+            elif op < 0.85:
+                loc = rng.choice(list(live))
+                assert pq.remove(loc)[0] == live.pop(loc)
+            else:
+                k, v = pq.remove_min()
+                assert k == min(live.values())
+                del live[next(loc for loc in live if loc._value == v)]
+            assert len(pq) == len(live)
+            assert all(pq._data[j]._index == j for j in range(len(pq)))
+            _check_heap(pq)
+        stranger = AdaptableHeapPriorityQueue(arity=arity).add(0, 0)  # locator of another queue
+        with pytest.raises(ValueError):
+            pq.update(stranger, 1, 1)
+        with pytest.raises(ValueError):
+            pq.remove(stranger)
+
+
+def test_bulk_operations_agree_with_heapq():
+    rng = Random(18)
+    for pq_type in (HeapPriorityQueue, AdaptableHeapPriorityQueue):
+        pq = pq_type()
+        ref = []
+        for _ in range(200):
+            op = rng.random()
+            k = rng.randrange(100)
+            if op < 0.3:
+                batch = [rng.randrange(100) for _ in range(rng.choice((1, 3, 50, 400)))]
+                pq.add_many((j, j) for j in batch)
+                for j in batch:
+                    heapq.heappush(ref, j)
+            elif op < 0.5:
+                m = rng.randrange(len(ref) + 3)
+                assert [kv[0] for kv in pq.pop_many(m)] == [heapq.heappop(ref) for _ in range(min(m, len(ref)))]
+            elif op < 0.75:
+                assert pq.pushpop(k, k) == (heapq.heappushpop(ref, k),) * 2
+            elif ref:
+                assert pq.replace(k, k) == (heapq.heapreplace(ref, k),) * 2
+            else:
+                with pytest.raises(Empty):
+                    pq.replace(k, k)
+            assert len(pq) == len(ref)
+            _check_heap(pq)
+        assert [kv[0] for kv in pq.pop_many(len(ref))] == sorted(ref)
+
+
+def test_merge():
+    for pq_type in (HeapPriorityQueue, AdaptableHeapPriorityQueue):
+        for other_type in (HeapPriorityQueue, AdaptableHeapPriorityQueue):
+            pq, other = pq_type(), other_type(arity=3)
+            pq.add_many((k, k) for k in range(0, 100, 2))
+            other.add_many((k, k) for k in range(1, 100, 2))
+            pq.merge(other)
+            assert len(other) == 0 and len(pq) == 100
+            _check_heap(pq)
+            if pq_type is AdaptableHeapPriorityQueue:
+                assert all(pq._data[j]._index == j for j in range(len(pq)))
+            assert pq.pop_many(100) == [(k, k) for k in range(100)]
+
+
+def test_merged_locators_stay_valid():
+    pq, other = AdaptableHeapPriorityQueue(), AdaptableHeapPriorityQueue()
+    pq.add_many((k, k) for k in range(10))
+    tokens = other.add_many((k, k) for k in range(10, 20))
+    pq.merge(other)
+    pq.update(tokens[5], -1, 'moved')
+    assert pq.remove_min() == (-1, 'moved')
+    assert pq.remove(tokens[0]) == (10, 10)
+
+
+def test_merge_rejects_other_queue_types():
+    pq = AdaptableHeapPriorityQueue()
+    pq.add(1, 'a')
+    other = FastHeapPriorityQueue([(2, 'b')])
+    with pytest.raises(TypeError):
+        pq.merge(other)
+    assert len(pq) == 1 and len(other) == 1
+
+
+def test_adaptable_pushpop_and_replace_locators():
+    pq = AdaptableHeapPriorityQueue()
+    pq.add_many((k, k) for k in range(5))
+    assert pq.pushpop_locator(-1, 'x') == ((-1, 'x'), None)
+    (k, v), token = pq.pushpop_locator(10, 'y')
+    assert (k, v) == (0, 0)
+    pq.update(token, -5, 'y')
+    (k, v), token = pq.replace_locator(7, 'z')
+    assert (k, v) == (-5, 'y')
+    assert pq.remove(token) == (7, 'z')
+    assert pq.pop_many(10) == [(k, k) for k in range(1, 5)]
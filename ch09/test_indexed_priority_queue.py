@@ -0,0 +1,91 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from random import Random
+
+import pytest
+
+from ch09.indexed_priority_queue import IndexedPriorityQueue
+from exceptions import Empty
+
+
+def _check(pq, ref):
+    """Check pq against dict ref, which maps every id in the queue to its key."""
+    assert len(pq) == len(ref)
+    heap, pos = pq._heap, pq._pos
+    assert all(pos[heap[j]] == j for j in range(len(heap)))
+    assert all(not pq._keys[heap[j]] < pq._keys[heap[(j - 1) // 2]] for j in range(1, len(heap)))
+    if ref:
+        assert pq.min()[0] == min(ref.values())
+
+
+def test_agrees_with_dict():
+    rng = Random(32)
+    capacity = 200
+    pq = IndexedPriorityQueue(capacity)
+    ref = {}
+    for _ in range(5000):
+        i = rng.randrange(capacity)
+        k = rng.randrange(1000)
+        op = rng.random()
+        if i not in ref:
+            pq.add(k, i)
+            ref[i] = k
+        elif op < 0.3:
+            pq.update(i, k)
+            ref[i] = k
+        elif op < 0.5:
+            k = ref[i] - rng.randrange(10)
+            pq.decrease_key(i, k)
+            ref[i] = k
+        elif op < 0.7:
+            assert pq.remove(i) == (ref.pop(i), i)
+        else:
+            k, j = pq.remove_min()
+            assert k == ref.pop(j) and all(k <= other for other in ref.values())
+        assert (i in pq) == (i in ref)
+        if i in ref:
+            assert pq.key_of(i) == ref[i]
+        _check(pq, ref)
+
+
+def test_errors():
+    pq = IndexedPriorityQueue(3)
+    with pytest.raises(Empty):
+        pq.remove_min()
+    with pytest.raises(Empty):
+        pq.min()
+    pq.add(5, 1)
+    with pytest.raises(ValueError):
+        pq.add(4, 1)  # id already in queue
+    with pytest.raises(IndexError):
+        pq.add(4, 3)
+    with pytest.raises(ValueError):
+        pq.decrease_key(1, 6)
+    for missing in (0, 3, -1):
+        assert missing not in pq
+        with pytest.raises(KeyError):
+            pq.key_of(missing)
+        with pytest.raises(KeyError):
+            pq.remove(missing)
+    assert pq.remove_min() == (5, 1)
+    pq.add(2, 1)  # an id can be added again after it has left
+    assert pq.min() == (2, 1)
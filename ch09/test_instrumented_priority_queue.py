@@ -0,0 +1,87 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ch09.heap_priority_queue import HeapPriorityQueue
+from ch09.instrumented_priority_queue import instrumented
+from ch09.pq_testing import fuzz
+from ch09.sorted_priority_queue import SortedPriorityQueue
+from ch09.unsorted_priority_queue import UnsortedPriorityQueue
+
+PQ_TYPES = (HeapPriorityQueue, AdaptableHeapPriorityQueue, SortedPriorityQueue, UnsortedPriorityQueue)
+
+
+def test_instrumented_queues_still_agree_with_heapq():
+    for pq_type in PQ_TYPES:
+        pq = instrumented(pq_type)()
+        fuzz(pq, 2000, 33)
+        s = pq.stats()
+        assert s['comparisons'] > 0
+        assert sum(s['calls'].values()) == sum(sum(h.values()) for h in s['latency_ns'].values())
+
+
+def test_counters():
+    pq = instrumented(HeapPriorityQueue)()
+    for k in range(7, 0, -1):  # every add moves the new key up to the root
+        pq.add(k, k)
+    s = pq.stats()
+    assert s['calls'] == {'add': 7}
+    assert s['swaps'] == sum(s['sift_depths'][d] * d for d in s['sift_depths'])
+    assert s['sifts'] == 7
+    assert s['sift_depths'] == {0: 1, 1: 2, 2: 4}  # depth of positions 0, 1-2 and 3-6
+    assert s['comparisons'] == 10  # one per level moved; the root is never compared
+    pq.reset_stats()
+    assert pq.stats()['comparisons'] == 0 and pq.stats()['calls'] == {}
+
+
+def test_adaptable_update_is_timed():
+    pq = instrumented(AdaptableHeapPriorityQueue)()
+    locs = [pq.add(k, k) for k in range(20)]
+    pq.update(locs[19], -1, 'min')
+    pq.remove(locs[3])
+    assert pq.remove_min() == (-1, 'min')
+    calls = pq.stats()['calls']
+    assert calls == {'add': 20, 'update': 1, 'remove': 1, 'remove_min': 1}
+
+
+def test_instrumentation_is_opt_in():
+    instrumented(HeapPriorityQueue)
+    assert HeapPriorityQueue._Item.__lt__ is HeapPriorityQueue._Item.__dict__['__lt__']
+    assert not hasattr(HeapPriorityQueue(), '_stats')
+    a, b = instrumented(HeapPriorityQueue)(), instrumented(HeapPriorityQueue)()
+    a.add(1, 1)
+    a.add(0, 0)
+    assert a.stats()['comparisons'] > 0 and b.stats()['comparisons'] == 0
+
+
+def test_merge_keeps_locators_across_queue_types():
+    a = AdaptableHeapPriorityQueue()
+    loc = a.add(5, 'x')
+    b = instrumented(AdaptableHeapPriorityQueue)()
+    mine = b.add(7, 'y')
+    b.merge(a)
+    b.update(loc, 0, 'z')
+    assert b.remove_min() == (0, 'z')
+    c = AdaptableHeapPriorityQueue()  # and from an instrumented queue back to a plain one
+    c.add(9, 'w')
+    c.merge(b)
+    c.update(mine, 1, 'v')
+    assert [c.remove_min() for _ in range(2)] == [(1, 'v'), (9, 'w')]
@@ -0,0 +1,99 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from random import Random
+
+import pytest
+
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ch09.pairing_heap_priority_queue import PairingHeapPriorityQueue
+from ch09.pq_testing import fuzz, random_graph
+from ch14.mst import MST_Kruskal, MST_PrimJarnik
+from ch14.shortest_paths import shortest_path_lengths
+
+
+def test_agrees_with_heapq():
+    fuzz(PairingHeapPriorityQueue(), 5000, 19)
+    fuzz(PairingHeapPriorityQueue(), 5000, 20, keys=5)
+
+
+def test_locators_agree_with_dict():
+    rng = Random(21)
+    pq = PairingHeapPriorityQueue()
+    live = {}  # locator -> key
+    for serial in range(5000):
+        op = rng.random()
+        if op < 0.4 or not live:
+            k = rng.randrange(1000)
+            live[pq.add(k, serial)] = k
+        elif op < 0.7:
+            loc = rng.choice(list(live))
+            k = rng.randrange(1000)
+            pq.update(loc, k, serial)
+            live[loc] = k
+        elif op < 0.85:
+            loc = rng.choice(list(live))
+            assert pq.remove(loc)[0] == live.pop(loc)
+            with pytest.raises(ValueError):
+                pq.remove(loc)  # a removed locator is no longer valid
+        else:
+            k, v = pq.remove_min()
+            assert k == min(live.values())
+            del live[next(loc for loc in live if loc._value == v)]
+        assert len(pq) == len(live)
+        if live:
+            assert pq.min()[0] == min(live.values())
+
+
+def test_merge_keeps_locators_valid():
+    queues = [PairingHeapPriorityQueue() for _ in range(4)]
+    tokens = [queues[k % 4].add(k, k) for k in range(40)]
+    queues[1].merge(queues[0])
+    queues[3].merge(queues[2])
+    queues[3].merge(queues[1])  # locators of queues[0] now resolve through two merges
+    pq = queues[3]
+    assert len(pq) == 40 and all(len(q) == 0 for q in queues[:3])
+    pq.update(tokens[8], -1, 'first')
+    assert pq.remove(tokens[12]) == (12, 12)
+    assert pq.remove_min() == (-1, 'first')
+    with pytest.raises(ValueError):
+        queues[0].remove(tokens[4])  # belongs to pq now
+    queues[0].add(100, 100)  # an emptied queue can be used again
+    pq.merge(queues[0])
+    assert [pq.remove_min()[0] for _ in range(len(pq))] == [k for k in range(40) if k not in (8, 12)] + [100]
+
+
+def test_graph_algorithms_accept_either_queue():
+    rng = Random(22)
+    for _ in range(5):
+        g, verts = random_graph(rng, 60, 200)
+        d = shortest_path_lengths(g, verts[0], PairingHeapPriorityQueue)
+        assert d == shortest_path_lengths(g, verts[0], AdaptableHeapPriorityQueue)
+        ref = {v: float('inf') for v in verts}  # Bellman-Ford as a reference
+        ref[verts[0]] = 0
+        for _ in verts:
+            for e in g.edges():
+                u, v = e.endpoints()
+                ref[u] = min(ref[u], ref[v] + e.element())
+                ref[v] = min(ref[v], ref[u] + e.element())
+        assert d == ref
+        weight = lambda tree: sum(e.element() for e in tree)
+        assert weight(MST_PrimJarnik(g, PairingHeapPriorityQueue)) == weight(MST_Kruskal(g))
@@ -0,0 +1,77 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import heapq
+from random import Random
+
+import pytest
+
+from ch09.heap_priority_queue import HeapPriorityQueue
+from ch09.top_k_priority_queue import TopKPriorityQueue
+
+
+def test_agrees_with_heapq_nlargest():
+    rng = Random(23)
+    for k in (1, 5, 100, 2000):
+        stream = [(rng.randrange(10 ** 6), j) for j in range(1000)]  # distinct keys with high probability
+        top = TopKPriorityQueue(k, iter(stream))
+        assert len(top) == min(k, len(stream)) and top.capacity() == k
+        assert top.results() == heapq.nlargest(k, stream)
+        for key, value in stream[:50]:
+            top.add(key, value)  # repeated offers are kept again, like new pairs
+        assert top.results() == heapq.nlargest(k, stream + stream[:50])
+
+
+def test_add_reports_whether_pair_was_kept():
+    top = TopKPriorityQueue(3)
+    assert all(top.add(key, None) for key in (5, 1, 3))
+    assert not top.add(0, None)
+    assert not top.add(1, None)  # ties with the threshold are rejected
+    assert top.add(4, None)
+    assert top.min() == (3, None)
+    assert [key for key, value in top.results()] == [5, 4, 3]
+
+
+def test_merge_keeps_k_items():
+    top = TopKPriorityQueue(5, ((k, k) for k in range(0, 40, 2)))
+    other = HeapPriorityQueue()
+    other.add_many((k, k) for k in range(1, 40, 2))
+    top.merge(other)
+    assert len(other) == 0
+    assert len(top) == 5
+    assert top.results() == [(k, k) for k in range(39, 34, -1)]
+    with pytest.raises(TypeError):
+        top.merge([(100, 100)])
+    assert len(top) == 5
+
+
+def test_pushpop_and_replace_keep_the_bound():
+    top = TopKPriorityQueue(4, ((k, k) for k in range(10)))
+    assert top.pushpop(3, 3) == (3, 3)
+    assert top.pushpop(20, 20) == (6, 6)
+    assert top.replace(1, 1) == (7, 7)
+    assert len(top) == 4
+    assert [key for key, value in top.results()] == [20, 9, 8, 1]
+
+
+def test_k_must_be_positive():
+    with pytest.raises(ValueError):
+        TopKPriorityQueue(0)
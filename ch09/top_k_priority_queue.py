@@ -0,0 +1,107 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch09.heap_priority_queue import HeapPriorityQueue
+
+
+class TopKPriorityQueue(HeapPriorityQueue):
+    """A priority queue that keeps only the k items with the largest keys seen so far.
+
+    The kept items form a min-oriented heap of at most k items, so the root is the
+    smallest kept key. Once the queue is full, an item that does not beat the root
+    is rejected after a single comparison; otherwise it replaces the root. Memory
+    use is O(k) no matter how many items are added.
+
+    min and remove_min refer to the smallest kept item, i.e. the current threshold.
+    """
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self, k, contents=(), arity=2):
+        """Create a new Priority Queue that keeps at most k items.
+
+        If contents is given, it should be an iterable (e.g. a generator) of (k,v)
+        tuples to add. arity is the maximum number of children of a heap node.
+        """
+        if k < 1:
+            raise ValueError('k must be positive')
+        super().__init__(arity)
+        self._k = k
+        self.add_many(contents)
+
+    def capacity(self):
+        """Return the maximum number of items kept."""
+        return self._k
+
+    def add(self, key, value):
+        """Offer a key-value pair; it is kept if it is among the k largest keys so far.
+
+        Return True if the pair was kept.
+        """
+        # 时间复杂度: 被拒绝时 O(1)，否则 O(log k)
+        if len(self._data) < self._k:
+            super().add(key, value)
+        elif self._data[0]._key < key:
+            self._replace_min(self._Item(key, value))  # evict the smallest kept item
+        else:
+            return False
+        return True
+
+    def add_many(self, pairs):
+        """Offer every (k,v) tuple of an iterable, consuming it one tuple at a time."""
+        # 时间复杂度: O(m log k)，被拒绝的元素只需一次比较
+        data = self._data
+        it = iter(pairs)
+        if len(data) < self._k:
+            for key, value in it:  # fill the queue
+                self.add(key, value)
+                if len(data) == self._k:
+                    break
+        item_type = self._Item
+        for key, value in it:  # steady state: the queue stays full
+            if data[0]._key < key:
+                self._replace_min(item_type(key, value))
+
+    def merge(self, other):
+        """Offer every item of another HeapPriorityQueue, leaving other empty.
+
+        Only the k largest keys of the two queues are kept.
+        Raise TypeError, leaving both queues unchanged, if other is not a HeapPriorityQueue.
+        """
+        # 时间复杂度: O(m log k)
+        if not isinstance(other, HeapPriorityQueue):
+            raise TypeError('can only merge a HeapPriorityQueue')
+        items = other._data
+        other._data = []
+        self.add_many((item._key, item._value) for item in items)
+
+    def results(self):
+        """Return a list of the kept (k,v) tuples, sorted from largest to smallest key."""
+        # 时间复杂度: O(k log k)
+        return [(item._key, item._value) for item in sorted(self._data, reverse=True)]
+
+
+if __name__ == '__main__':
+    from random import randrange
+
+    stream = ((randrange(1000), 'row%d' % j) for j in range(10000))  # a generator, consumed once
+    top = TopKPriorityQueue(5, stream)
+    print(top.results())
+    print(top.min(), len(top))
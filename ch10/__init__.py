@@ -1 +1 @@
-__all__ = ['chain_hash_map', 'cost_performance', 'multi_map', 'probe_hash_map', 'sorted_table_map', 'unsorted_table_map']
+__all__ = ['blocked_sorted_table_map', 'chain_hash_map', 'compact_hash_map', 'compact_multi_map', 'cost_performance', 'disk_hash_map', 'multi_map', 'probe_hash_map', 'probe_strategies', 'sharded_hash_map', 'sorted_table_map', 'unsorted_table_map']
@@ -0,0 +1,232 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left
+from ch10.map_base import MapBase
+
+
+class BlockedSortedTableMap(MapBase):
+    """Sorted map implementation using a sorted list of bounded-size sorted blocks.
+
+    Keys and values are kept in parallel lists of blocks, and _maxes records the
+    largest key of every block. A search bisects _maxes and then one block, so it
+    stays O(log n), while an insertion or deletion only shifts the entries of one
+    block, which is O(sqrt n) for the default block size.
+    """
+    _LOAD = 1000  # target block size; a block is split once it exceeds twice this size
+
+    # ----------------------------- nonpublic behaviors -----------------------------
+    def _locate(self, k):
+        """Return (b, i) such that block b, index i holds the leftmost key >= k.
+
+        Return (len(self._maxes), 0) if no such key exists.
+        """
+        # 时间复杂度: O(log n)
+        b = bisect_left(self._maxes, k)
+        if b == len(self._maxes):
+            return (b, 0)
+        return (b, bisect_left(self._keys[b], k))
+
+    def _item(self, b, i):
+        """Return (key,value) pair at block b, index i."""
+        return (self._keys[b][i], self._values[b][i])
+
+    def _before(self, b, i):
+        """Return (key,value) pair just before block b, index i (or None if there is none)."""
+        if i > 0:
+            return self._item(b, i - 1)
+        if b > 0:
+            return self._item(b - 1, len(self._keys[b - 1]) - 1)
+        return None
+
+    def _after(self, b, i):
+        """Return (key,value) pair just after block b, index i (or None if there is none)."""
+        if i + 1 < len(self._keys[b]):
+            return self._item(b, i + 1)
+        if b + 1 < len(self._keys):
+            return self._item(b + 1, 0)
+        return None
+
+    def _split(self, b):
+        """Split block b in two halves."""
+        half = self._LOAD
+        self._keys.insert(b + 1, self._keys[b][half:])
+        self._values.insert(b + 1, self._values[b][half:])
+        del self._keys[b][half:]
+        del self._values[b][half:]
+        self._maxes.insert(b, self._keys[b][-1])
+
+    def _join(self, b):
+        """Merge block b with its right neighbor (which must exist)."""
+        self._keys[b].extend(self._keys[b + 1])
+        self._values[b].extend(self._values[b + 1])
+        self._maxes[b] = self._maxes[b + 1]
+        del self._keys[b + 1]
+        del self._values[b + 1]
+        del self._maxes[b + 1]
+        if len(self._keys[b]) > 2 * self._LOAD:
+            self._split(b)
+
+    # ----------------------------- public behaviors -----------------------------
+    def __init__(self):
+        """Create an empty map."""
+        self._keys = []  # list of sorted blocks of keys
+        self._values = []  # values, in blocks parallel to _keys
+        self._maxes = []  # largest key of each block
+        self._n = 0
+
+    def __len__(self):
+        """Return number of items in the map."""
+        return self._n
+
+    def __getitem__(self, k):
+        """Return value associated with key k (raise KeyError if not found)."""
+        # 时间复杂度: O(log n)
+        b, i = self._locate(k)
+        if b == len(self._maxes) or self._keys[b][i] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        return self._values[b][i]
+
+    def __setitem__(self, k, v):
+        """Assign value v to key k, overwriting existing value if present."""
+        # 时间复杂度: O(log n + sqrt n)
+        b, i = self._locate(k)
+        if b == len(self._maxes):  # k is larger than every key
+            if b == 0:
+                self._keys.append([])
+                self._values.append([])
+                self._maxes.append(k)
+            else:
+                b -= 1
+                i = len(self._keys[b])
+                self._maxes[b] = k
+        elif self._keys[b][i] == k:
+            self._values[b][i] = v  # reassign value
+            return
+        self._keys[b].insert(i, k)
+        self._values[b].insert(i, v)
+        self._n += 1
+        if len(self._keys[b]) > 2 * self._LOAD:
+            self._split(b)
+
+    def __delitem__(self, k):
+        """Remove item associated with key k (raise KeyError if not found)."""
+        # 时间复杂度: O(log n + sqrt n)
+        b, i = self._locate(k)
+        if b == len(self._maxes) or self._keys[b][i] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        del self._keys[b][i]
+        del self._values[b][i]
+        self._n -= 1
+        if not self._keys[b]:  # block became empty
+            del self._keys[b]
+            del self._values[b]
+            del self._maxes[b]
+            return
+        self._maxes[b] = self._keys[b][-1]
+        if len(self._keys[b]) < self._LOAD // 2 and len(self._keys) > 1:  # block became small
+            self._join(b if b + 1 < len(self._keys) else b - 1)
+
+    def __iter__(self):
+        """Generate keys of the map ordered from minimum to maximum."""
+        for block in self._keys:
+            yield from block
+
+    def __reversed__(self):
+        """Generate keys of the map ordered from maximum to minimum."""
+        for block in reversed(self._keys):
+            yield from reversed(block)
+
+    def find_min(self):
+        """Return (key,value) pair with minimum key (or None if empty)."""
+        return self._item(0, 0) if self._n > 0 else None
+
+    def find_max(self):
+        """Return (key,value) pair with maximum key (or None if empty)."""
+        return self._item(-1, -1) if self._n > 0 else None
+
+    def find_le(self, k):
+        """Return (key,value) pair with greatest key less than or equal to k.
+
+        Return None if there does not exist such a key.
+        """
+        b, i = self._locate(k)
+        if b < len(self._maxes) and self._keys[b][i] == k:
+            return self._item(b, i)  # exact match
+        return self.find_max() if b == len(self._maxes) else self._before(b, i)
+
+    def find_lt(self, k):
+        """Return (key,value) pair with greatest key strictly less than k.
+
+        Return None if there does not exist such a key.
+        """
+        b, i = self._locate(k)
+        return self.find_max() if b == len(self._maxes) else self._before(b, i)
+
+    def find_ge(self, k):
+        """Return (key,value) pair with least key greater than or equal to k.
+
+        Return None if there does not exist such a key.
+        """
+        b, i = self._locate(k)
+        return self._item(b, i) if b < len(self._maxes) else None
+
+    def find_gt(self, k):
+        """Return (key,value) pair with least key strictly greater than k.
+
+        Return None if there does not exist such a key.
+        """
+        b, i = self._locate(k)
+        if b == len(self._maxes):
+            return None
+        if self._keys[b][i] == k:
+            return self._after(b, i)  # advance past match
+        return self._item(b, i)
+
+    def find_range(self, start, stop):
+        """Iterate all (key,value) pairs such that start <= key < stop.
+
+        If start is None, iteration begins with minimum key of map.
+        If stop is None, iteration continues through the maximum key of map.
+        """
+        # 时间复杂度: O(s + log n), s是区间范围内元素的个数。
+        b, i = (0, 0) if start is None else self._locate(start)
+        while b < len(self._maxes):
+            keys = self._keys[b]
+            if stop is None or self._maxes[b] < stop:
+                end = len(keys)
+            else:
+                end = bisect_left(keys, stop, i)  # range ends within this block
+            for j in range(i, end):
+                yield (keys[j], self._values[b][j])
+            if end < len(keys):
+                return
+            b, i = b + 1, 0
+
+
+if __name__ == '__main__':
+    my_map = BlockedSortedTableMap()
+    my_map._LOAD = 2  # tiny blocks, to show the layout
+    for k in [5, 1, 9, 3, 7, 2, 8, 4, 6]:
+        my_map[k] = str(k)
+    print(my_map._keys)
+    print(list(my_map.find_range(3, 7)))
+    print(my_map.find_le(0), my_map.find_ge(10), my_map.find_gt(4), my_map.find_lt(4))
@@ -20,37 +20,58 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from ch10.hash_map_base import HashMapBase
-from ch10.unsorted_table_map import UnsortedTableMap
 
 
 class ChainHashMap(HashMapBase):
-    """Hash map implemented with separate chaining for collision resolution."""
+    """Hash map implemented with separate chaining for collision resolution.
 
-    def _bucket_getitem(self, j, k):
+    Each nonempty bucket is a list of items; an item's cached hash code is
+    compared before its key.
+    """
+
+    def _bucket_getitem(self, j, k, h):
         bucket = self._table[j]
-        if bucket is None:
-            raise KeyError('Key Error: ' + repr(k))  # no match found
-        return bucket[k]  # may raise KeyError
-
-    def _bucket_setitem(self, j, k, v):
-        if self._table[j] is None:
-            self._table[j] = UnsortedTableMap()  # bucket is new to the table
-        oldsize = len(self._table[j])
-        self._table[j][k] = v
-        if len(self._table[j]) > oldsize:  # key was new to the table
-            self._n += 1  # increase overall map size
-
-    def _bucket_delitem(self, j, k):
+        if bucket is not None:
+            for item in bucket:
+                if item._hash == h and (item._key is k or item._key == k):
+                    return item._value
+        raise KeyError('Key Error: ' + repr(k))  # no match found
+
+    def _bucket_setitem(self, j, k, v, h):
         bucket = self._table[j]
         if bucket is None:
-            raise KeyError('Key Error: ' + repr(k))  # no match found
-        del bucket[k]  # may raise KeyError
+            bucket = self._table[j] = []  # bucket is new to the table
+        for item in bucket:
+            if item._hash == h and (item._key is k or item._key == k):
+                item._value = v  # reassign value
+                return
+        bucket.append(self._Item(k, v, h))  # key was new to the table
+        self._n += 1  # increase overall map size
+
+    def _bucket_delitem(self, j, k, h):
+        bucket = self._table[j]
+        if bucket is not None:
+            for i in range(len(bucket)):
+                item = bucket[i]
+                if item._hash == h and (item._key is k or item._key == k):
+                    bucket.pop(i)
+                    if not bucket:
+                        self._table[j] = None  # release empty bucket
+                    return
+        raise KeyError('Key Error: ' + repr(k))  # no match found
+
+    def _bucket_drain(self, j):
+        bucket = self._table[j]
+        self._table[j] = None
+        return [] if bucket is None else bucket
 
     def __iter__(self):
         for bucket in self._table:
             if bucket is not None:  # a nonempty slot
-                for key in bucket:
-                    yield key
+                for item in bucket:
+                    yield item._key
+        if self._old is not None:  # keys not yet migrated by an incremental rehash
+            yield from self._old
 
 
 if __name__ == '__main__':
@@ -0,0 +1,147 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from array import array
+from ch10.hash_map_base import HashMapBase
+
+
+class CompactHashMap(HashMapBase):
+    """Hash map with linear probing over a compact index (in the style of CPython's dict).
+
+    Entries live in dense parallel arrays of keys, values and cached hash codes,
+    kept in insertion order; the hash table itself only stores integer offsets into
+    those arrays. No per-entry _Item objects are allocated, and a probe compares the
+    stored hash code before calling __eq__ on a key.
+    """
+    _FREE = -1  # index slot that has never been used
+    _DUMMY = -2  # index slot whose entry was deleted
+    _AVAIL = object()  # placeholder key for a deleted entry
+
+    # ------------------------------ nonpublic behaviors ------------------------------
+    @staticmethod
+    def _make_index(c):
+        """Return an index table of c free slots, using the narrowest sufficient integer type."""
+        code = 'b' if c < 2 ** 7 else 'h' if c < 2 ** 15 else 'i' if c < 2 ** 31 else 'q'
+        return array(code, [CompactHashMap._FREE]) * c
+
+    def _lookup(self, j, k, h):
+        """Search for key k, having hash code h, starting at index j.
+
+        Return (slot, entry) tuple, described as follows:
+        If match was found, entry is its offset in the dense arrays and slot its index in the table.
+        If no match found, entry is -1 and slot denotes first available slot.
+        """
+        table = self._table
+        keys = self._keys
+        hashes = self._hashes
+        cap = len(table)
+        first_avail = None
+        while True:
+            e = table[j]
+            if e == CompactHashMap._FREE:
+                return (j if first_avail is None else first_avail, -1)  # search has failed
+            if e == CompactHashMap._DUMMY:
+                if first_avail is None:
+                    first_avail = j  # mark this as first avail
+            elif hashes[e] == h and (keys[e] is k or keys[e] == k):
+                return (j, e)  # found a match
+            j += 1  # keep looking (cyclically)
+            if j == cap:
+                j = 0
+
+    def _resize(self, c):
+        """Compact the entry arrays and rebuild an index of capacity c from the cached hashes."""
+        if len(self._keys) > self._n:  # squeeze out deleted entries
+            live = [e for e in range(len(self._keys)) if self._keys[e] is not CompactHashMap._AVAIL]
+            self._keys = [self._keys[e] for e in live]
+            self._values = [self._values[e] for e in live]
+            self._hashes = array('q', [self._hashes[e] for e in live])
+        self._table = table = self._make_index(c)
+        for e, h in enumerate(self._hashes):  # no key is rehashed
+            j = self._compress(h)
+            while table[j] != CompactHashMap._FREE:
+                j = (j + 1) % c
+            table[j] = e
+
+    def _bucket_getitem(self, j, k, h):
+        s, e = self._lookup(j, k, h)
+        if e < 0:
+            raise KeyError('Key Error: ' + repr(k))  # no match found
+        return self._values[e]
+
+    def _bucket_setitem(self, j, k, v, h):
+        s, e = self._lookup(j, k, h)
+        if e >= 0:
+            self._values[e] = v  # overwrite existing
+            return
+        self._table[s] = len(self._keys)  # append new entry
+        self._keys.append(k)
+        self._values.append(v)
+        self._hashes.append(h)
+        self._n += 1
+
+    def _bucket_delitem(self, j, k, h):
+        s, e = self._lookup(j, k, h)
+        if e < 0:
+            raise KeyError('Key Error: ' + repr(k))  # no match found
+        self._table[s] = CompactHashMap._DUMMY  # mark as vacated
+        self._keys[e] = CompactHashMap._AVAIL
+        self._values[e] = None  # help garbage collection
+
+    def _check_load(self):
+        if len(self._keys) > len(self._table) // 2:  # live entries plus deleted ones
+            c = len(self._table)
+            if self._n > c // 4:  # grow, unless compacting alone restores the load factor
+                c = 2 * c - 1  # number 2^x - 1 is often prime
+            self._rehash(c)
+
+    def _reserve(self, count):
+        need = self._n + count
+        if len(self._keys) + count > len(self._table) // 2:
+            self._resize(self._capacity(max(2 * need + 1, len(self._table))))  # also compacts
+
+    # ------------------------------ public behaviors ------------------------------
+    def __init__(self, cap=11, p=109345121, pow2=False):
+        """Create an empty hash-table map.
+
+        cap     initial table size (default 11)
+        p       positive prime used for MAD (default 109345121)
+        pow2    if True, use power-of-two table sizes with Fibonacci hashing (default False)
+        """
+        super().__init__(cap, p, pow2=pow2)
+        self._table = self._make_index(len(self._table))  # offsets into the entry arrays
+        self._keys = []  # keys in insertion order (_AVAIL once deleted)
+        self._values = []
+        self._hashes = array('q')  # cached hash(k) of each entry
+
+    def __iter__(self):
+        """Generate keys of the map in insertion order."""
+        for k in self._keys:
+            if k is not CompactHashMap._AVAIL:
+                yield k
+
+
+if __name__ == '__main__':
+    my_map = CompactHashMap()
+    for word in ('b', 'c', 'a'):
+        my_map[word] = ord(word)
+    del my_map['c']
+    print(list(my_map.items()))  # insertion order is preserved
@@ -0,0 +1,177 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch10.multi_map import MultiMap
+
+
+class CompactMultiMap(MultiMap):
+    """A multimap that avoids a secondary container for keys with a single value.
+
+    A key with one value maps directly to that value. Once a key gains a second
+    value its values move into a _Bag, a dict from value to multiplicity, so that
+    removing a specific (k,v) pair and counting the values of a key are O(1).
+    Values must therefore be hashable.
+
+    As for MultiMap, subclasses can override _MapType, e.g. with SortedTableMap
+    or ChainHashMap.
+    """
+
+    # ------------------------------- nested _Bag class -------------------------------
+    class _Bag:
+        """Secondary container holding the values of a key with two or more pairs."""
+        __slots__ = '_counts', '_n'
+
+        def __init__(self, values):
+            self._counts = {}  # value -> multiplicity, in order of first insertion
+            self._n = 0
+            for v in values:
+                self.add(v)
+
+        def __len__(self):
+            return self._n
+
+        def __iter__(self):
+            for v, c in self._counts.items():
+                for _ in range(c):
+                    yield v
+
+        def add(self, v):
+            self._counts[v] = self._counts.get(v, 0) + 1
+            self._n += 1
+
+        def discard(self, v):
+            """Remove one occurrence of v; return False if v is not present."""
+            c = self._counts.get(v, 0)
+            if c == 0:
+                return False
+            if c == 1:
+                del self._counts[v]
+            else:
+                self._counts[v] = c - 1
+            self._n -= 1
+            return True
+
+        def last(self):
+            """Return most recently added distinct value."""
+            return next(reversed(self._counts))
+
+        def first(self):
+            """Return least recently added distinct value."""
+            return next(iter(self._counts))
+
+    _MISSING = object()  # sentinel for an absent key
+
+    # ----------------------------- nonpublic behaviors -----------------------------
+    def _shrink(self, k, bag):
+        """Store the remaining value of bag inline once it holds a single pair."""
+        if len(bag) == 1:
+            self._map[k] = bag.first()
+
+    # ----------------------------- public behaviors -----------------------------
+    def __iter__(self):
+        """Iterate through all (k,v) pairs in multimap."""
+        for k, secondary in self._map.items():
+            if isinstance(secondary, self._Bag):
+                for v in secondary:
+                    yield (k, v)
+            else:
+                yield (k, secondary)
+
+    def add(self, k, v):
+        """Add pair (k,v) to multimap."""
+        # 时间复杂度: O(1) 次底层映射操作
+        secondary = self._map.get(k, self._MISSING)
+        if secondary is self._MISSING:
+            self._map[k] = v  # singleton stored inline
+        elif isinstance(secondary, self._Bag):
+            secondary.add(v)
+        else:
+            self._map[k] = self._Bag((secondary, v))  # second value: switch to a bag
+        self._n += 1
+
+    def pop(self, k):
+        """Remove and return arbitrary (k,v) pair with key k (or raise KeyError)."""
+        secondary = self._map[k]  # may raise KeyError
+        if isinstance(secondary, self._Bag):
+            v = secondary.last()
+            secondary.discard(v)
+            self._shrink(k, secondary)
+        else:
+            v = secondary
+            del self._map[k]  # no pairs left
+        self._n -= 1
+        return (k, v)
+
+    def remove(self, k, v):
+        """Remove one occurrence of pair (k,v) (raise KeyError if not present)."""
+        # 时间复杂度: O(1) 次底层映射操作
+        secondary = self._map.get(k, self._MISSING)
+        if isinstance(secondary, self._Bag):
+            if not secondary.discard(v):
+                raise KeyError('Key Error: ' + repr((k, v)))
+            self._shrink(k, secondary)
+        elif secondary is not self._MISSING and secondary == v:
+            del self._map[k]
+        else:
+            raise KeyError('Key Error: ' + repr((k, v)))
+        self._n -= 1
+
+    def count(self, k):
+        """Return number of (k,v) pairs with key k."""
+        # 时间复杂度: O(1) 次底层映射操作
+        secondary = self._map.get(k, self._MISSING)
+        if secondary is self._MISSING:
+            return 0
+        return len(secondary) if isinstance(secondary, self._Bag) else 1
+
+    def find(self, k):
+        """Return arbitrary (k,v) pair with given key (or raise KeyError)."""
+        secondary = self._map[k]  # may raise KeyError
+        if isinstance(secondary, self._Bag):
+            return (k, secondary.first())
+        return (k, secondary)
+
+    def find_all(self, k):
+        """Generate iteration of all (k,v) pairs with given key."""
+        secondary = self._map.get(k, self._MISSING)
+        if isinstance(secondary, self._Bag):
+            for v in secondary:
+                yield (k, v)
+        elif secondary is not self._MISSING:
+            yield (k, secondary)
+
+
+if __name__ == '__main__':
+    from ch10.sorted_table_map import SortedTableMap
+
+
+    class SortedTableCompactMultiMap(CompactMultiMap):
+        _MapType = SortedTableMap
+
+
+    mm = SortedTableCompactMultiMap()
+    for k, v in [('b', 1), ('a', 1), ('b', 2), ('b', 2), ('c', 3)]:
+        mm.add(k, v)
+    print(list(mm), len(mm))
+    print(mm.count('b'), mm.count('a'), mm.count('z'))
+    mm.remove('b', 2)
+    mm.remove('b', 1)
+    print(list(mm), mm._map['b'])  # 'b' is stored inline again
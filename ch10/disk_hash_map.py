@@ -0,0 +1,395 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pickle
+import struct
+import zlib
+from hashlib import blake2b
+from mmap import mmap
+
+from ch10.map_base import MapBase
+
+_KEY_PROTOCOL = 4  # fixed pickle protocol, so a key always encodes to the same bytes
+
+
+class DiskHashMap(MapBase):
+    """Persistent hash map stored in an index file and a log file.
+
+    The index file is memory mapped. It holds a header, the bucket directory and
+    one fixed-size record per key (hash code, location of the entry in the log,
+    next record of the same bucket). Keys and values are pickled and appended to
+    the log file. Once the entries that were overwritten or deleted take more
+    space than the live ones, compact() rewrites the log with the live entries only.
+
+    The table grows by linear hashing: each growth step splits a single bucket and
+    appends the new bucket's directory segment, so nothing already in the file is
+    copied. Every update is appended to the log before the index is touched; a
+    torn entry at the end of the log fails its CRC and is discarded, and an index
+    that was not closed cleanly is rebuilt by replaying the log.
+
+    Keys are compared and hashed by their pickled form, so equal keys must pickle
+    identically (e.g. str, bytes, int, or tuples of those).
+    """
+
+    MAX_LOAD = 2  # split a bucket when the average bucket holds more records than this
+    COMPACT_MIN = 1 << 16  # never compact a log with fewer dead bytes than this
+
+    _MAGIC = b'DHMAP002'
+    _HEADER = struct.Struct('<8sQQQQQQQQQ')  # magic, dirty, n0, level, split, n, end, free, log size, live
+    _SEGMENTS = 48  # directory segment s >= 1 holds n0 * 2^(s-1) buckets
+    _SEGMENT_TABLE = struct.Struct('<48Q')
+    _HEADER_SIZE = 512  # header and segment table, padded
+    _RECORD = struct.Struct('<QQQII')  # hash, next record, log offset, key length, value length
+    _LINK = struct.Struct('<Q')  # a directory entry or a record's next field
+    _ENTRY = struct.Struct('<IBII')  # crc32, op, key length, value length
+    _PUT, _DEL = 1, 2
+
+    # ----------------------------- nonpublic behaviors -----------------------------
+    @staticmethod
+    def _encode(k):
+        """Return the bytes that stand for key k."""
+        return pickle.dumps(k, _KEY_PROTOCOL)
+
+    @staticmethod
+    def _hash_code(kb):
+        """Return a 64-bit hash code of encoded key kb that is stable across processes."""
+        return int.from_bytes(blake2b(kb, digest_size=8).digest(), 'little')
+
+    def _compress(self, h):
+        """Map hash code h to a bucket number, as for linear hashing."""
+        b = h & ((self._n0 << self._level) - 1)
+        if b < self._split:  # bucket already split at this level
+            b = h & ((self._n0 << (self._level + 1)) - 1)
+        return b
+
+    def _map_file(self, size):
+        """Resize the index file to size bytes and map it again."""
+        if self._mm is not None:
+            self._mm.close()
+        self._index.truncate(size)
+        self._mm = mmap(self._index.fileno(), size)
+
+    def _alloc(self, size):
+        """Return the offset of size fresh (zeroed) bytes at the end of the index."""
+        off = self._end
+        self._end += size
+        if self._end > len(self._mm):
+            self._map_file(max(self._end, 2 * len(self._mm)))  # doubling keeps growth amortized O(1)
+        return off
+
+    def _slot(self, b):
+        """Return the offset of the directory entry of bucket b."""
+        if b < self._n0:
+            return self._segments[0] + 8 * b
+        s = (b // self._n0).bit_length()
+        return self._segments[s] + 8 * (b - (self._n0 << (s - 1)))
+
+    def _touch(self):
+        """Mark the index as dirty, on disk, before its first change."""
+        if not self._dirty:
+            self._dirty = True
+            self._LINK.pack_into(self._mm, 8, 1)
+            self._mm.flush(0, self._HEADER_SIZE)
+
+    def _append(self, op, kb, vb):
+        """Append an entry to the log and return its offset."""
+        info = self._ENTRY.pack(0, op, len(kb), len(vb))[4:]
+        crc = zlib.crc32(vb, zlib.crc32(kb, zlib.crc32(info)))
+        off = self._log_size
+        self._log.seek(off)
+        self._log.write(struct.pack('<I', crc) + info + kb + vb)
+        self._log_size += self._ENTRY.size + len(kb) + len(vb)
+        if self._durable:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+        return off
+
+    def _read(self, off, size):
+        """Return size bytes of the log, starting at offset off."""
+        self._log.seek(off)
+        return self._log.read(size)
+
+    def _find(self, j, kb, h):
+        """Return (prev, r): the record r of key kb in bucket j (0 if absent) and the link that points to it."""
+        mm = self._mm
+        prev = self._slot(j)
+        r = self._LINK.unpack_from(mm, prev)[0]
+        while r:
+            rh, nxt, off, kl, vl = self._RECORD.unpack_from(mm, r)
+            if rh == h and kl == len(kb) and self._read(off + self._ENTRY.size, kl) == kb:
+                break
+            prev, r = r + 8, nxt  # the next field is at offset 8 of a record
+        return prev, r
+
+    def _index_put(self, j, kb, h, off, vl):
+        """Point key kb of bucket j at the log entry at offset off.
+
+        Return the size of the entry that held the previous value, or 0 if the key is new.
+        """
+        prev, r = self._find(j, kb, h)
+        if r:
+            old_kl, old_vl = struct.unpack_from('<II', self._mm, r + 24)
+            struct.pack_into('<QII', self._mm, r + 16, off, len(kb), vl)
+            return self._ENTRY.size + old_kl + old_vl
+        if self._free:
+            r = self._free
+            self._free = self._LINK.unpack_from(self._mm, r + 8)[0]
+        else:
+            r = self._alloc(self._RECORD.size)
+        slot = self._slot(j)
+        head = self._LINK.unpack_from(self._mm, slot)[0]
+        self._RECORD.pack_into(self._mm, r, h, head, off, len(kb), vl)
+        self._LINK.pack_into(self._mm, slot, r)
+        self._n += 1
+        return 0
+
+    def _index_del(self, prev, r):
+        """Unlink record r, pointed to by link prev, and put it on the free list.
+
+        Return the size of the log entry that held the removed value.
+        """
+        nxt, off, kl, vl = struct.unpack_from('<QQII', self._mm, r + 8)
+        self._LINK.pack_into(self._mm, prev, nxt)
+        self._LINK.pack_into(self._mm, r + 8, self._free)
+        self._free = r
+        self._n -= 1
+        return self._ENTRY.size + kl + vl
+
+    def _check_dead(self):
+        """Compact the log once its dead entries take more space than the live ones."""
+        dead = self._log_size - self._live
+        if dead > self._live and dead > self.COMPACT_MIN:
+            self.compact()
+
+    def _check_load(self):
+        """Split one bucket if the average bucket holds more than MAX_LOAD records."""
+        if self._n > self.MAX_LOAD * ((self._n0 << self._level) + self._split):
+            self._split_bucket()
+
+    def _split_bucket(self):
+        """Split the bucket at the split pointer, as for linear hashing."""
+        half = self._n0 << self._level
+        if self._split == 0:  # new level: the buckets half..2*half-1 need a segment
+            self._segments[self._level + 1] = self._alloc(8 * half)
+        b = self._split
+        mm = self._mm
+        stay = self._slot(b)
+        move = self._slot(b + half)
+        r = self._LINK.unpack_from(mm, stay)[0]
+        while r:
+            h, nxt = struct.unpack_from('<QQ', mm, r)
+            if h & half:
+                self._LINK.pack_into(mm, move, r)
+                move = r + 8
+            else:
+                self._LINK.pack_into(mm, stay, r)
+                stay = r + 8
+            r = nxt
+        self._LINK.pack_into(mm, stay, 0)
+        self._LINK.pack_into(mm, move, 0)
+        self._split += 1
+        if self._split == half:
+            self._level += 1
+            self._split = 0
+
+    def _create(self):
+        """Lay out an empty index."""
+        self._level = self._split = self._n = self._free = self._live = 0
+        self._segments = self._SEGMENTS * [0]
+        self._end = self._HEADER_SIZE
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._index.truncate(0)  # discard any previous content
+        self._map_file(self._HEADER_SIZE + 8 * self._n0)
+        self._segments[0] = self._alloc(8 * self._n0)
+        self._dirty = False
+        self._touch()
+
+    def _rebuild(self):
+        """Recreate the index by replaying the log, discarding a torn entry at its end."""
+        self._create()
+        pos = 0
+        while True:
+            info = self._read(pos, self._ENTRY.size)  # lookups below also move the file position
+            if len(info) < self._ENTRY.size:
+                break
+            crc, op, kl, vl = self._ENTRY.unpack(info)
+            body = self._read(pos + self._ENTRY.size, kl + vl)
+            if len(body) < kl + vl or zlib.crc32(body, zlib.crc32(info[4:])) != crc:
+                break
+            kb = body[:kl]
+            h = self._hash_code(kb)
+            j = self._compress(h)
+            if op == self._PUT:
+                self._live += self._ENTRY.size + kl + vl - self._index_put(j, kb, h, pos, vl)
+                self._check_load()
+            else:
+                prev, r = self._find(j, kb, h)
+                if r:
+                    self._live -= self._index_del(prev, r)
+            pos += self._ENTRY.size + kl + vl
+        self._log.truncate(pos)
+        self._log_size = pos
+        self.flush()
+
+    # ----------------------------- public behaviors -----------------------------
+    def __init__(self, path, buckets=16, durable=False):
+        """Open the map stored at path, creating it if needed.
+
+        path     name of the index file; the log is kept in path + '.log'
+        buckets  initial number of buckets of a new map, rounded up to a power of two
+        durable  if True, fsync the log after every update (default False)
+        """
+        self._durable = durable
+        self._mm = None
+        self._log_path = path + '.log'
+        self._index = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        self._log = open(self._log_path, 'r+b' if os.path.exists(self._log_path) else 'w+b')
+        self._log_size = self._log.seek(0, os.SEEK_END)
+        self._n0 = 1 << (buckets - 1).bit_length()
+        size = self._index.seek(0, os.SEEK_END)
+        if size >= self._HEADER_SIZE:
+            self._map_file(size)
+            magic, dirty, n0, level, split, n, end, free, log_size, live = self._HEADER.unpack_from(self._mm)
+            if magic == self._MAGIC and not dirty and log_size == self._log_size:  # closed cleanly
+                self._n0, self._level, self._split, self._n, self._end, self._free = n0, level, split, n, end, free
+                self._live = live
+                self._segments = list(self._SEGMENT_TABLE.unpack_from(self._mm, self._HEADER.size))
+                self._dirty = False
+                return
+        self._rebuild()
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, k):
+        kb = self._encode(k)
+        h = self._hash_code(kb)
+        mm = self._mm
+        r = self._LINK.unpack_from(mm, self._slot(self._compress(h)))[0]
+        while r:
+            rh, r, off, kl, vl = self._RECORD.unpack_from(mm, r)
+            if rh == h and kl == len(kb):
+                data = self._read(off + self._ENTRY.size, kl + vl)  # key and value in one read
+                if data[:kl] == kb:
+                    return pickle.loads(data[kl:])
+        raise KeyError('Key Error: ' + repr(k))
+
+    def __setitem__(self, k, v):
+        kb = self._encode(k)
+        h = self._hash_code(kb)
+        vb = pickle.dumps(v, pickle.HIGHEST_PROTOCOL)
+        off = self._append(self._PUT, kb, vb)  # the log is written before the index
+        self._touch()
+        self._live += self._ENTRY.size + len(kb) + len(vb)
+        self._live -= self._index_put(self._compress(h), kb, h, off, len(vb))  # maintains self._n
+        self._check_load()
+        self._check_dead()
+
+    def __delitem__(self, k):
+        kb = self._encode(k)
+        h = self._hash_code(kb)
+        prev, r = self._find(self._compress(h), kb, h)
+        if not r:
+            raise KeyError('Key Error: ' + repr(k))
+        self._append(self._DEL, kb, b'')
+        self._touch()
+        self._live -= self._index_del(prev, r)  # maintains self._n
+        self._check_dead()
+
+    def __iter__(self):
+        mm = self._mm
+        for b in range((self._n0 << self._level) + self._split):
+            r = self._LINK.unpack_from(mm, self._slot(b))[0]
+            while r:
+                h, r, off, kl, vl = self._RECORD.unpack_from(mm, r)
+                yield pickle.loads(self._read(off + self._ENTRY.size, kl))
+
+    def compact(self):
+        """Rewrite the log so that it holds only the entry of each key's current value.
+
+        The new log is written to a separate file and then renamed over the old one,
+        so a crash at any point leaves either log complete; the index is marked dirty
+        until it is flushed again, so it is rebuilt from whichever log survived.
+        """
+        # 时间复杂度: O(n + 存活数据的字节数)
+        self._touch()
+        mm = self._mm
+        moved = []  # (record, new offset) pairs, applied once the new log is in place
+        pos = 0
+        with open(self._log_path + '.compact', 'wb') as out:
+            for b in range((self._n0 << self._level) + self._split):
+                r = self._LINK.unpack_from(mm, self._slot(b))[0]
+                while r:
+                    h, nxt, off, kl, vl = self._RECORD.unpack_from(mm, r)
+                    out.write(self._read(off, self._ENTRY.size + kl + vl))  # the CRC does not cover the offset
+                    moved.append((r, pos))
+                    pos += self._ENTRY.size + kl + vl
+                    r = nxt
+            out.flush()
+            os.fsync(out.fileno())
+        self._log.close()
+        os.replace(self._log_path + '.compact', self._log_path)
+        self._log = open(self._log_path, 'r+b')
+        for r, off in moved:
+            self._LINK.pack_into(mm, r + 16, off)
+        self._log_size = self._live = pos
+
+    def flush(self):
+        """Make every update durable and mark the index as consistent with the log."""
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._mm.flush()  # index pages first, then the header that vouches for them
+        self._HEADER.pack_into(self._mm, 0, self._MAGIC, 0, self._n0, self._level, self._split,
+                               self._n, self._end, self._free, self._log_size, self._live)
+        self._SEGMENT_TABLE.pack_into(self._mm, self._HEADER.size, *self._segments)
+        self._mm.flush(0, self._HEADER_SIZE)
+        self._dirty = False
+
+    def close(self):
+        """Flush the map and close its files."""
+        if self._mm is not None:
+            self.flush()
+            self._mm.close()
+            self._mm = None
+            self._index.close()
+            self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'demo.idx')
+    with DiskHashMap(path, buckets=2) as m:
+        for i in range(20):
+            m['key%d' % i] = [i] * (i % 4)
+        del m['key3']
+        print(len(m), m['key7'], (m._n0 << m._level) + m._split)  # number of buckets after splits
+    with DiskHashMap(path) as m:  # reopened from disk
+        print(len(m), m['key7'], 'key3' in m)
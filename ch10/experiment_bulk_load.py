@@ -0,0 +1,64 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from random import shuffle
+from time import perf_counter
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.probe_hash_map import ProbeHashMap
+from ch10.sorted_table_map import SortedTableMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 100000
+
+
+def one_by_one(map_type, pairs):
+    """Load pairs with one __setitem__ call per pair and return the elapsed time."""
+    start = perf_counter()
+    m = map_type()
+    for k, v in pairs:
+        m[k] = v
+    return perf_counter() - start
+
+
+def bulk(map_type, pairs):
+    """Load pairs with a single from_items call and return the elapsed time."""
+    start = perf_counter()
+    map_type.from_items(pairs)
+    return perf_counter() - start
+
+
+if __name__ == '__main__':
+    # 逐个插入 与 批量插入 的耗时对比(单位: 秒)
+    keys = list(range(maxN))
+    shuffle(keys)
+    pairs = [(k, k) for k in keys]
+    print('n = {0}'.format(maxN))
+    print('{0:<16}{1:>14}{2:>14}'.format('map', 'one-by-one', 'from_items'))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    for map_type in (ChainHashMap, ProbeHashMap, SortedTableMap):
+        print('{0:<16}{1:>14.3f}{2:>14.3f}'.format(
+            map_type.__name__, one_by_one(map_type, pairs), bulk(map_type, pairs)))
+    gc.enable()
@@ -0,0 +1,70 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+import tracemalloc
+from time import perf_counter
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.compact_hash_map import CompactHashMap
+from ch10.probe_hash_map import ProbeHashMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 200000
+
+
+def build(map_type, keys):
+    """Return a new map_type instance holding every key of keys."""
+    m = map_type()
+    for k in keys:
+        m[k] = None
+    return m
+
+
+def measure(map_type, keys):
+    """Return (bytes used, insert seconds, lookup seconds) for a map holding keys."""
+    tracemalloc.start()  # memory is measured on a separate, untimed build
+    base = tracemalloc.get_traced_memory()[0]
+    m = build(map_type, keys)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del m
+    start = perf_counter()
+    m = build(map_type, keys)
+    insert = perf_counter() - start
+    start = perf_counter()
+    for k in keys:
+        m[k]
+    lookup = perf_counter() - start
+    return used, insert, lookup
+
+if __name__ == '__main__':
+    # 字符串键，键本身的内存不计入(在测量前已创建)
+    keys = ['key%d' % k for k in range(maxN)]
+    print('n = {0}'.format(maxN))
+    print('{0:<16}{1:>14}{2:>12}{3:>14}{4:>14}'.format(
+        'map', 'bytes/entry', 'total(MB)', 'insert(us)', 'lookup(us)'))
+    for map_type in (ChainHashMap, ProbeHashMap, CompactHashMap):
+        used, insert, lookup = measure(map_type, keys)
+        print('{0:<16}{1:>14.1f}{2:>12.2f}{3:>14.3f}{4:>14.3f}'.format(
+            map_type.__name__, used / maxN, used / 2 ** 20, insert / maxN * 1e6, lookup / maxN * 1e6))
@@ -0,0 +1,78 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import os
+import pickle
+import sys
+import tempfile
+from random import randrange
+from time import perf_counter
+
+from ch10.disk_hash_map import DiskHashMap
+from ch10.probe_hash_map import ProbeHashMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 100000
+
+LOOKUPS = 10000
+
+
+def lookups(m, n):
+    """Perform LOOKUPS random lookups on m and return the elapsed time."""
+    keys = ['key%d' % randrange(n) for _ in range(LOOKUPS)]
+    start = perf_counter()
+    for k in keys:
+        m[k]
+    return perf_counter() - start
+
+
+if __name__ == '__main__':
+    # 启动耗时(打开已有的map) 与 随机查找耗时 的对比(单位: 秒)
+    folder = tempfile.mkdtemp()
+    pickle_path = os.path.join(folder, 'probe.pickle')
+    disk_path = os.path.join(folder, 'disk.idx')
+
+    m = ProbeHashMap()
+    m.update_many(('key%d' % i, i) for i in range(maxN))
+    with open(pickle_path, 'wb') as f:
+        pickle.dump(m, f, pickle.HIGHEST_PROTOCOL)
+    del m
+    with DiskHashMap(disk_path) as m:
+        m.update_many(('key%d' % i, i) for i in range(maxN))
+
+    print('n = {0}, lookups = {1}'.format(maxN, LOOKUPS))
+    print('{0:<24}{1:>10}{2:>10}'.format('map', 'startup', 'lookup'))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    start = perf_counter()
+    with open(pickle_path, 'rb') as f:
+        m = pickle.load(f)
+    startup = perf_counter() - start
+    print('{0:<24}{1:>10.4f}{2:>10.4f}'.format('pickled ProbeHashMap', startup, lookups(m, maxN)))
+    del m
+    start = perf_counter()
+    m = DiskHashMap(disk_path)
+    startup = perf_counter() - start
+    print('{0:<24}{1:>10.4f}{2:>10.4f}'.format('DiskHashMap', startup, lookups(m, maxN)))
+    m.close()
+    gc.enable()
@@ -0,0 +1,69 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from time import perf_counter
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.compact_hash_map import CompactHashMap
+from ch10.probe_hash_map import ProbeHashMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 200000
+
+
+def run(map_type, keys, pow2):
+    """Return (insert seconds, hit seconds, miss seconds) for the given table mode."""
+    gc.collect()
+    m = map_type(pow2=pow2)
+    start = perf_counter()
+    for k in keys:
+        m[k] = None
+    insert = perf_counter() - start
+    start = perf_counter()
+    for k in keys:
+        m[k]
+    hit = perf_counter() - start
+    start = perf_counter()
+    for k in keys:
+        m.get((k,))  # unsuccessful searches
+    miss = perf_counter() - start
+    return insert, hit, miss
+
+
+if __name__ == '__main__':
+    # 比较 MAD 压缩(素数模) 与 2的幂次表 + Fibonacci 哈希 (单位: 微秒/次)
+    # str 的哈希值由解释器缓存; tuple 的哈希值每次调用 hash() 都要重新计算
+    print('n = {0}'.format(maxN))
+    print('{0:<8}{1:<16}{2:<8}{3:>12}{4:>10}{5:>10}'.format('keys', 'map', 'mode', 'insert', 'hit', 'miss'))
+    for kind, keys in (('str', ['user:%d' % k for k in range(maxN)]),
+                       ('tuple', [('user', k) for k in range(maxN)])):
+        gc.disable()  # as timeit does, keep collector pauses out of the measurement
+        for map_type in (ChainHashMap, ProbeHashMap, CompactHashMap):
+            for pow2 in (False, True):
+                insert, hit, miss = run(map_type, keys, pow2)
+                print('{0:<8}{1:<16}{2:<8}{3:>12.3f}{4:>10.3f}{5:>10.3f}'.format(
+                    kind, map_type.__name__, 'pow2' if pow2 else 'MAD',
+                    insert / maxN * 1e6, hit / maxN * 1e6, miss / maxN * 1e6))
+        gc.enable()
@@ -0,0 +1,60 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+from time import perf_counter
+
+from ch10.probe_hash_map import ProbeHashMap
+from ch10.probe_strategies import DoubleHashProbeHashMap, QuadraticProbeHashMap, RobinHoodHashMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 20000
+
+
+def churn(map_type, n, rounds):
+    """Keep n live keys while inserting a new key and deleting the oldest one, rounds times.
+
+    Return (seconds per operation, probe statistics at the end).
+    """
+    m = map_type()
+    for k in range(n):
+        m[k] = k
+    start = perf_counter()
+    for k in range(n, n + rounds):
+        m[k] = k  # a new session ...
+        del m[k - n]  # ... evicts the oldest one
+        m[k - n // 2]  # and a live one is looked up
+    elapsed = perf_counter() - start
+    return elapsed / (3 * rounds), m.probe_stats()
+
+
+if __name__ == '__main__':
+    # 模拟会话缓存: 大量 插入/删除 交替进行
+    print('n = {0}, rounds = {1}'.format(maxN, 10 * maxN))
+    print('{0:<24}{1:>10}{2:>10}{3:>8}{4:>8}{5:>10}'.format(
+        'map', 'op(us)', 'capacity', 'avail', 'mean', 'max'))
+    for map_type in (ProbeHashMap, QuadraticProbeHashMap, DoubleHashProbeHashMap, RobinHoodHashMap):
+        per_op, stats = churn(map_type, maxN, 10 * maxN)
+        print('{0:<24}{1:>10.3f}{2:>10}{3:>8}{4:>8.2f}{5:>10}'.format(
+            map_type.__name__, per_op * 1e6, stats['capacity'], stats['avail'],
+            stats['mean_probes'], stats['max_probes']))
@@ -0,0 +1,66 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from time import perf_counter
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.probe_hash_map import ProbeHashMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 200000
+
+
+def insert_latencies(map_type, n, incremental):
+    """Insert n keys into a new map and return the sorted per-insert latencies (seconds)."""
+    m = map_type(incremental=incremental)
+    latencies = []
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    try:
+        for k in range(n):
+            start = perf_counter()
+            m[k] = k
+            latencies.append(perf_counter() - start)
+    finally:
+        gc.enable()
+    latencies.sort()
+    return latencies
+
+
+def percentile(data, q):
+    """Return the q-th percentile of the sorted list data."""
+    return data[min(len(data) - 1, int(q / 100 * len(data)))]
+
+
+if __name__ == '__main__':
+    # 比较 一次性rehash 与 渐进式rehash 的插入延迟(单位: 微秒)
+    print('{0:<14}{1:<13}{2:>10}{3:>10}{4:>10}{5:>12}{6:>10}'.format(
+        'map', 'mode', 'p50', 'p99', 'p99.9', 'max', 'total(s)'))
+    for map_type in (ChainHashMap, ProbeHashMap):
+        for incremental in (False, True):
+            lat = insert_latencies(map_type, maxN, incremental)
+            print('{0:<14}{1:<13}{2:>10.2f}{3:>10.2f}{4:>10.2f}{5:>12.2f}{6:>10.3f}'.format(
+                map_type.__name__, 'incremental' if incremental else 'resize',
+                percentile(lat, 50) * 1e6, percentile(lat, 99) * 1e6, percentile(lat, 99.9) * 1e6,
+                lat[-1] * 1e6, sum(lat)))
@@ -0,0 +1,79 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+from random import Random
+from threading import Lock, Thread
+from time import perf_counter
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.sharded_hash_map import ShardedHashMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 200000  # total operations per run
+
+
+def global_lock_worker(m, lock, ops, seed):
+    """Mixed reads/writes on a ChainHashMap guarded by one lock."""
+    rnd = Random(seed)
+    for j in range(ops):
+        k = rnd.randrange(100000)
+        with lock:
+            if j % 4 == 0:
+                m[k] = j
+            else:
+                m.get(k)
+
+
+def sharded_worker(m, lock, ops, seed):
+    """The same mix on a ShardedHashMap (lock is unused)."""
+    rnd = Random(seed)
+    for j in range(ops):
+        k = rnd.randrange(100000)
+        if j % 4 == 0:
+            m[k] = j
+        else:
+            m.get(k)
+
+
+def run(worker, m, threads):
+    """Split maxN operations over the given number of threads and return operations per second."""
+    lock = Lock()
+    pool = [Thread(target=worker, args=(m, lock, maxN // threads, t)) for t in range(threads)]
+    start = perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return maxN / (perf_counter() - start)
+
+
+if __name__ == '__main__':
+    # 多线程竞争下的吞吐量(次/秒): 全局锁 + ChainHashMap 与 分片锁 ShardedHashMap
+    # 注意: 在有 GIL 的解释器上，分片锁只能减少锁竞争，无法让 Python 代码真正并行执行
+    print('operations = {0}, 25% writes'.format(maxN))
+    print('{0:>8}{1:>16}{2:>16}'.format('threads', 'global lock', 'sharded'))
+    for threads in (1, 2, 4, 8, 16, 32):
+        a = run(global_lock_worker, ChainHashMap(), threads)
+        b = run(sharded_worker, ShardedHashMap(shards=64), threads)
+        print('{0:>8}{1:>16.0f}{2:>16.0f}'.format(threads, a, b))
@@ -0,0 +1,63 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from random import shuffle
+from time import perf_counter
+
+from ch10.blocked_sorted_table_map import BlockedSortedTableMap
+from ch10.sorted_table_map import SortedTableMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 100000
+
+
+def measure(map_type, keys):
+    """Return elapsed times of random inserts, lookups and find_le calls on map_type."""
+    m = map_type()
+    start = perf_counter()
+    for k in keys:
+        m[2 * k] = k
+    insert = perf_counter() - start
+    start = perf_counter()
+    for k in keys:
+        m[2 * k]
+    lookup = perf_counter() - start
+    start = perf_counter()
+    for k in keys:
+        m.find_le(2 * k + 1)
+    find_le = perf_counter() - start
+    return insert, lookup, find_le
+
+
+if __name__ == '__main__':
+    # 随机插入、查找 与 find_le 的耗时对比(单位: 秒)
+    keys = list(range(maxN))
+    shuffle(keys)
+    print('n = {0}'.format(maxN))
+    print('{0:<24}{1:>10}{2:>10}{3:>10}'.format('map', 'insert', 'lookup', 'find_le'))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    for map_type in (SortedTableMap, BlockedSortedTableMap):
+        print('{0:<24}{1:>10.3f}{2:>10.3f}{3:>10.3f}'.format(map_type.__name__, *measure(map_type, keys)))
+    gc.enable()
@@ -20,66 +20,208 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from ch10.map_base import MapBase
+from collections.abc import Mapping, Sized
+from copy import copy  # used to freeze the old table during incremental rehash
 from random import randrange  # used to pick MAD parameters
 
+_FIBONACCI = 0x9E3779B97F4A7C15  # 2^64 / golden ratio, multiplier for Fibonacci hashing
+_MASK64 = (1 << 64) - 1
+
 
 class HashMapBase(MapBase):
     """Abstract base class for map using hash-table with MAD compression.
 
-    Keys must be hashable and non-None.
+    Keys must be hashable and non-None. Each item caches the hash code of its key,
+    so that resizing never rehashes a key and searches compare hash codes before keys.
     """
 
-    def __init__(self, cap=11, p=109345121):
+    REHASH_STEP = 8  # number of old-table slots migrated per update (incremental mode)
+
+    # ------------------------------- nested _Item class -------------------------------
+    class _Item(MapBase._Item):
+        """Map item that also stores the full hash code of its key."""
+        __slots__ = '_hash'
+
+        def __init__(self, k, v, h):
+            self._key = k  # assigned directly; one item is created per insertion
+            self._value = v
+            self._hash = h
+
+    def __init__(self, cap=11, p=109345121, incremental=False, pow2=False):
         """Create an empty hash-table map.
 
-        cap     initial table size (default 11)
-        p       positive prime used for MAD (default 109345121)
+        cap          initial table size (default 11)
+        p            positive prime used for MAD (default 109345121)
+        incremental  if True, grow the table by incremental rehashing (default False)
+        pow2         if True, use power-of-two table sizes with Fibonacci hashing
+                     instead of MAD compression (default False)
         """
+        self._pow2 = pow2
+        if pow2:
+            cap = 1 << (cap - 1).bit_length()  # round up to a power of two
         self._table = cap * [None]
         self._n = 0  # number of entries in the map
         self._prime = p  # prime for MAD compression
         self._scale = 1 + randrange(p - 1)  # scale from 1 to p-1 for MAD
         self._shift = randrange(p)  # shift from 0 to p-1 for MAD
+        self._incremental = incremental
+        self._old = None  # map over the previous table while a rehash is in progress
+        self._rehash_start = 0  # index of old table where migration began
+        self._rehash_done = 0  # number of old-table slots already migrated
+
+    def _compress(self, h):
+        """Map hash code h to an index of the table."""
+        if self._pow2:
+            # Fibonacci hashing: the top bits of h * 2^64/phi mix every bit of h
+            return (h * _FIBONACCI & _MASK64) >> (65 - len(self._table).bit_length())
+        return (h * self._scale + self._shift) % self._prime % len(self._table)
 
     def _hash_function(self, k):
         """哈希函数"""
-        return (hash(k) * self._scale + self._shift) % self._prime % len(self._table)
+        return self._compress(hash(k))
 
     def __len__(self):
         return self._n
 
     def __getitem__(self, k):
-        j = self._hash_function(k)
-        return self._bucket_getitem(j, k)  # may raise KeyError
+        h = hash(k)  # computed once, then reused by every probe
+        try:
+            return self._bucket_getitem(self._compress(h), k, h)  # may raise KeyError
+        except KeyError:
+            j = self._old_index(h) if self._old is not None else None
+            if j is None:
+                raise
+        return self._old._bucket_getitem(j, k, h)  # may raise KeyError
 
     def __setitem__(self, k, v):
-        j = self._hash_function(k)
-        self._bucket_setitem(j, k, v)  # subroutine maintains self._n
-        if self._n > len(self._table) // 2:  # keep load factor <= 0.5
-            self._resize(2 * len(self._table) - 1)  # number 2^x - 1 is often prime
+        h = hash(k)
+        if self._old is not None:
+            self._rehash_step(self.REHASH_STEP)
+            j = self._old_index(h) if self._old is not None else None
+            if j is not None:
+                try:
+                    self._old._bucket_delitem(j, k, h)  # key moves to the new table
+                    self._n -= 1  # re-counted by _bucket_setitem below
+                except KeyError:
+                    pass
+        self._bucket_setitem(self._compress(h), k, v, h)  # subroutine maintains self._n
+        self._check_load()
 
     def __delitem__(self, k):
-        j = self._hash_function(k)
-        self._bucket_delitem(j, k)  # may raise KeyError
+        if self._old is not None:
+            self._rehash_step(self.REHASH_STEP)
+        h = hash(k)
+        try:
+            self._bucket_delitem(self._compress(h), k, h)  # may raise KeyError
+        except KeyError:
+            j = self._old_index(h) if self._old is not None else None
+            if j is None:
+                raise
+            self._old._bucket_delitem(j, k, h)  # may raise KeyError
         self._n -= 1
 
+    def _check_load(self):
+        """Grow the table if an insertion has made it too full."""
+        if self._n > len(self._table) // 2:  # keep load factor <= 0.5
+            self._rehash(2 * len(self._table) - 1)  # number 2^x - 1 is often prime
+
+    def _reserve(self, count):
+        """Grow the table at once, if necessary, so that count more items keep load factor <= 0.5."""
+        need = self._n + count
+        if need > len(self._table) // 2:
+            self._resize(self._capacity(2 * need + 1))
+
+    def _capacity(self, c):
+        """Return the table capacity to use when at least c slots are requested."""
+        if self._pow2:
+            return 1 << (c - 1).bit_length()  # round up to a power of two
+        return c
+
+    def _rehash(self, c):
+        """Move all items into a bucket array of capacity c."""
+        c = self._capacity(c)
+        if self._incremental:
+            self._begin_rehash(c)
+        else:
+            self._resize(c)
+
     def _resize(self, c):
         """Resize bucket array to capacity c and rehash all items."""
-        old = list(self.items())  # use iteration to record existing items
-        self._table = c * [None]  # then reset table to desired capacity
-        self._n = 0  # n recomputed during subsequent adds
-        for (k, v) in old:
-            self[k] = v  # reinsert old key-value pair
+        self._begin_rehash(c)
+        self._rehash_step(len(self._old._table))  # migrate everything at once
+
+    # ------------------------------- bulk operations -------------------------------
+    def update_many(self, pairs):
+        """Assign every (k,v) pair of an iterable (or the items of a mapping).
+
+        The table is sized once for the whole batch, so no resize is triggered
+        while the pairs are inserted.
+        """
+        if isinstance(pairs, Mapping):
+            pairs = pairs.items()
+        elif not isinstance(pairs, Sized):
+            pairs = list(pairs)  # batch length is needed to presize the table
+        if self._old is not None:  # complete a pending incremental rehash
+            self._rehash_step(len(self._old._table))
+        self._reserve(len(pairs))
+        for k, v in pairs:
+            h = hash(k)
+            self._bucket_setitem(self._compress(h), k, v, h)  # subroutine maintains self._n
+
+    # ------------------------------- incremental rehashing -------------------------------
+    # 渐进式rehash: 扩容时不一次性迁移所有元素，而是保留旧表，
+    # 每次 set/del 时只迁移 REHASH_STEP 个槽位，查找时同时检查新旧两张表。
+    # (查找时不迁移，因此遍历过程中可以安全地读取 map，例如 items())
+    def _begin_rehash(self, c):
+        """Start migrating all items into a new bucket array of capacity c."""
+        if self._old is not None:  # previous rehash not yet finished
+            self._rehash_step(len(self._old._table))
+        old = copy(self)  # shares the current bucket array
+        start = 0
+        while start < len(self._table) and self._table[start] is not None:
+            start += 1  # begin at an empty slot, so no probe cluster wraps past it
+        self._old = old
+        self._table = c * [None]
+        self._rehash_start = start % len(old._table)
+        self._rehash_done = 0
+
+    def _rehash_step(self, count):
+        """Migrate up to count slots of the old table into the current one."""
+        old = self._old
+        cap = len(old._table)
+        stop = min(self._rehash_done + count, cap)
+        for d in range(self._rehash_done, stop):
+            for item in old._bucket_drain((self._rehash_start + d) % cap):
+                self._n -= 1  # re-counted by _bucket_setitem
+                h = item._hash  # cached, so the key is never rehashed
+                self._bucket_setitem(self._compress(h), item._key, item._value, h)
+        self._rehash_done = stop
+        if stop == cap:
+            self._old = None  # migration complete; release the old table
+
+    def _old_index(self, h):
+        """Return index of the old table where hash code h may be stored, or None if it cannot be there."""
+        old = self._old
+        j = old._compress(h)
+        if (j - self._rehash_start) % len(old._table) < self._rehash_done:
+            return None  # the bucket was already migrated
+        return j
 
     """ =============== 未实现的方法 =============== """
 
-    def _bucket_getitem(self, j, k):
+    # j is the table index of key k, and h is its full hash code
+
+    def _bucket_getitem(self, j, k, h):
+        raise NotImplementedError('must be implemented by subclass')
+
+    def _bucket_setitem(self, j, k, v, h):
         raise NotImplementedError('must be implemented by subclass')
 
-    def _bucket_setitem(self, j, k, v):
+    def _bucket_delitem(self, j, k, h):
         raise NotImplementedError('must be implemented by subclass')
 
-    def _bucket_delitem(self, j, k):
+    def _bucket_drain(self, j):
+        """Remove all items stored at index j, returning them as a list of _Item instances."""
         raise NotImplementedError('must be implemented by subclass')
 
 
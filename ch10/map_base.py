@@ -25,7 +25,7 @@
 #      from collections import MutableMapping.
 # from collections import MutableMapping
 
-from collections.abc import MutableMapping
+from collections.abc import Mapping, MutableMapping
 
 
 class MapBase(MutableMapping):
@@ -48,3 +48,34 @@ class MapBase(MutableMapping):
 
         def __lt__(self, other):
             return self._key < other._key  # compare items based on their keys
+
+    # ------------------------------- bulk operations -------------------------------
+    # 批量操作: 默认实现逐个调用单键方法，子类可以重写以一次性完成整批操作。
+    @classmethod
+    def from_items(cls, pairs, *args, **kwargs):
+        """Create a new map holding the (k,v) pairs of an iterable (or the items of a mapping).
+
+        Any further arguments are passed to the constructor.
+        """
+        m = cls(*args, **kwargs)
+        m.update_many(pairs)
+        return m
+
+    def update_many(self, pairs):
+        """Assign every (k,v) pair of an iterable (or the items of a mapping).
+
+        When a key occurs more than once, its last value is kept.
+        """
+        if isinstance(pairs, Mapping):
+            pairs = pairs.items()
+        for k, v in pairs:
+            self[k] = v
+
+    def get_many(self, keys, default=None):
+        """Return a list with the value of each key of an iterable (default for a missing key)."""
+        return [self.get(k, default) for k in keys]
+
+    def delete_many(self, keys):
+        """Remove every key of an iterable (raise KeyError if one is not found)."""
+        for k in keys:
+            del self[k]
@@ -0,0 +1,48 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from random import Random
+
+
+def fuzz(m, steps, seed):
+    """Apply random updates to m and to a dict, checking that they always agree."""
+    rng = Random(seed)
+    ref = {}
+    for step in range(steps):
+        k = rng.randrange(steps // 2)
+        if rng.random() < 0.6:
+            m[k] = step
+            ref[k] = step
+        elif k in ref:
+            del m[k]
+            del ref[k]
+        else:
+            try:
+                del m[k]
+            except KeyError:
+                pass
+            else:
+                raise AssertionError('deleted a missing key')
+        assert len(m) == len(ref)
+        probe = rng.randrange(steps // 2)
+        assert m.get(probe) == ref.get(probe)
+    assert sorted(m) == sorted(ref)
+    assert dict(m.items()) == ref
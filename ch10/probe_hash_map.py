@@ -26,52 +26,137 @@ class ProbeHashMap(HashMapBase):
     """Hash map implemented with linear probing for collision resolution."""
     _AVAIL = object()  # sentinal marks locations of previous deletions
 
+    def __init__(self, cap=11, p=109345121, incremental=False, pow2=False):
+        """Create an empty hash-table map.
+
+        cap          initial table size (default 11)
+        p            positive prime used for MAD (default 109345121)
+        incremental  if True, grow the table by incremental rehashing (default False)
+        pow2         if True, use power-of-two table sizes with Fibonacci hashing (default False)
+        """
+        super().__init__(cap, p, incremental, pow2)
+        self._avail = 0  # number of _AVAIL markers in the table
+
     def _is_available(self, j):
         """Return True if index j is available in table."""
         return self._table[j] is None or self._table[j] is ProbeHashMap._AVAIL
 
-    def _find_slot(self, j, k):
-        """Search for key k in bucket at index j.
+    def _find_slot(self, j, k, h):
+        """Search for key k, having hash code h, in bucket at index j.
 
         Return (success, index) tuple, described as follows:
         If match was found, success is True and index denotes its location.
-        If no match found, success is False and index denotes first available slot.
+        If no match found, success is False and index denotes first available slot
+        (None if the table has no available slot).
         """
+        table = self._table
+        cap = len(table)
         firstAvail = None
-        while True:
-            if self._is_available(j):
+        for _ in range(cap):  # a full table (e.g. the old one during a rehash) has no None to stop at
+            item = table[j]
+            if item is None:
+                return (False, j if firstAvail is None else firstAvail)  # search has failed
+            if item is ProbeHashMap._AVAIL:
                 if firstAvail is None:
                     firstAvail = j  # mark this as first avail
-                if self._table[j] is None:
-                    return (False, firstAvail)  # search has failed
-            elif k == self._table[j]._key:
-                return (True, j)  # found a match
-            j = (j + 1) % len(self._table)  # keep looking (cyclically)
-
-    def _bucket_getitem(self, j, k):
-        found, s = self._find_slot(j, k)
+            elif item._hash == h and (item._key is k or item._key == k):
+                return (True, j)  # found a match (hash codes compared first)
+            j = (j + 1) % cap  # keep looking (cyclically)
+        return (False, firstAvail)  # None if every slot holds an item
+
+    def _bucket_getitem(self, j, k, h):
+        found, s = self._find_slot(j, k, h)
         if not found:
             raise KeyError('Key Error: ' + repr(k))  # no match found
         return self._table[s]._value
 
-    def _bucket_setitem(self, j, k, v):
-        found, s = self._find_slot(j, k)
+    def _bucket_setitem(self, j, k, v, h):
+        found, s = self._find_slot(j, k, h)
         if not found:
-            self._table[s] = self._Item(k, v)  # insert new item
+            if s is None:  # cannot happen while the table is at most half full
+                raise RuntimeError('probe sequence found no available slot')
+            if self._table[s] is ProbeHashMap._AVAIL:
+                self._avail -= 1  # marker is reused
+            self._table[s] = self._Item(k, v, h)  # insert new item
             self._n += 1  # size has increased
         else:
             self._table[s]._value = v  # overwrite existing
 
-    def _bucket_delitem(self, j, k):
-        found, s = self._find_slot(j, k)
+    def _bucket_delitem(self, j, k, h):
+        found, s = self._find_slot(j, k, h)
         if not found:
             raise KeyError('Key Error: ' + repr(k))  # no match found
         self._table[s] = ProbeHashMap._AVAIL  # mark as vacated
+        self._avail += 1
+
+    def _bucket_drain(self, j):
+        item = self._table[j]
+        self._table[j] = None
+        return [] if item is None or item is ProbeHashMap._AVAIL else [item]
+
+    def _old_index(self, h):
+        j = super()._old_index(h)
+        if j is None:
+            # slots before the migration cursor are emptied, but the probe
+            # sequence may continue beyond it, so resume the search there
+            old = self._old
+            j = (self._rehash_start + self._rehash_done) % len(old._table)
+        return j
+
+    def _begin_rehash(self, c):
+        super()._begin_rehash(c)
+        self._avail = 0  # the new table has no markers
+
+    def _probe_sequence(self, j, h):
+        """Generate the indices examined by a search for hash code h starting at index j."""
+        while True:
+            yield j
+            j = (j + 1) % len(self._table)
+
+    def _check_load(self):
+        # _AVAIL markers lengthen searches just like items do, so reclaim them
+        # once items and markers together occupy more than half of the table
+        if self._n + self._avail > len(self._table) // 2:
+            c = len(self._table)
+            if self._n > c // 4:  # grow, unless dropping the markers alone suffices
+                c = 2 * c - 1  # number 2^x - 1 is often prime
+            self._rehash(c)
+
+    def _reserve(self, count):
+        need = self._n + count
+        if need + self._avail > len(self._table) // 2:
+            self._resize(self._capacity(max(2 * need + 1, len(self._table))))  # also drops markers
+
+    def probe_stats(self):
+        """Return a dict of statistics describing the probe lengths of the current table.
+
+        mean_probes and max_probes count the slots examined by a successful search.
+        """
+        lengths = []
+        for s in range(len(self._table)):
+            if not self._is_available(s):
+                h = self._table[s]._hash
+                count = 0
+                for j in self._probe_sequence(self._compress(h), h):
+                    count += 1
+                    if j == s:
+                        break
+                lengths.append(count)
+        return {
+            'n': len(lengths),
+            'capacity': len(self._table),
+            'load_factor': len(lengths) / len(self._table),
+            'avail': self._avail,
+            'mean_probes': sum(lengths) / len(lengths) if lengths else 0,
+            'max_probes': max(lengths, default=0),
+        }
 
     def __iter__(self):
         for j in range(len(self._table)):  # scan entire table
             if not self._is_available(j):
                 yield self._table[j]._key
+        if self._old is not None:  # keys not yet migrated by an incremental rehash
+            yield from self._old
 
 
 if __name__ == '__main__':
@@ -0,0 +1,185 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch10.probe_hash_map import ProbeHashMap
+
+
+def _next_prime(c):
+    """Return the smallest prime number that is at least c."""
+    c = max(c, 2)
+    while any(c % d == 0 for d in range(2, int(c ** 0.5) + 1)):
+        c += 1
+    return c
+
+
+class _ScatteredProbeHashMap(ProbeHashMap):
+    """Abstract base for open addressing whose probe sequence is not contiguous.
+
+    The probe sequence for hash code h moves from index j by a step that starts
+    at s and grows by t after every probe, where (s, t) = _probe_steps(h). Table
+    capacities are kept prime (or a power of two in pow2 mode) so that the
+    sequence reaches an empty slot whenever the table is at most half full.
+    """
+
+    _MIN_CAPACITY = 7  # smallest table; quadratic probing reaches only (N+1)/2 slots of a prime table
+
+    def __init__(self, cap=11, p=109345121, incremental=False, pow2=False):
+        cap = max(cap, self._MIN_CAPACITY)
+        super().__init__(cap if pow2 else _next_prime(cap), p, incremental, pow2)
+
+    def _probe_steps(self, h):
+        """Return (first step, step increment) of the probe sequence for hash code h."""
+        raise NotImplementedError('must be implemented by subclass')
+
+    def _find_slot(self, j, k, h):
+        table = self._table
+        cap = len(table)
+        step, inc = self._probe_steps(h)
+        firstAvail = None
+        for _ in range(cap):  # the sequence may revisit slots, so it is cut off after cap probes
+            item = table[j]
+            if item is None:
+                return (False, j if firstAvail is None else firstAvail)  # search has failed
+            if item is ProbeHashMap._AVAIL:
+                if firstAvail is None:
+                    firstAvail = j  # mark this as first avail
+            elif item._hash == h and (item._key is k or item._key == k):
+                return (True, j)  # found a match
+            j = (j + step) % cap
+            step += inc
+        return (False, firstAvail)  # None if the sequence met no available slot
+
+    def _probe_sequence(self, j, h):
+        step, inc = self._probe_steps(h)
+        while True:
+            yield j
+            j = (j + step) % len(self._table)
+            step += inc
+
+    def _capacity(self, c):
+        # the requested size is derived from the old table; also make sure that the
+        # new table is at least twice as large as the number of items it will hold
+        c = max(c, 2 * self._n + 1, self._MIN_CAPACITY)
+        return super()._capacity(c) if self._pow2 else _next_prime(c)
+
+    def _bucket_drain(self, j):
+        item = self._table[j]
+        if item is None or item is ProbeHashMap._AVAIL:
+            return []
+        self._table[j] = ProbeHashMap._AVAIL  # other probe sequences may pass through j
+        return [item]
+
+    def _old_index(self, h):
+        return self._old._compress(h)  # drained slots stay marked, so search from home
+
+
+class QuadraticProbeHashMap(_ScatteredProbeHashMap):
+    """Hash map implemented with quadratic probing for collision resolution."""
+
+    def _probe_steps(self, h):
+        if self._pow2:
+            return (1, 1)  # offsets 1, 3, 6, 10, ... reach every slot of a power-of-two table
+        return (1, 2)  # offsets 1, 4, 9, 16, ... from the home index
+
+
+class DoubleHashProbeHashMap(_ScatteredProbeHashMap):
+    """Hash map implemented with double hashing for collision resolution."""
+
+    def _probe_steps(self, h):
+        if self._pow2:
+            return (h * self._scale % self._prime % len(self._table) | 1, 0)  # any odd step
+        # secondary hash in [1, N-1]; reducing modulo N-1 keeps it independent of the home index
+        return (1 + h * self._scale % self._prime % (len(self._table) - 1), 0)
+
+
+class RobinHoodHashMap(ProbeHashMap):
+    """Hash map implemented with Robin Hood linear probing and backward-shift deletion.
+
+    An insertion takes the slot of any item that is closer to its home index than
+    the new item is, so probe lengths stay short and even. A search stops as soon
+    as it meets such an item, and deletion shifts the rest of the cluster back
+    instead of leaving an _AVAIL marker.
+    """
+
+    # ------------------------------- nested _Item class -------------------------------
+    class _Item(ProbeHashMap._Item):
+        """Item that also records its home index in the table."""
+        __slots__ = '_home'
+
+        def __init__(self, k, v, h, home):
+            super().__init__(k, v, h)
+            self._home = home
+
+    # ------------------------------- nonpublic behaviors -------------------------------
+    def _find_slot(self, j, k, h):
+        """Search for key k, having hash code h, starting at index j.
+
+        Return (success, index) tuple, described as follows:
+        If match was found, success is True and index denotes its location.
+        If no match found, success is False and index denotes where k belongs.
+        """
+        table = self._table
+        cap = len(table)
+        dist = 0  # distance travelled from j
+        while True:
+            item = table[j]
+            if item is None or (j - item._home) % cap < dist:
+                return (False, j)  # k would have displaced this item
+            if item._hash == h and (item._key is k or item._key == k):
+                return (True, j)  # found a match
+            j = (j + 1) % cap
+            dist += 1
+
+    def _bucket_setitem(self, j, k, v, h):
+        found, s = self._find_slot(j, k, h)
+        if found:
+            self._table[s]._value = v  # overwrite existing
+            return
+        table = self._table
+        cap = len(table)
+        item = self._Item(k, v, h, j)
+        while item is not None:  # carry the displaced item forward
+            resident = table[s]
+            if resident is None or (s - resident._home) % cap < (s - item._home) % cap:
+                table[s], item = item, resident
+            s = (s + 1) % cap
+        self._n += 1  # size has increased
+
+    def _bucket_delitem(self, j, k, h):
+        found, s = self._find_slot(j, k, h)
+        if not found:
+            raise KeyError('Key Error: ' + repr(k))  # no match found
+        table = self._table
+        cap = len(table)
+        nxt = (s + 1) % cap
+        while table[nxt] is not None and table[nxt]._home != nxt:  # shift cluster back
+            table[s] = table[nxt]
+            s = nxt
+            nxt = (nxt + 1) % cap
+        table[s] = None
+
+
+if __name__ == '__main__':
+    for map_type in (ProbeHashMap, QuadraticProbeHashMap, DoubleHashProbeHashMap, RobinHoodHashMap):
+        my_map = map_type()
+        for k in range(1000):
+            my_map[k] = k
+        print(map_type.__name__, my_map.probe_stats())
@@ -0,0 +1,167 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.map_base import MapBase
+from collections.abc import Mapping
+from threading import Lock
+
+
+class ShardedHashMap(MapBase):
+    """A thread-safe map that partitions its keys over independent hash maps.
+
+    The low bits of hash(k) select one of the shards, and every shard has its own
+    lock, so threads working on different shards do not wait for each other and a
+    resize of one shard blocks only that shard.
+
+    Subclasses can override class variable _MapType to change the shard type.
+    Extra constructor arguments (e.g. incremental=True) are passed to every shard.
+    """
+    _MapType = ChainHashMap  # shard type; can be redefined by subclass
+
+    def __init__(self, shards=16, *args, **kwargs):
+        """Create an empty map with the given number of shards (rounded up to a power of two)."""
+        shards = 1 << (shards - 1).bit_length()
+        self._mask = shards - 1  # selects the low bits of a hash code
+        self._shards = [self._MapType(*args, **kwargs) for j in range(shards)]
+        self._locks = [Lock() for j in range(shards)]
+
+    def _index(self, k):
+        """Return index of the shard responsible for key k."""
+        return hash(k) & self._mask
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
+
+    def __getitem__(self, k):
+        j = self._index(k)
+        with self._locks[j]:
+            return self._shards[j][k]  # may raise KeyError
+
+    def __setitem__(self, k, v):
+        j = self._index(k)
+        with self._locks[j]:
+            self._shards[j][k] = v
+
+    def __delitem__(self, k):
+        j = self._index(k)
+        with self._locks[j]:
+            del self._shards[j][k]  # may raise KeyError
+
+    def __iter__(self):
+        """Generate keys of the map, one shard at a time.
+
+        Each shard's keys are copied while holding its lock, so other threads may
+        keep updating the map during the iteration.
+        """
+        for j in range(len(self._shards)):
+            with self._locks[j]:
+                keys = list(self._shards[j])
+            yield from keys
+
+    # ----------------------------- atomic operations -----------------------------
+    # 以下操作在持有分片锁的情况下完成"读-改-写"，因此是原子的。
+    # 回调函数 fn 在持有锁时被调用，因此 fn 中不能再访问本 map。
+    def get(self, k, default=None):
+        """Return value for key k, or default if k is not present."""
+        j = self._index(k)
+        with self._locks[j]:
+            shard = self._shards[j]
+            return shard[k] if k in shard else default
+
+    def setdefault(self, k, default=None):
+        """Return value for key k, first storing default if k is not present."""
+        j = self._index(k)
+        with self._locks[j]:
+            shard = self._shards[j]
+            if k in shard:
+                return shard[k]
+            shard[k] = default
+            return default
+
+    def pop(self, k, *default):
+        """Remove key k and return its value (or default, if given and k is not present)."""
+        j = self._index(k)
+        with self._locks[j]:
+            shard = self._shards[j]
+            if k in shard:
+                v = shard[k]
+                del shard[k]
+                return v
+        if default:
+            return default[0]
+        raise KeyError('Key Error: ' + repr(k))
+
+    def compute(self, k, fn, default=None):
+        """Replace the value v of key k (default if k is not present) by fn(v) and return it."""
+        j = self._index(k)
+        with self._locks[j]:
+            shard = self._shards[j]
+            v = fn(shard[k] if k in shard else default)
+            shard[k] = v
+            return v
+
+    def compute_if_absent(self, k, factory):
+        """Return value for key k, first storing factory() if k is not present."""
+        j = self._index(k)
+        with self._locks[j]:
+            shard = self._shards[j]
+            if k in shard:
+                return shard[k]
+            v = shard[k] = factory()
+            return v
+
+    # ------------------------------ bulk operations ------------------------------
+    def _partition(self, keyed, key):
+        """Return list with the elements of iterable keyed grouped by shard, key(e) giving each key."""
+        groups = [[] for j in range(len(self._shards))]
+        for e in keyed:
+            groups[hash(key(e)) & self._mask].append(e)
+        return groups
+
+    def update_many(self, pairs):
+        """Assign every (k,v) pair of an iterable, taking each shard's lock once."""
+        if isinstance(pairs, Mapping):
+            pairs = pairs.items()
+        for j, group in enumerate(self._partition(pairs, lambda pair: pair[0])):
+            if group:
+                with self._locks[j]:
+                    self._shards[j].update_many(group)
+
+    def delete_many(self, keys):
+        """Remove every key of an iterable (raise KeyError if one is not found)."""
+        for j, group in enumerate(self._partition(keys, lambda k: k)):
+            if group:
+                with self._locks[j]:
+                    self._shards[j].delete_many(group)
+
+
+if __name__ == '__main__':
+    from threading import Thread
+
+    counts = ShardedHashMap()
+    workers = [Thread(target=lambda: [counts.compute(w % 10, lambda c: c + 1, 0) for w in range(10000)])
+               for t in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    print(sorted(counts.items()))  # every count is 8000
@@ -19,13 +19,59 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from bisect import bisect_left
 from ch10.map_base import MapBase
+from collections.abc import Mapping, Sequence
+from operator import itemgetter
 
 
 # 10.3.1 排序检索表(p-282)
 class SortedTableMap(MapBase):
     """Map implementation using a sorted table."""
 
+    # ----------------------------- nested RangeView class -----------------------------
+    class RangeView(Sequence):
+        """A read-only window onto consecutive (key,value) pairs of the table.
+
+        The view stores a range of table indices rather than copies of the items,
+        so len(), indexing and slicing cost O(1) no matter how many items it spans.
+        A view reflects the table as it was when the view was created; it should
+        not be used after the map has gained or lost keys.
+        """
+        __slots__ = '_map', '_indices'
+
+        def __init__(self, map, indices):
+            """Create a view of the items of map at the given range of indices."""
+            self._map = map
+            self._indices = indices
+
+        def __len__(self):
+            """Return number of items in the view."""
+            return len(self._indices)
+
+        def __getitem__(self, i):
+            """Return (key,value) pair at index i, or a new view if i is a slice."""
+            # 时间复杂度: O(1)
+            if isinstance(i, slice):
+                return type(self)(self._map, self._indices[i])
+            item = self._map._table[self._indices[i]]
+            return (item._key, item._value)
+
+        def __iter__(self):
+            """Generate (key,value) pairs of the view in order."""
+            table = self._map._table
+            for j in self._indices:
+                yield (table[j]._key, table[j]._value)
+
+        def __reversed__(self):
+            """Generate (key,value) pairs of the view in reverse order."""
+            table = self._map._table
+            for j in reversed(self._indices):
+                yield (table[j]._key, table[j]._value)
+
+        def __repr__(self):
+            return '{0}({1})'.format(type(self).__name__, list(self))
+
     # ----------------------------- nonpublic behaviors -----------------------------
     def _find_index(self, k, low, high):
         """Return index of the leftmost item with key greater than or equal to k.
@@ -36,23 +82,25 @@ class SortedTableMap(MapBase):
            all items of slice table[low:j] have key < k
            all items of slice table[j:high+1] have key >= k
         """
-        # 此处用的算法是"二分查找"，并通过递归来实现。
+        # 此处用的算法是"二分查找"，用 bisect 模块在连续的键列表 _keys 上迭代实现,
+        # 避免了递归调用以及逐层访问 _Item._key 属性的开销。
         # 时间复杂度: O(log n)
-        if high < low:
-            return high + 1  # no element qualifies
+        return bisect_left(self._keys, k, low, high + 1)
+
+    def _range_indices(self, start, stop):
+        """Return the range of table indices whose keys satisfy start <= key < stop."""
+        j = 0 if start is None else self._find_index(start, 0, len(self._table) - 1)
+        if stop is None:
+            end = len(self._table)
         else:
-            mid = (low + high) // 2
-            if k == self._table[mid]._key:
-                return mid  # found exact match
-            elif k < self._table[mid]._key:
-                return self._find_index(k, low, mid - 1)  # Note: may return mid
-            else:
-                return self._find_index(k, mid + 1, high)  # answer is right of mid
+            end = self._find_index(stop, j, len(self._table) - 1)  # first key >= stop
+        return range(j, end)
 
     # ----------------------------- public behaviors -----------------------------
     def __init__(self):
         """Create an empty map."""
         self._table = []
+        self._keys = []  # keys of the items of _table, kept as a flat list for searching
 
     def __len__(self):
         """Return number of items in the map.
@@ -77,6 +125,7 @@ class SortedTableMap(MapBase):
             self._table[j]._value = v  # reassign value
         else:
             self._table.insert(j, self._Item(k, v))  # adds new item
+            self._keys.insert(j, k)
 
     def __delitem__(self, k):
         """Remove item associated with key k (raise KeyError if not found)."""
@@ -86,6 +135,7 @@ class SortedTableMap(MapBase):
         if j == len(self._table) or self._table[j]._key != k:
             raise KeyError('Key Error: ' + repr(k))
         self._table.pop(j)  # delete item
+        self._keys.pop(j)
 
     def __iter__(self):
         """Generate keys of the map ordered from minimum to maximum."""
@@ -178,13 +228,94 @@ class SortedTableMap(MapBase):
         If stop is None, iteration continues through the maximum key of map.
         """
         # 时间复杂度: O(s + log n), s是区间范围内元素的个数。
-        if start is None:
-            j = 0
-        else:
-            j = self._find_index(start, 0, len(self._table) - 1)  # find first result
-        while j < len(self._table) and (stop is None or self._table[j]._key < stop):
+        for j in self._range_indices(start, stop):
             yield (self._table[j]._key, self._table[j]._value)
-            j += 1
+
+    # ----------------------------- order statistics -----------------------------
+    def rank(self, k):
+        """Return the number of keys strictly less than k."""
+        # 时间复杂度: O(log n)
+        return self._find_index(k, 0, len(self._table) - 1)
+
+    def select(self, i):
+        """Return the key of rank i, i.e. the (i+1)-th smallest key (raise IndexError if out of range).
+
+        Negative i counts from the maximum key, as for list indexing.
+        """
+        # 时间复杂度: O(1)
+        return self._keys[i]
+
+    def count_range(self, start, stop):
+        """Return the number of keys such that start <= key < stop.
+
+        A bound of None leaves that side of the range open.
+        """
+        # 时间复杂度: O(log n), 与区间内元素的个数无关。
+        return len(self._range_indices(start, stop))
+
+    def range_view(self, start=None, stop=None):
+        """Return a RangeView of the (key,value) pairs such that start <= key < stop.
+
+        Unlike find_range, no pair is built until it is requested from the view.
+        """
+        # 时间复杂度: O(log n)
+        return self.RangeView(self, self._range_indices(start, stop))
+
+    # ----------------------------- bulk operations -----------------------------
+    def update_many(self, pairs):
+        """Assign every (k,v) pair of an iterable (or the items of a mapping).
+
+        The batch is sorted once and merged into the table, instead of paying a
+        list.insert for each new key.
+        """
+        # 时间复杂度: O(n + m log m), m是批量数据的个数 (逐个插入为 O(m·n))
+        if isinstance(pairs, Mapping):
+            pairs = pairs.items()
+        batch = sorted(pairs, key=itemgetter(0))  # stable: last value of a repeated key sorts last
+        table = self._table
+        merged = []
+        i = 0  # table[:i] has been merged
+        for b in range(len(batch)):
+            k, v = batch[b]
+            if b + 1 < len(batch) and batch[b + 1][0] == k:
+                continue  # a later value for k follows
+            j = self._find_index(k, i, len(table) - 1)
+            merged.extend(table[i:j])  # smaller keys are copied as one slice
+            if j < len(table) and table[j]._key == k:
+                table[j]._value = v  # reassign value
+                merged.append(table[j])
+                j += 1
+            else:
+                merged.append(self._Item(k, v))  # adds new item
+            i = j
+        merged.extend(table[i:])
+        self._table = merged
+        self._keys = [item._key for item in merged]
+
+    def delete_many(self, keys):
+        """Remove every key of an iterable (raise KeyError if one is not found).
+
+        All keys are located before the table is changed, so nothing is removed
+        when a KeyError is raised.
+        """
+        # 时间复杂度: O(n + m log m)
+        table = self._table
+        positions = []
+        i = 0
+        for k in sorted(keys):
+            j = self._find_index(k, i, len(table) - 1)
+            if j == len(table) or table[j]._key != k:  # also rejects a repeated key
+                raise KeyError('Key Error: ' + repr(k))
+            positions.append(j)
+            i = j + 1
+        kept = []
+        i = 0
+        for j in positions:
+            kept.extend(table[i:j])
+            i = j + 1
+        kept.extend(table[i:])
+        self._table = kept
+        self._keys = [item._key for item in kept]
 
 
 if __name__ == '__main__':
@@ -225,3 +356,9 @@ if __name__ == '__main__':
             print(k)
         i += 1
     print("- " * 30)
+
+    print(f"rank(13) = {my_map.rank(13)}, select(5) = {my_map.select(5)}, count_range(5, 20) = {my_map.count_range(5, 20)}")
+    view = my_map.range_view(5, 20)
+    print(f"view = {view}")
+    print(f"view[1:-1:2] = {view[1:-1:2]}, view[-1] = {view[-1]}")
+    print(f"reversed(view) = {list(reversed(view))}")
@@ -0,0 +1,80 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from random import Random
+
+import pytest
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.compact_hash_map import CompactHashMap
+from ch10.probe_hash_map import ProbeHashMap
+from ch10.sorted_table_map import SortedTableMap
+from ch10.unsorted_table_map import UnsortedTableMap
+
+MAP_TYPES = (ChainHashMap, ProbeHashMap, CompactHashMap, SortedTableMap, UnsortedTableMap)
+
+
+def test_bulk_operations_agree_with_dict():
+    rng = Random(5)
+    for map_type in MAP_TYPES:
+        m = map_type()
+        ref = {}
+        for _ in range(20):
+            batch = [(rng.randrange(300), rng.random()) for _ in range(rng.randrange(100))]
+            m.update_many(batch)
+            ref.update(batch)  # the last value of a repeated key wins, as in dict.update
+            assert len(m) == len(ref)
+            keys = [rng.randrange(300) for _ in range(50)]
+            assert m.get_many(keys, -1) == [ref.get(k, -1) for k in keys]
+            doomed = rng.sample(sorted(ref), len(ref) // 3)
+            m.delete_many(doomed)
+            for k in doomed:
+                del ref[k]
+            assert dict(m.items()) == ref
+
+
+def test_from_items_accepts_a_mapping():
+    for map_type in MAP_TYPES:
+        m = map_type.from_items({3: 'c', 1: 'a', 2: 'b'})
+        assert type(m) is map_type
+        assert dict(m.items()) == {1: 'a', 2: 'b', 3: 'c'}
+
+
+def test_from_items_passes_constructor_arguments():
+    m = ChainHashMap.from_items(((k, k) for k in range(100)), 3)
+    assert sorted(m) == list(range(100))
+
+
+def test_sorted_delete_many_is_all_or_nothing():
+    m = SortedTableMap.from_items((k, k) for k in range(10))
+    with pytest.raises(KeyError):
+        m.delete_many([2, 4, 99])
+    assert list(m) == list(range(10))
+    with pytest.raises(KeyError):
+        m.delete_many([2, 2])  # a repeated key is missing the second time
+    assert list(m) == list(range(10))
+
+
+def test_sorted_update_many_keeps_order():
+    m = SortedTableMap.from_items((k, k) for k in range(0, 100, 2))
+    m.update_many([(k, -k) for k in range(99, 0, -3)])
+    assert list(m) == sorted(set(range(0, 100, 2)) | set(range(99, 0, -3)))
+    assert m[3] == -3 and m[6] == -6 and m[4] == 4
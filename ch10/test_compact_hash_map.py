@@ -0,0 +1,50 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch10.compact_hash_map import CompactHashMap
+from ch10.map_testing import fuzz
+
+
+def test_agrees_with_dict():
+    fuzz(CompactHashMap(cap=3), 5000, 3)
+    fuzz(CompactHashMap(cap=3, pow2=True), 5000, 4)
+
+
+def test_iteration_follows_insertion_order():
+    m = CompactHashMap()
+    for k in range(100):
+        m[k * 7 % 101] = k
+    for k in range(0, 100, 3):
+        del m[k * 7 % 101]
+    m[0] = 'again'  # a deleted key is reinserted at the end
+    m[7] = 'updated'  # an existing key keeps its place
+    expected = [k * 7 % 101 for k in range(100) if k % 3] + [0]
+    assert list(m) == expected
+
+
+def test_deleted_entries_are_compacted():
+    m = CompactHashMap()
+    for k in range(1000):
+        m[k] = k
+        if k >= 10:
+            del m[k - 10]
+    assert len(m) == 10
+    assert len(m._keys) < 100  # dead entries do not accumulate
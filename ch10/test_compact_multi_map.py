@@ -0,0 +1,80 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import Counter
+from random import Random
+
+import pytest
+
+from ch10.compact_multi_map import CompactMultiMap
+from ch10.sorted_table_map import SortedTableMap
+
+
+class _SortedTableCompactMultiMap(CompactMultiMap):
+    _MapType = SortedTableMap
+
+
+def test_agrees_with_counter_of_pairs():
+    rng = Random(10)
+    for map_type in (CompactMultiMap, _SortedTableCompactMultiMap):
+        mm = map_type()
+        ref = Counter()
+        for _ in range(5000):
+            k, v = rng.randrange(30), rng.randrange(4)
+            op = rng.random()
+            if op < 0.5:
+                mm.add(k, v)
+                ref[k, v] += 1
+            elif op < 0.8:
+                if ref[k, v]:
+                    mm.remove(k, v)
+                    ref[k, v] -= 1
+                else:
+                    with pytest.raises(KeyError):
+                        mm.remove(k, v)
+            elif sum(c for (j, _), c in ref.items() if j == k):
+                _, w = mm.pop(k)
+                assert ref[k, w] > 0
+                ref[k, w] -= 1
+            else:
+                with pytest.raises(KeyError):
+                    mm.pop(k)
+            assert len(mm) == sum(ref.values())
+            assert mm.count(k) == sum(c for (j, _), c in ref.items() if j == k)
+            assert Counter(mm.find_all(k)) == Counter({p: c for p, c in ref.items() if p[0] == k and c})
+        assert Counter(mm) == +ref
+
+
+def test_single_value_is_stored_inline():
+    mm = CompactMultiMap()
+    mm.add('a', 1)
+    assert mm._map['a'] == 1
+    mm.add('a', 2)
+    mm.add('a', 2)
+    assert isinstance(mm._map['a'], CompactMultiMap._Bag)
+    assert mm.find('a') == ('a', 1)
+    mm.remove('a', 2)
+    mm.remove('a', 1)
+    assert mm._map['a'] == 2  # back to a singleton
+    assert mm.pop('a') == ('a', 2)
+    assert 'a' not in mm._map and mm.count('a') == 0
+    with pytest.raises(KeyError):
+        mm.find('a')
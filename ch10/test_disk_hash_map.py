@@ -0,0 +1,121 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from random import Random
+
+import pytest
+
+from ch10.disk_hash_map import DiskHashMap
+from ch10.map_testing import fuzz
+
+
+class _EagerDiskHashMap(DiskHashMap):
+    COMPACT_MIN = 0  # compact as soon as dead entries outweigh live ones
+
+
+def test_agrees_with_dict(tmp_path):
+    with DiskHashMap(str(tmp_path / 'm.idx'), buckets=2) as m:
+        fuzz(m, 4000, 11)
+    with _EagerDiskHashMap(str(tmp_path / 'e.idx'), buckets=2) as m:
+        fuzz(m, 4000, 12)
+
+
+def test_reopen_keeps_contents(tmp_path):
+    path = str(tmp_path / 'm.idx')
+    rng = Random(13)
+    ref = {}
+    for session in range(5):
+        with DiskHashMap(path, buckets=2) as m:
+            assert dict(m.items()) == ref
+            for _ in range(300):
+                k = 'key%d' % rng.randrange(200)
+                if rng.random() < 0.7:
+                    ref[k] = [rng.random()]
+                    m[k] = ref[k]
+                elif k in ref:
+                    del m[k]
+                    del ref[k]
+    with DiskHashMap(path) as m:
+        assert len(m) == len(ref)
+        assert dict(m.items()) == ref
+
+
+def test_crash_rebuilds_index_from_log(tmp_path):
+    path = str(tmp_path / 'm.idx')
+    m = DiskHashMap(path, buckets=2)
+    m.update_many((k, str(k)) for k in range(500))
+    m.flush()
+    for k in range(0, 500, 2):
+        del m[k]
+    m[1] = 'one'
+    m._log.flush()  # the process dies here: the index is left dirty and never closed
+    with DiskHashMap(path) as m2:
+        assert dict(m2.items()) == {k: ('one' if k == 1 else str(k)) for k in range(1, 500, 2)}
+
+
+def test_torn_log_entry_is_discarded(tmp_path):
+    path = str(tmp_path / 'm.idx')
+    with DiskHashMap(path) as m:
+        m.update_many((k, k) for k in range(100))
+    size = os.path.getsize(path + '.log')
+    with open(path + '.log', 'ab') as log:
+        log.write(b'\x01\x02\x03 partial entry')  # a write cut short by a crash
+    with DiskHashMap(path) as m:
+        assert dict(m.items()) == {k: k for k in range(100)}
+    assert os.path.getsize(path + '.log') == size
+
+
+def test_log_is_compacted(tmp_path):
+    path = str(tmp_path / 'm.idx')
+    with _EagerDiskHashMap(path) as m:
+        for step in range(50):
+            m.update_many(('key%d' % k, step) for k in range(100))
+            assert m._log_size - m._live <= max(m._live, m.COMPACT_MIN)
+        del m['key0']
+        assert m._live < m._log_size < 3 * m._live
+    with DiskHashMap(path) as m:
+        assert len(m) == 99 and m['key5'] == 49
+        m.compact()
+        assert m._log_size == m._live
+        assert dict(m.items()) == {'key%d' % k: 49 for k in range(1, 100)}
+
+
+def test_crash_after_compaction_rebuilds_from_new_log(tmp_path):
+    path = str(tmp_path / 'm.idx')
+    m = DiskHashMap(path)
+    for step in range(3):
+        m.update_many((k, step) for k in range(100))
+    m.compact()  # the index is dirty until the next flush
+    m._log.flush()
+    with DiskHashMap(path) as m2:
+        assert dict(m2.items()) == {k: 2 for k in range(100)}
+        assert m2._log_size == m2._live
+
+
+def test_missing_key(tmp_path):
+    with DiskHashMap(str(tmp_path / 'm.idx')) as m:
+        m['a'] = 1
+        with pytest.raises(KeyError):
+            m['b']
+        with pytest.raises(KeyError):
+            del m['b']
+        assert m.get('b') is None and 'a' in m and len(m) == 1
@@ -0,0 +1,68 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.map_testing import fuzz
+from ch10.probe_hash_map import ProbeHashMap
+from ch10.probe_strategies import DoubleHashProbeHashMap, QuadraticProbeHashMap, RobinHoodHashMap
+
+MAP_TYPES = (ChainHashMap, ProbeHashMap, QuadraticProbeHashMap, DoubleHashProbeHashMap, RobinHoodHashMap)
+
+
+class _CountingKey:
+    """A key that counts how many times it has been hashed."""
+    calls = 0
+
+    def __init__(self, k):
+        self._k = k
+
+    def __hash__(self):
+        _CountingKey.calls += 1
+        return hash(self._k)
+
+    def __eq__(self, other):
+        return self._k == other._k
+
+
+def test_each_operation_hashes_its_key_once():
+    for map_type in MAP_TYPES:
+        for incremental in (False, True):
+            m = map_type(cap=3, incremental=incremental)
+            keys = [_CountingKey(k) for k in range(500)]
+            _CountingKey.calls = 0
+            for k in keys:
+                m[k] = k._k  # several resizes happen along the way
+            assert _CountingKey.calls == len(keys)
+            for k in keys:
+                assert m[k] == k._k
+            for k in keys[::2]:
+                del m[k]
+            assert _CountingKey.calls == 2 * len(keys) + len(keys[::2])
+
+
+def test_power_of_two_tables():
+    for map_type in MAP_TYPES:
+        m = map_type(cap=5, pow2=True)
+        assert len(m._table) == 8
+        for k in range(1000):
+            m[k] = k
+            assert len(m._table) & (len(m._table) - 1) == 0
+        fuzz(map_type(cap=3, pow2=True), 3000, 3)
@@ -0,0 +1,65 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch10.chain_hash_map import ChainHashMap
+from ch10.map_testing import fuzz
+from ch10.probe_hash_map import ProbeHashMap
+
+MAP_TYPES = (ChainHashMap, ProbeHashMap)
+
+
+def test_incremental_rehash_agrees_with_dict():
+    for map_type in MAP_TYPES:
+        fuzz(map_type(cap=3, incremental=True), 5000, 1)
+
+
+def test_stop_the_world_rehash_agrees_with_dict():
+    for map_type in MAP_TYPES:
+        fuzz(map_type(cap=3), 5000, 2)
+
+
+def test_incremental_rehash_keeps_old_table_between_updates():
+    for map_type in MAP_TYPES:
+        m = map_type(cap=5, incremental=True)
+        migrating = False
+        for k in range(2000):
+            m[k] = -k
+            migrating = migrating or m._old is not None
+            if m._old is not None:
+                assert sorted(m) == list(range(k + 1))  # iteration sees keys of both tables once
+        assert migrating
+        assert all(m[k] == -k for k in range(2000))
+
+
+def test_missing_key_with_full_old_table():
+    for map_type in MAP_TYPES:
+        m = map_type(cap=2, incremental=True)
+        for k in range(3):  # the table is full when the rehash begins
+            m[k] = k
+        assert m._old is not None
+        assert 99 not in m and m.get(99) is None
+        try:
+            del m[99]
+        except KeyError:
+            pass
+        else:
+            raise AssertionError('deleted a missing key')
+        assert all(m[k] == k for k in range(3))
@@ -0,0 +1,41 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from ch10.map_testing import fuzz
+from ch10.probe_strategies import DoubleHashProbeHashMap, QuadraticProbeHashMap, RobinHoodHashMap
+
+MAP_TYPES = (QuadraticProbeHashMap, DoubleHashProbeHashMap, RobinHoodHashMap)
+
+
+def test_strategies_agree_with_dict():
+    for map_type in MAP_TYPES:
+        for pow2 in (False, True):
+            for incremental in (False, True):
+                fuzz(map_type(cap=3, incremental=incremental, pow2=pow2), 3000, 2)
+
+
+def test_tiny_initial_capacity_keeps_table_half_empty():
+    for _ in range(20):  # MAD parameters are random, so try several tables
+        m = QuadraticProbeHashMap(cap=2)
+        for k in range(1000):
+            m[k] = k
+            assert len(m) <= len(m._table) // 2
+        assert sorted(m) == list(range(1000))
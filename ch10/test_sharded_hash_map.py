@@ -0,0 +1,90 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from threading import Thread
+
+import pytest
+
+from ch10.map_testing import fuzz
+from ch10.probe_hash_map import ProbeHashMap
+from ch10.sharded_hash_map import ShardedHashMap
+
+
+class _ProbeShardedHashMap(ShardedHashMap):
+    _MapType = ProbeHashMap
+
+
+def test_agrees_with_dict():
+    fuzz(ShardedHashMap(shards=5), 5000, 6)
+    fuzz(_ProbeShardedHashMap(4, 3, incremental=True), 5000, 7)
+
+
+def test_shard_count_is_rounded_up():
+    m = ShardedHashMap(shards=5)
+    assert len(m._shards) == 8
+    assert all(type(shard) is ShardedHashMap._MapType for shard in m._shards)
+    assert type(_ProbeShardedHashMap()._shards[0]) is ProbeHashMap
+
+
+def test_atomic_operations():
+    m = ShardedHashMap()
+    assert m.setdefault('a', 1) == 1
+    assert m.setdefault('a', 2) == 1
+    assert m.compute('a', lambda v: v + 10) == 11
+    assert m.compute('b', lambda v: v * 2, 4) == 8
+    assert m.compute_if_absent('b', list) == 8
+    assert m.compute_if_absent('c', list) == []
+    assert m.pop('a') == 11
+    assert m.pop('a', None) is None
+    with pytest.raises(KeyError):
+        m.pop('a')
+    assert m.get('a') is None
+    assert sorted(m.items()) == [('b', 8), ('c', [])]
+
+
+def test_concurrent_compute_loses_no_updates():
+    m = ShardedHashMap(shards=4)
+
+    def work():
+        for w in range(2000):
+            m.compute(w % 50, lambda c: c + 1, 0)
+
+    workers = [Thread(target=work) for t in range(8)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert dict(m.items()) == {k: 8 * 40 for k in range(50)}
+
+
+def test_concurrent_writers_on_disjoint_keys():
+    m = ShardedHashMap()
+
+    def work(t):
+        m.update_many((t * 1000 + k, t) for k in range(1000))
+        m.delete_many(t * 1000 + k for k in range(0, 1000, 2))
+
+    workers = [Thread(target=work, args=(t,)) for t in range(6)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert sorted(m) == [t * 1000 + k for t in range(6) for k in range(1, 1000, 2)]
@@ -0,0 +1,126 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from random import Random
+
+import pytest
+
+from ch10.blocked_sorted_table_map import BlockedSortedTableMap
+from ch10.sorted_table_map import SortedTableMap
+
+
+class _SmallBlockedSortedTableMap(BlockedSortedTableMap):
+    _LOAD = 4  # many tiny blocks, so splits and joins happen often
+
+
+MAP_TYPES = (SortedTableMap, BlockedSortedTableMap, _SmallBlockedSortedTableMap)
+
+
+def _check_queries(m, ref, rng):
+    """Compare the sorted-map queries of m with answers computed from dict ref."""
+    keys = sorted(ref)
+    assert list(m) == keys
+    assert list(reversed(m)) == keys[::-1]
+    pair = lambda i: (keys[i], ref[keys[i]]) if 0 <= i < len(keys) else None
+    assert m.find_min() == pair(0)
+    assert m.find_max() == pair(len(keys) - 1)
+    for _ in range(20):
+        k = rng.randrange(-5, 505)
+        assert m.find_le(k) == pair(bisect_right(keys, k) - 1)
+        assert m.find_lt(k) == pair(bisect_left(keys, k) - 1)
+        assert m.find_ge(k) == pair(bisect_left(keys, k))
+        assert m.find_gt(k) == pair(bisect_right(keys, k))
+        stop = k + rng.randrange(50)
+        assert list(m.find_range(k, stop)) == [(j, ref[j]) for j in keys if k <= j < stop]
+    assert list(m.find_range(None, None)) == [(j, ref[j]) for j in keys]
+
+
+def test_agrees_with_sorted_dict():
+    rng = Random(8)
+    for map_type in MAP_TYPES:
+        m = map_type()
+        ref = {}
+        for step in range(3000):
+            k = rng.randrange(500)
+            if rng.random() < 0.55:
+                m[k] = step
+                ref[k] = step
+            elif k in ref:
+                del m[k]
+                del ref[k]
+            assert len(m) == len(ref)
+            if step % 100 == 0:
+                _check_queries(m, ref, rng)
+        _check_queries(m, ref, rng)
+        for k in list(ref):
+            del m[k]
+        assert len(m) == 0 and m.find_min() is None and m.find_le(10) is None
+
+
+def test_blocks_stay_bounded():
+    m = _SmallBlockedSortedTableMap()
+    for k in range(200):
+        m[k * 37 % 200] = k
+    assert all(0 < len(block) <= 2 * m._LOAD for block in m._keys)
+    assert m._maxes == [block[-1] for block in m._keys]
+    for k in range(0, 200, 3):
+        del m[k]
+    assert all(0 < len(block) <= 2 * m._LOAD for block in m._keys)
+    assert m._maxes == [block[-1] for block in m._keys]
+
+
+def test_order_statistics():
+    rng = Random(9)
+    keys = sorted(rng.sample(range(1000), 300))
+    m = SortedTableMap.from_items((k, -k) for k in keys)
+    for i, k in enumerate(keys):
+        assert m.select(i) == k
+        assert m.rank(k) == i
+        assert m.rank(k + 0.5) == i + 1
+    assert m.select(-1) == keys[-1]
+    with pytest.raises(IndexError):
+        m.select(len(keys))
+    for _ in range(100):
+        start, stop = sorted(rng.randrange(-10, 1010) for _ in range(2))
+        expected = [k for k in keys if start <= k < stop]
+        assert m.count_range(start, stop) == len(expected)
+        assert m.count_range(None, stop) == len([k for k in keys if k < stop])
+        assert m.count_range(start, None) == len([k for k in keys if k >= start])
+    assert m.count_range(500, 100) == 0
+
+
+def test_range_view():
+    m = SortedTableMap.from_items((k, str(k)) for k in range(0, 100, 2))
+    view = m.range_view(10, 30)
+    expected = [(k, str(k)) for k in range(10, 30, 2)]
+    assert len(view) == len(expected)
+    assert list(view) == expected
+    assert list(reversed(view)) == expected[::-1]
+    assert view[0] == (10, '10') and view[-1] == (28, '28')
+    assert list(view[2:5]) == expected[2:5]
+    assert list(view[::-3]) == expected[::-3]
+    assert len(view[1:3]) == 2
+    assert list(m.range_view()) == list(m.items())
+    assert list(m.range_view(99, None)) == []
+    assert list(m.range_view(None, 5)) == [(0, '0'), (2, '2'), (4, '4')]
+    assert list(m.range_view(31, 33)) == [(32, '32')]
+    assert list(m.find_range(10, 30)) == expected
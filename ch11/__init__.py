@@ -1 +1 @@
-__all__ = ['avl_tree', 'binary_search_tree', 'red_black_tree', 'splay_tree']
+__all__ = ['avl_tree', 'b_plus_tree', 'binary_search_tree', 'disk_b_plus_tree', 'red_black_tree', 'splay_tree']
@@ -24,6 +24,7 @@ from ch11.binary_search_tree import TreeMap
 
 class AVLTreeMap(TreeMap):
     """Sorted map implementation using an AVL tree."""
+    _BALANCED = True
 
     # -------------------------- nested _Node class --------------------------
     class _Node(TreeMap._Node):
@@ -43,45 +44,72 @@ class AVLTreeMap(TreeMap):
         def right_height(self):
             return self._right._height if self._right is not None else 0
 
-    # ------------------------- positional-based utility methods -------------------------
-    def _recompute_height(self, p):
-        p._node._height = 1 + max(p._node.left_height(), p._node.right_height())
+    # ---------------------------- node-based utility methods ----------------------------
+    def _recompute_height(self, node):
+        node._height = 1 + max(node.left_height(), node.right_height())
 
-    def _isbalanced(self, p):
-        return abs(p._node.left_height() - p._node.right_height()) <= 1
+    def _isbalanced(self, node):
+        return abs(node.left_height() - node.right_height()) <= 1
 
-    def _tall_child(self, p, favorleft=False):  # parameter controls tiebreaker
+    def _tall_child(self, node, favorleft=False):  # parameter controls tiebreaker
         """获取较高的孩子节点"""
-        if p._node.left_height() + (1 if favorleft else 0) > p._node.right_height():
-            return self.left(p)
+        if node.left_height() + (1 if favorleft else 0) > node.right_height():
+            return node._left
         else:
-            return self.right(p)
+            return node._right
 
-    def _tall_grandchild(self, p):
+    def _tall_grandchild(self, node):
         """获取较高的孙子节点"""
-        child = self._tall_child(p)
+        child = self._tall_child(node)
         # if child is on left, favor left grandchild; else favor right grandchild
-        alignment = (child == self.left(p))
+        alignment = (child is node._left)
         return self._tall_child(child, alignment)
 
-    def _rebalance(self, p):
-        while p is not None:
-            old_height = p._node._height  # trivially 0 if new node
-            if not self._isbalanced(p):  # imbalance detected!
-                # perform trinode restructuring, setting p to resulting root,
+    def _rebalance(self, node):
+        while node is not None:
+            old_height = node._height  # trivially 0 if new node
+            if not self._isbalanced(node):  # imbalance detected!
+                # perform trinode restructuring, setting node to resulting root,
                 # and recompute new local heights after the restructuring
-                p = self._restructure(self._tall_grandchild(p))
-                self._recompute_height(self.left(p))
-                self._recompute_height(self.right(p))
-            self._recompute_height(p)  # adjust for recent changes
-            if p._node._height == old_height:  # has height changed?
-                p = None  # no further changes needed
+                node = self._restructure(self._tall_grandchild(node))
+                self._recompute_height(node._left)
+                self._recompute_height(node._right)
+            self._recompute_height(node)  # adjust for recent changes
+            if node._height == old_height:  # has height changed?
+                node = None  # no further changes needed
             else:
-                p = self.parent(p)  # repeat with parent
+                node = node._parent  # repeat with parent
 
     # ---------------------------- override balancing hooks ----------------------------
-    def _rebalance_insert(self, p):
-        self._rebalance(p)
+    def _rebalance_insert(self, node):
+        self._rebalance(node)
 
-    def _rebalance_delete(self, p):
-        self._rebalance(p)
+    def _rebalance_delete(self, node):
+        self._rebalance(node)
+
+    # ---------------------------- support for bulk operations ----------------------------
+    def _link(self, node, left, right):
+        super()._link(node, left, right)
+        self._recompute_height(node)
+        return node
+
+    def _join(self, left, node, right):
+        """Return root of an AVL subtree holding the nodes of left, then node, then the nodes of right."""
+        # 时间复杂度: O(|h(left) - h(right)| + 1)
+        left_height = left._height if left is not None else 0
+        right_height = right._height if right is not None else 0
+        if abs(left_height - right_height) <= 1:
+            return self._link(node, left, right)  # node can simply be the new root
+        # walk down the inner spine of the taller tree to a subtree about as tall as the shorter one
+        go_right = left_height > right_height
+        target = min(left_height, right_height) + 1
+        parent, walk = None, (left if go_right else right)
+        while walk is not None and walk._height > target:
+            parent, walk = walk, (walk._right if go_right else walk._left)
+        if go_right:
+            self._link(node, walk, right)
+        else:
+            self._link(node, left, walk)
+        self._graft(parent, node, not go_right)  # like an insertion, parent's child grew by one
+        self._rebalance(parent)
+        return self._subtree_root(node)
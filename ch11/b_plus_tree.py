@@ -0,0 +1,422 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from ch10.map_base import MapBase
+
+
+class BPlusTreeMap(MapBase):
+    """Sorted map implementation using a B+-tree.
+
+    Each node keeps up to `order` entries in flat Python lists: an internal node
+    holds separator keys and its children, and a leaf holds keys with their
+    values. All items live in the leaves, which are doubly linked in key order,
+    so iteration and range scans walk the leaves without climbing the tree.
+    """
+
+    # -------------------------- nested node classes --------------------------
+    class _Leaf:
+        """Leaf node holding sorted keys and their values."""
+        __slots__ = '_keys', '_values', '_prev', '_next'
+        _is_leaf = True
+
+        def __init__(self, keys, values):
+            self._keys = keys
+            self._values = values
+            self._prev = None  # neighboring leaves, in key order
+            self._next = None
+
+    class _Internal:
+        """Internal node; the keys of _children[i+1] are at least _keys[i], those of _children[i] are less."""
+        __slots__ = '_keys', '_children'
+        _is_leaf = False
+
+        def __init__(self, keys, children):
+            self._keys = keys
+            self._children = children
+
+    # -------------------------- nested Position class --------------------------
+    class Position:
+        """The location of an item; it remains valid only until a key is added or removed."""
+
+        def __init__(self, container, leaf, index):
+            """Constructor should not be invoked by user."""
+            self._container = container
+            self._leaf = leaf
+            self._index = index
+            self._version = container._version
+
+        def key(self):
+            """Return key of map's key-value pair."""
+            return self._leaf._keys[self._index]
+
+        def value(self):
+            """Return value of map's key-value pair."""
+            return self._leaf._values[self._index]
+
+        def __eq__(self, other):
+            """Return True if other is a Position representing the same location."""
+            return type(other) is type(self) and other._leaf is self._leaf and other._index == self._index
+
+        def __ne__(self, other):
+            """Return True if other does not represent the same location."""
+            return not (self == other)  # opposite of __eq__
+
+    # ----------------------------- nonpublic behaviors -----------------------------
+    def _validate(self, p):
+        """Return (leaf, index) of position p, if it is valid."""
+        if not isinstance(p, self.Position):
+            raise TypeError('p must be proper Position type')
+        if p._container is not self:
+            raise ValueError('p does not belong to this container')
+        if p._version != self._version:  # keys were added or removed since p was made
+            raise ValueError('p is no longer valid')
+        return p._leaf, p._index
+
+    def _make_position(self, leaf, i):
+        """Return Position instance for given location (or None if no leaf)."""
+        return self.Position(self, leaf, i) if leaf is not None else None
+
+    def _find_leaf(self, k, path=None):
+        """Return the leaf where key k belongs, appending each (internal node, child index) to path."""
+        # 时间复杂度: O(log n), 每层在节点内二分查找
+        node = self._root
+        while not node._is_leaf:
+            i = bisect_right(node._keys, k)
+            if path is not None:
+                path.append((node, i))
+            node = node._children[i]
+        return node
+
+    def _first_leaf(self):
+        node = self._root
+        while not node._is_leaf:
+            node = node._children[0]
+        return node
+
+    def _last_leaf(self):
+        node = self._root
+        while not node._is_leaf:
+            node = node._children[-1]
+        return node
+
+    def _locate(self, k, after=False):
+        """Return (leaf, i) of the least key >= k (> k if after is True), or (None, 0) if there is none."""
+        leaf = self._find_leaf(k)
+        i = bisect_right(leaf._keys, k) if after else bisect_left(leaf._keys, k)
+        if i == len(leaf._keys):  # every key of this leaf is too small; the answer starts the next leaf
+            return leaf._next, 0
+        return leaf, i
+
+    def _previous(self, leaf, i):
+        """Return (leaf, i) just before the given location (leaf None is past the end), or (None, 0)."""
+        if leaf is None:
+            leaf = self._last_leaf()
+            i = len(leaf._keys)
+        if i > 0:
+            return leaf, i - 1
+        leaf = leaf._prev
+        return (leaf, len(leaf._keys) - 1) if leaf is not None else (None, 0)
+
+    def _next(self, leaf, i):
+        """Return (leaf, i) just after the given location, or (None, 0)."""
+        if i + 1 < len(leaf._keys):
+            return leaf, i + 1
+        return leaf._next, 0
+
+    def _item(self, leaf, i):
+        """Return (key,value) pair at the given location (or None if leaf is None)."""
+        return (leaf._keys[i], leaf._values[i]) if leaf is not None else None
+
+    def _split(self, node, path):
+        """Split the overfull node, and its ancestors in turn while they overflow."""
+        while True:
+            if node._is_leaf:
+                if len(node._keys) <= self._order:
+                    return
+                mid = len(node._keys) // 2
+                right = self._Leaf(node._keys[mid:], node._values[mid:])
+                del node._keys[mid:]
+                del node._values[mid:]
+                right._prev, right._next = node, node._next  # link right into the list of leaves
+                if node._next is not None:
+                    node._next._prev = right
+                node._next = right
+                separator = right._keys[0]
+            else:
+                if len(node._children) <= self._order:
+                    return
+                mid = len(node._children) // 2
+                separator = node._keys[mid - 1]  # moves up to the parent
+                right = self._Internal(node._keys[mid:], node._children[mid:])
+                del node._keys[mid - 1:]
+                del node._children[mid:]
+            if not path:  # node was the root; the tree grows one level
+                self._root = self._Internal([separator], [node, right])
+                return
+            parent, i = path.pop()
+            parent._keys.insert(i, separator)
+            parent._children.insert(i + 1, right)
+            node = parent
+
+    def _entries(self, node):
+        """Return the number of entries (keys of a leaf, children of an internal node) of node."""
+        return len(node._keys) if node._is_leaf else len(node._children)
+
+    def _rebalance(self, path):
+        """Fix an underfull node by borrowing from a sibling or merging with it, moving up while needed."""
+        while path:
+            parent, i = path.pop()
+            children = parent._children
+            # 先尝试从相邻的兄弟节点借一个条目
+            if i > 0 and self._entries(children[i - 1]) > self._min:
+                self._borrow_left(parent, i)
+                return
+            if i + 1 < len(children) and self._entries(children[i + 1]) > self._min:
+                self._borrow_right(parent, i)
+                return
+            # 兄弟节点也只有最少数目的条目，与之合并
+            self._merge(parent, i - 1 if i > 0 else i)
+            if parent is self._root:
+                if len(children) == 1:  # the tree shrinks one level
+                    self._root = children[0]
+                return
+            if len(children) >= self._min:
+                return
+
+    def _borrow_left(self, parent, i):
+        """Move the last entry of child i-1 of parent to the front of child i."""
+        left, node = parent._children[i - 1], parent._children[i]
+        if node._is_leaf:
+            node._keys.insert(0, left._keys.pop())
+            node._values.insert(0, left._values.pop())
+            parent._keys[i - 1] = node._keys[0]
+        else:
+            node._children.insert(0, left._children.pop())
+            node._keys.insert(0, parent._keys[i - 1])
+            parent._keys[i - 1] = left._keys.pop()
+
+    def _borrow_right(self, parent, i):
+        """Move the first entry of child i+1 of parent to the end of child i."""
+        node, right = parent._children[i], parent._children[i + 1]
+        if node._is_leaf:
+            node._keys.append(right._keys.pop(0))
+            node._values.append(right._values.pop(0))
+            parent._keys[i] = right._keys[0]
+        else:
+            node._children.append(right._children.pop(0))
+            node._keys.append(parent._keys[i])
+            parent._keys[i] = right._keys.pop(0)
+
+    def _merge(self, parent, i):
+        """Merge child i+1 of parent into child i."""
+        node, right = parent._children[i], parent._children[i + 1]
+        if node._is_leaf:
+            node._keys.extend(right._keys)
+            node._values.extend(right._values)
+            node._next = right._next  # unlink right from the list of leaves
+            if right._next is not None:
+                right._next._prev = node
+        else:
+            node._keys.append(parent._keys[i])  # separator moves down between the two halves
+            node._keys.extend(right._keys)
+            node._children.extend(right._children)
+        del parent._keys[i]
+        del parent._children[i + 1]
+
+    # ----------------------------- public behaviors -----------------------------
+    def __init__(self, order=64):
+        """Create an empty map whose nodes hold at most order entries (order must be at least 4)."""
+        if order < 4:
+            raise ValueError('order must be at least 4')
+        self._order = order
+        self._min = order // 2  # a node other than the root never holds fewer entries
+        self._root = self._Leaf([], [])
+        self._size = 0
+        self._version = 0  # counts insertions and removals, to invalidate positions
+
+    def __len__(self):
+        """Return number of items in the map."""
+        return self._size
+
+    def __getitem__(self, k):
+        """Return value associated with key k (raise KeyError if not found)."""
+        # 时间复杂度: O(log n)
+        leaf = self._find_leaf(k)
+        i = bisect_left(leaf._keys, k)
+        if i == len(leaf._keys) or leaf._keys[i] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        return leaf._values[i]
+
+    def __setitem__(self, k, v):
+        """Assign value v to key k, overwriting existing value if present."""
+        # 时间复杂度: O(order · log n / log order)
+        path = []
+        leaf = self._find_leaf(k, path)
+        i = bisect_left(leaf._keys, k)
+        if i < len(leaf._keys) and leaf._keys[i] == k:
+            leaf._values[i] = v  # reassign value
+            return
+        leaf._keys.insert(i, k)
+        leaf._values.insert(i, v)
+        self._size += 1
+        self._version += 1
+        if len(leaf._keys) > self._order:
+            self._split(leaf, path)
+
+    def __delitem__(self, k):
+        """Remove item associated with key k (raise KeyError if not found)."""
+        # 时间复杂度: O(order · log n / log order)
+        path = []
+        leaf = self._find_leaf(k, path)
+        i = bisect_left(leaf._keys, k)
+        if i == len(leaf._keys) or leaf._keys[i] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        del leaf._keys[i]
+        del leaf._values[i]
+        self._size -= 1
+        self._version += 1
+        if len(leaf._keys) < self._min:
+            self._rebalance(path)
+
+    def __iter__(self):
+        """Generate keys of the map ordered from minimum to maximum."""
+        leaf = self._first_leaf()
+        while leaf is not None:
+            yield from leaf._keys
+            leaf = leaf._next
+
+    def __reversed__(self):
+        """Generate keys of the map ordered from maximum to minimum."""
+        leaf = self._last_leaf()
+        while leaf is not None:
+            yield from reversed(leaf._keys)
+            leaf = leaf._prev
+
+    # --------------------- public methods providing "positional" support ---------------------
+    def first(self):
+        """Return the first Position in the map (or None if empty)."""
+        return self._make_position(self._first_leaf(), 0) if self._size > 0 else None
+
+    def last(self):
+        """Return the last Position in the map (or None if empty)."""
+        leaf = self._last_leaf()
+        return self._make_position(leaf, len(leaf._keys) - 1) if self._size > 0 else None
+
+    def before(self, p):
+        """Return the Position just before p in the natural order.
+
+        Return None if p is the first position.
+        """
+        return self._make_position(*self._previous(*self._validate(p)))
+
+    def after(self, p):
+        """Return the Position just after p in the natural order.
+
+        Return None if p is the last position.
+        """
+        return self._make_position(*self._next(*self._validate(p)))
+
+    def find_position(self, k):
+        """Return position with key k, or else neighbor (or None if empty)."""
+        leaf, i = self._locate(k)
+        if leaf is None:  # k is larger than every key
+            return self.last()
+        return self._make_position(leaf, i)
+
+    def delete(self, p):
+        """Remove the item at given Position."""
+        leaf, i = self._validate(p)
+        del self[leaf._keys[i]]
+
+    # --------------------- public methods for sorted map interface ---------------------
+    def find_min(self):
+        """Return (key,value) pair with minimum key (or None if empty)."""
+        return self._item(self._first_leaf(), 0) if self._size > 0 else None
+
+    def find_max(self):
+        """Return (key,value) pair with maximum key (or None if empty)."""
+        return self._item(self._last_leaf(), -1) if self._size > 0 else None
+
+    def find_le(self, k):
+        """Return (key,value) pair with greatest key less than or equal to k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._previous(*self._locate(k, after=True)))
+
+    def find_lt(self, k):
+        """Return (key,value) pair with greatest key strictly less than k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._previous(*self._locate(k)))
+
+    def find_ge(self, k):
+        """Return (key,value) pair with least key greater than or equal to k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._locate(k))
+
+    def find_gt(self, k):
+        """Return (key,value) pair with least key strictly greater than k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._locate(k, after=True))
+
+    def find_range(self, start, stop):
+        """Iterate all (key,value) pairs such that start <= key < stop.
+
+        If start is None, iteration begins with minimum key of map.
+        If stop is None, iteration continues through the maximum key of map.
+        """
+        # 时间复杂度: O(s + log n), s是区间范围内元素的个数。
+        leaf, i = (self._first_leaf(), 0) if start is None else self._locate(start)
+        while leaf is not None:
+            keys = leaf._keys
+            if stop is None or not keys or keys[-1] < stop:
+                end = len(keys)
+            else:
+                end = bisect_left(keys, stop, i)  # range ends within this leaf
+            values = leaf._values
+            for j in range(i, end):
+                yield (keys[j], values[j])
+            if end < len(keys):
+                return
+            leaf, i = leaf._next, 0
+
+
+if __name__ == '__main__':
+    my_map = BPlusTreeMap(order=4)  # tiny nodes, to show the layout
+    for k in [5, 1, 9, 3, 7, 2, 8, 4, 6]:
+        my_map[k] = str(k)
+    leaf = my_map._first_leaf()
+    leaves = []
+    while leaf is not None:
+        leaves.append(leaf._keys)
+        leaf = leaf._next
+    print(f'根节点={my_map._root._keys}, 叶子节点={leaves}')
+    print(list(my_map.find_range(3, 7)))
+    print(my_map.find_le(0), my_map.find_ge(10), my_map.find_gt(4), my_map.find_lt(4))
+    p = my_map.first()
+    print(f'最小key={p.key()}, 下一个key={my_map.after(p).key()}, 最大key={my_map.last().key()}')
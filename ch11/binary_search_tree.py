@@ -19,12 +19,34 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from collections.abc import Mapping
+from operator import itemgetter
+
 from ch08.linked_binary_tree import LinkedBinaryTree
 from ch10.map_base import MapBase
 
 
 class TreeMap(LinkedBinaryTree, MapBase):
     """Sorted map implementation using a binary search tree."""
+    _BALANCED = False  # True if a subclass keeps the height O(log n) and joins subtrees in balance
+
+    # -------------------------- nested _Node class --------------------------
+    class _Node(LinkedBinaryTree._Node):
+        """Node class that also records the number of nodes in its subtree.
+
+        The subtree sizes support the order statistics rank, select and count_range.
+        """
+        __slots__ = '_size'  # additional data member to store subtree size
+
+        def __init__(self, element, parent=None, left=None, right=None):
+            super().__init__(element, parent, left, right)
+            self._size = 1  # a new node is always added as a leaf
+
+        def left_size(self):
+            return self._left._size if self._left is not None else 0
+
+        def right_size(self):
+            return self._right._size if self._right is not None else 0
 
     # ---------------------------- override Position class ----------------------------
     class Position(LinkedBinaryTree.Position):
@@ -37,226 +59,249 @@ class TreeMap(LinkedBinaryTree, MapBase):
             return self.element()._value
 
     # ------------------------------- nonpublic utilities -------------------------------
+    # 以下工具方法直接操作 _Node，不创建 Position 对象，也不调用 _validate；
+    # 公有的 Position 接口只在返回结果时才创建 Position。
+    def _subtree_search_node(self, node, k):
+        """Return node of node's subtree having key k, or last node searched."""
+        # 迭代实现，避免了每层一次的递归调用
+        while True:
+            key = node._element._key
+            if k == key:  # found match
+                return node
+            child = node._left if k < key else node._right
+            if child is None:  # unsuccessful search
+                return node
+            node = child
+
+    def _search_node(self, k):
+        """Return node having key k, or last node searched (or None if empty)."""
+        return self._subtree_search_node(self._root, k) if self._root is not None else None
+
     def _subtree_search(self, p, k):
         """Return Position of p's subtree having key k, or last node searched."""
-        if k == p.key():  # found match
-            return p
-        elif k < p.key():  # search left subtree
-            if self.left(p) is not None:
-                return self._subtree_search(self.left(p), k)
-        else:  # search right subtree
-            if self.right(p) is not None:
-                return self._subtree_search(self.right(p), k)
-        return p  # unsuccessful search
-
-    # 以p为根节点的子树中最小的key（即，最左边的子孙节点）
+        return self._make_position(self._subtree_search_node(p._node, k))
+
+    # 以node为根节点的子树中最小的key（即，最左边的子孙节点）
+    def _subtree_first_node(self, node):
+        """Return first node in subtree rooted at node."""
+        while node._left is not None:  # keep walking left
+            node = node._left
+        return node
+
+    # 以node为根节点的子树中最大的key（即，最右边的子孙节点）
+    def _subtree_last_node(self, node):
+        """Return last node in subtree rooted at node."""
+        while node._right is not None:  # keep walking right
+            node = node._right
+        return node
+
     def _subtree_first_position(self, p):
         """Return Position of first item in subtree rooted at p."""
-        walk = p
-        while self.left(walk) is not None:  # keep walking left
-            walk = self.left(walk)
-        return walk
+        return self._make_position(self._subtree_first_node(p._node))
 
-    # 以p为根节点的子树中最大的key（即，最右边的子孙节点）
     def _subtree_last_position(self, p):
         """Return Position of last item in subtree rooted at p."""
-        walk = p
-        while self.right(walk) is not None:  # keep walking right
-            walk = self.right(walk)
-        return walk
+        return self._make_position(self._subtree_last_node(p._node))
+
+    def _before_node(self, node):
+        """Return the node just before node in the natural order (or None if node is first)."""
+        if node._left is not None:
+            return self._subtree_last_node(node._left)  # 找左子树中最大的key
+        walk, above = node, node._parent  # walk upward
+        while above is not None and walk is above._left:
+            walk, above = above, above._parent
+        return above
+
+    def _after_node(self, node):
+        """Return the node just after node in the natural order (or None if node is last)."""
+        if node._right is not None:
+            return self._subtree_first_node(node._right)  # 找右子树中最小的key
+        walk, above = node, node._parent  # 向上查找（即，朝着树根方向）
+        while above is not None and walk is above._right:
+            walk, above = above, above._parent
+        return above
+
+    def _access_node(self, k):
+        """Return node having key k, or else neighbor (or None if empty), after the access hook."""
+        node = self._search_node(k)
+        if node is not None:
+            self._rebalance_access(node)  # hook for balanced tree subclasses
+        return node
+
+    def _delete_node(self, node):
+        """Remove the item stored at node."""
+        if node._left is not None and node._right is not None:  # node has two children
+            # node的左子树中最大的key所在的节点为replacement，该节点没有右子树。
+            replacement = self._subtree_last_node(node._left)
+            node._element = replacement._element  # node在树中的位置没有变化
+            node = replacement
+        # now node has at most one child
+        parent = node._parent
+        child = node._left if node._left is not None else node._right  # might be None
+        if child is not None:
+            child._parent = parent  # child's grandparent becomes parent
+        if parent is None:
+            self._root = child  # child becomes root
+        elif node is parent._left:
+            parent._left = child
+        else:
+            parent._right = child
+        self._size -= 1
+        walk = parent
+        while walk is not None:  # every ancestor loses one descendant
+            walk._size -= 1
+            walk = walk._parent
+        node._parent = node  # convention for deprecated node
+        self._rebalance_delete(parent)  # if root deleted, parent is None
 
     # --------------------- public methods providing "positional" support ---------------------
     def first(self):
         """Return the first Position in the tree (or None if empty)."""
         # 整个树中最小的key
-        return self._subtree_first_position(self.root()) if len(self) > 0 else None
+        return self._make_position(self._subtree_first_node(self._root)) if len(self) > 0 else None
 
     def last(self):
         """Return the last Position in the tree (or None if empty)."""
         # 整个树中最大的key
-        return self._subtree_last_position(self.root()) if len(self) > 0 else None
+        return self._make_position(self._subtree_last_node(self._root)) if len(self) > 0 else None
 
     def before(self, p):
         """Return the Position just before p in the natural order.
 
         Return None if p is the first position.
         """
-        self._validate(p)  # inherited from LinkedBinaryTree
-        if self.left(p):
-            return self._subtree_last_position(self.left(p))  # 找左子树中最大的key
-        else:
-            # walk upward
-            walk = p
-            above = self.parent(walk)
-            while above is not None and walk == self.left(above):
-                walk = above
-                above = self.parent(walk)
-            return above
+        node = self._validate(p)  # inherited from LinkedBinaryTree
+        return self._make_position(self._before_node(node))
 
     def after(self, p):
         """Return the Position just after p in the natural order.
 
         Return None if p is the last position.
         """
-        self._validate(p)  # inherited from LinkedBinaryTree
-        if self.right(p):
-            return self._subtree_first_position(self.right(p))  # 找右子树中最小的key
-        else:
-            # 向上查找（即，朝着树根方向）
-            walk = p
-            above = self.parent(walk)
-            while above is not None and walk == self.right(above):
-                walk = above
-                above = self.parent(walk)
-            return above
+        node = self._validate(p)  # inherited from LinkedBinaryTree
+        return self._make_position(self._after_node(node))
 
     def find_position(self, k):
         """Return position with key k, or else neighbor (or None if empty)."""
-        if self.is_empty():
-            return None
-        else:
-            p = self._subtree_search(self.root(), k)
-            self._rebalance_access(p)  # hook for balanced tree subclasses
-            return p
+        return self._make_position(self._access_node(k))
 
     # 见书 p-307
     def delete(self, p):
         """Remove the item at given Position."""
-        self._validate(p)  # inherited from LinkedBinaryTree
-        if self.left(p) and self.right(p):  # p has two children
-            # p节点的左子树中最大的key所在的节点为replacement，
-            # replacement节点被定位在p的左子树中的最右边的位置，所以replacement节点没有右子树。
-            replacement = self._subtree_last_position(self.left(p))
-            # 只替换了p节点的_element，该节点在树中的位置没有变化
-            self._replace(p, replacement.element())  # from LinkedBinaryTree
-            p = replacement
-        # now p has at most one child
-        parent = self.parent(p)
-        self._delete(p)  # inherited from LinkedBinaryTree
-        self._rebalance_delete(parent)  # if root deleted, parent is None
+        self._delete_node(self._validate(p))  # inherited from LinkedBinaryTree
 
     # --------------------- public methods for (standard) map interface ---------------------
     def __getitem__(self, k):
         """Return value associated with key k (raise KeyError if not found)."""
-        if self.is_empty():
+        node = self._access_node(k)
+        if node is None or k != node._element._key:
             raise KeyError('Key Error: ' + repr(k))
-        else:
-            p = self._subtree_search(self.root(), k)
-            self._rebalance_access(p)  # hook for balanced tree subclasses
-            if k != p.key():
-                raise KeyError('Key Error: ' + repr(k))
-            return p.value()
+        return node._element._value
 
     def __setitem__(self, k, v):
         """Assign value v to key k, overwriting existing value if present."""
-        if self.is_empty():
-            leaf = self._add_root(self._Item(k, v))  # from LinkedBinaryTree
+        node = self._search_node(k)
+        if node is None:
+            leaf = self._root = self._Node(self._Item(k, v))
+            self._size = 1
         else:
-            p = self._subtree_search(self.root(), k)
-            if p.key() == k:
-                p.element()._value = v  # replace existing item's value
-                self._rebalance_access(p)  # hook for balanced tree subclasses
+            item = node._element
+            if item._key == k:
+                item._value = v  # replace existing item's value
+                self._rebalance_access(node)  # hook for balanced tree subclasses
                 return
+            leaf = self._Node(self._Item(k, v), node)  # node is its parent
+            if item._key < k:
+                node._right = leaf
             else:
-                item = self._Item(k, v)
-                if p.key() < k:
-                    leaf = self._add_right(p, item)  # inherited from LinkedBinaryTree
-                else:
-                    leaf = self._add_left(p, item)  # inherited from LinkedBinaryTree
+                node._left = leaf
+            self._size += 1
+            walk = node
+            while walk is not None:  # every ancestor gains one descendant
+                walk._size += 1
+                walk = walk._parent
         self._rebalance_insert(leaf)  # hook for balanced tree subclasses
 
     def __delitem__(self, k):
         """Remove item associated with key k (raise KeyError if not found)."""
-        if not self.is_empty():
-            p = self._subtree_search(self.root(), k)
-            if k == p.key():
-                self.delete(p)  # rely on positional version
+        node = self._search_node(k)
+        if node is not None:
+            if k == node._element._key:
+                self._delete_node(node)
                 return  # successful deletion complete
-            self._rebalance_access(p)  # hook for balanced tree subclasses
+            self._rebalance_access(node)  # hook for balanced tree subclasses
         raise KeyError('Key Error: ' + repr(k))
 
     def __iter__(self):
         """Generate an iteration of all keys in the map in order."""
-        p = self.first()
-        while p is not None:
-            yield p.key()
-            p = self.after(p)
+        node = self._subtree_first_node(self._root) if self._root is not None else None
+        while node is not None:
+            yield node._element._key
+            node = self._after_node(node)
 
     # --------------------- public methods for sorted map interface ---------------------
     def __reversed__(self):
         """Generate an iteration of all keys in the map in reverse order."""
-        p = self.last()
-        while p is not None:
-            yield p.key()
-            p = self.before(p)
+        node = self._subtree_last_node(self._root) if self._root is not None else None
+        while node is not None:
+            yield node._element._key
+            node = self._before_node(node)
 
     def find_min(self):
         """Return (key,value) pair with minimum key (or None if empty)."""
         if self.is_empty():
             return None
         else:
-            p = self.first()
-            return (p.key(), p.value())
+            item = self._subtree_first_node(self._root)._element
+            return (item._key, item._value)
 
     def find_max(self):
         """Return (key,value) pair with maximum key (or None if empty)."""
         if self.is_empty():
             return None
         else:
-            p = self.last()
-            return (p.key(), p.value())
+            item = self._subtree_last_node(self._root)._element
+            return (item._key, item._value)
 
     def find_le(self, k):
         """Return (key,value) pair with greatest key less than or equal to k.
 
         Return None if there does not exist such a key.
         """
-        if self.is_empty():
-            return None
-        else:
-            p = self.find_position(k)
-            if k < p.key():
-                p = self.before(p)  # self.before(p) <= k < p.key()
-            return (p.key(), p.value()) if p is not None else None
+        node = self._access_node(k)
+        if node is not None and k < node._element._key:
+            node = self._before_node(node)  # before <= k < node's key
+        return (node._element._key, node._element._value) if node is not None else None
 
     def find_lt(self, k):
         """Return (key,value) pair with greatest key strictly less than k.
 
         Return None if there does not exist such a key.
         """
-        if self.is_empty():
-            return None
-        else:
-            p = self.find_position(k)
-            if not p.key() < k:
-                p = self.before(p)
-            return (p.key(), p.value()) if p is not None else None
+        node = self._access_node(k)
+        if node is not None and not node._element._key < k:
+            node = self._before_node(node)
+        return (node._element._key, node._element._value) if node is not None else None
 
     def find_ge(self, k):
         """Return (key,value) pair with least key greater than or equal to k.
 
         Return None if there does not exist such a key.
         """
-        if self.is_empty():
-            return None
-        else:
-            p = self.find_position(k)  # may not find exact match
-            if p.key() < k:  # p's key is too small
-                p = self.after(p)
-            return (p.key(), p.value()) if p is not None else None
+        node = self._access_node(k)  # may not find exact match
+        if node is not None and node._element._key < k:  # node's key is too small
+            node = self._after_node(node)
+        return (node._element._key, node._element._value) if node is not None else None
 
     def find_gt(self, k):
         """Return (key,value) pair with least key strictly greater than k.
 
         Return None if there does not exist such a key.
         """
-        if self.is_empty():
-            return None
-        else:
-            p = self.find_position(k)
-            if not k < p.key():
-                p = self.after(p)
-            return (p.key(), p.value()) if p is not None else None
+        node = self._access_node(k)
+        if node is not None and not k < node._element._key:
+            node = self._after_node(node)
+        return (node._element._key, node._element._value) if node is not None else None
 
     def find_range(self, start, stop):
         """Iterate all (key,value) pairs such that start <= key < stop.
@@ -266,28 +311,161 @@ class TreeMap(LinkedBinaryTree, MapBase):
         """
         if not self.is_empty():
             if start is None:
-                p = self.first()
+                node = self._subtree_first_node(self._root)
+            else:
+                # we initialize node with logic similar to find_ge
+                node = self._access_node(start)
+                if node._element._key < start:
+                    node = self._after_node(node)
+            while node is not None and (stop is None or node._element._key < stop):
+                yield (node._element._key, node._element._value)
+                node = self._after_node(node)
+
+    # --------------------- public methods for order statistics ---------------------
+    def rank(self, k):
+        """Return the number of keys strictly less than k."""
+        # 时间复杂度: O(h), h为树的高度
+        count = 0
+        node = last = self._root
+        while node is not None:
+            last = node
+            if node._element._key < k:
+                count += node.left_size() + 1  # node and its left subtree precede k
+                node = node._right
+            else:
+                node = node._left
+        if last is not None:
+            self._rebalance_access(last)  # hook for balanced tree subclasses
+        return count
+
+    def select(self, i):
+        """Return the key of rank i, i.e. the (i+1)-th smallest key (raise IndexError if out of range).
+
+        Negative i counts from the maximum key, as for list indexing.
+        """
+        # 时间复杂度: O(h), h为树的高度
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('rank out of range')
+        node = self._root
+        while True:
+            left = node.left_size()
+            if i < left:
+                node = node._left
+            elif i == left:
+                break
             else:
-                # we initialize p with logic similar to find_ge
-                p = self.find_position(start)
-                if p.key() < start:
-                    p = self.after(p)
-            while p is not None and (stop is None or p.key() < stop):
-                yield (p.key(), p.value())
-                p = self.after(p)
+                i -= left + 1  # skip node and its left subtree
+                node = node._right
+        self._rebalance_access(node)  # hook for balanced tree subclasses
+        return node._element._key
+
+    def count_range(self, start, stop):
+        """Return the number of keys such that start <= key < stop.
+
+        A bound of None leaves that side of the range open.
+        """
+        # 时间复杂度: O(h), 与区间内元素的个数无关。
+        low = self.rank(start) if start is not None else 0
+        high = self.rank(stop) if stop is not None else len(self)
+        return max(0, high - low)
+
+    def median(self):
+        """Return the median key, the lower one when the number of keys is even (or None if empty)."""
+        return self.select((len(self) - 1) // 2) if len(self) > 0 else None
+
+    # ----------------------------- bulk operations -----------------------------
+    def update_many(self, pairs):
+        """Assign every (k,v) pair of an iterable (or the items of a mapping).
+
+        The batch is sorted once and built into a balanced tree, which is then
+        merged with union.  An empty map (e.g. from_items) is built in O(n) from
+        already sorted input.
+        """
+        # 时间复杂度: O(m log m) 用于排序 (已排序的输入为 O(m)), 合并为 O(m log(n/m + 1))
+        batch = self._build_pairs(pairs)
+        if self._root is None:
+            self._replace_root(batch)
+        elif self._BALANCED:
+            self._apply(self._union, batch)
+        else:
+            self._union_by_key(batch)
+
+    # --------------------- public methods for set operations ---------------------
+    # 基于 join 的集合运算 (Blelloch 等, "Just Join for Parallel Ordered Sets")：
+    # 本映射的树被就地拆分、合并，另一个映射只被读取。m、n 为两者中较小、较大的元素个数。
+    # 不平衡的树 (TreeMap, SplayTreeMap) 高度可能为 O(n)，递归的拆分、合并会太深，所以逐个键地完成。
+    # 若比较键时出错 (如键的类型不同)，映射保持有效，但可能只完成了部分操作，与 dict.update 相同。
+    def union(self, other):
+        """Add every (key,value) pair of other to this map.
+
+        other is another TreeMap, a mapping, or an iterable of (k,v) pairs;
+        for a key found in both, the value of other is kept.  other is not modified.
+        """
+        # 时间复杂度: O(m log(n/m + 1))
+        if other is self:
+            return
+        other_root = self._other_root(other, True)
+        if self._BALANCED:
+            self._apply(self._union, other_root)
+        else:
+            self._union_by_key(other_root)
+
+    def intersection(self, other):
+        """Remove every key of this map that is not a key of other.
+
+        other is another TreeMap, a mapping, or an iterable of keys; it is not modified.
+        """
+        # 时间复杂度: O(m log(n/m + 1))
+        if other is self:
+            return
+        other_root = self._other_root(other, False)
+        if self._BALANCED:
+            self._apply(self._intersection, other_root)
+        else:
+            doomed = [node._element._key for node in self._subtree_nodes(self._root)
+                      if not self._subtree_contains(other_root, node._element._key)]
+            for k in doomed:
+                del self[k]
+
+    def difference(self, other):
+        """Remove every key of this map that is also a key of other.
+
+        other is another TreeMap, a mapping, or an iterable of keys; it is not modified.
+        """
+        # 时间复杂度: O(m log(n/m + 1))
+        if other is self:
+            self.clear()
+            return
+        other_root = self._other_root(other, False)
+        if self._BALANCED:
+            self._apply(self._difference, other_root)
+        else:
+            for node in self._subtree_nodes(other_root):
+                k = node._element._key
+                target = self._search_node(k)
+                if target is not None and target._element._key == k:
+                    self._delete_node(target)
 
     # --------------------- hooks used by subclasses to balance a tree ---------------------
-    def _rebalance_insert(self, p):
-        """Call to indicate that position p is newly added."""
+    # 钩子函数的参数是 _Node (而不是 Position)，以免为每次操作创建 Position 对象。
+    def _rebalance_insert(self, node):
+        """Call to indicate that node is newly added."""
         pass
 
-    def _rebalance_delete(self, p):
-        """Call to indicate that a child of p has been removed."""
+    def _rebalance_delete(self, node):
+        """Call to indicate that a child of node has been removed (node is None if the root was removed)."""
         pass
 
     # 伸展树（splay-trees）用的钩子函数
-    def _rebalance_access(self, p):
-        """Call to indicate that position p was recently accessed."""
+    def _rebalance_access(self, node):
+        """Call to indicate that node was recently accessed."""
+        pass
+
+    def _rebalance_build(self, node, depth, max_depth):
+        """Call to indicate that node, at given depth of a perfectly balanced tree whose deepest node is at
+        max_depth, is about to be linked with its children."""
         pass
 
     # --------------------- nonpublic methods to support tree balancing ---------------------
@@ -301,10 +479,10 @@ class TreeMap(LinkedBinaryTree, MapBase):
         if child is not None:  # make child point to parent
             child._parent = parent
 
-    def _rotate(self, p):
-        """Rotate Position p above its parent.
+    def _rotate(self, x):
+        """Rotate node x above its parent.
 
-        Switches between these configurations, depending on whether p==a or p==b.
+        Switches between these configurations, depending on whether x==a or x==b.
 
               b                  a
              / \                /  \
@@ -312,29 +490,30 @@ class TreeMap(LinkedBinaryTree, MapBase):
            / \                     / \
           t0  t1                  t1  t2
 
-        Caller should ensure that p is not the root.
+        Caller should ensure that x is not the root.
         """
-        """Rotate Position p above its parent."""
-        x = p._node
         y = x._parent  # we assume this exists
         z = y._parent  # grandparent (possibly None)
         if z is None:
             self._root = x  # x becomes root
             x._parent = None
         else:
-            self._relink(z, x, y == z._left)  # x becomes a direct child of z
+            self._relink(z, x, y is z._left)  # x becomes a direct child of z
         # now rotate x and y, including transfer of middle subtree
-        if x == y._left:
+        if x is y._left:
             self._relink(y, x._right, True)  # x._right becomes left child of y
             self._relink(x, y, False)  # y becomes right child of x
         else:
             self._relink(y, x._left, False)  # x._left becomes right child of y
             self._relink(x, y, True)  # y becomes left child of x
+        # y is now a child of x; fix their subtree sizes bottom-up
+        y._size = 1 + y.left_size() + y.right_size()
+        x._size = 1 + x.left_size() + x.right_size()
 
     def _restructure(self, x):
-        """Perform a trinode restructure among Position x, its parent, and its grandparent.
+        """Perform a trinode restructure among node x, its parent, and its grandparent.
 
-        Return the Position that becomes root of the restructured subtree.
+        Return the node that becomes root of the restructured subtree.
 
         Assumes the nodes are in one of the following configurations:
 
@@ -356,14 +535,269 @@ class TreeMap(LinkedBinaryTree, MapBase):
 
         Caller should ensure that x has a grandparent.
         """
-        """Perform trinode restructure of Position x with parent/grandparent."""
-        y = self.parent(x)  # x的父节点
-        z = self.parent(y)  # x的祖父节点
+        y = x._parent  # x的父节点
+        z = y._parent  # x的祖父节点
         # 判断：由z,y,x构成的路径是否是一条直线(即上面注释中的前两种情况)
-        if (x == self.right(y)) == (y == self.right(z)):  # matching alignments
+        if (x is y._right) == (y is z._right):  # matching alignments
             self._rotate(y)  # single rotation (of y)
             return y  # y is new subtree root
         else:  # opposite alignments
             self._rotate(x)  # double rotation (of x)
             self._rotate(x)
             return x  # x is new subtree root
+
+    # --------------------- nonpublic methods to support bulk operations ---------------------
+    # 以下方法操作与树脱离的子树 (根节点的 _parent 为 None)，并返回新子树的根节点。
+    # 平衡树子类在调整时调用的 _rotate 可能会临时改写 self._root，
+    # 所以调用者先用 _detach_root 取下整棵树，完成后再用 _replace_root 放回。
+    def _detach_root(self):
+        """Return the root node, leaving the tree empty."""
+        root = self._root
+        self._root = None
+        self._size = 0
+        return root
+
+    def _replace_root(self, root):
+        """Make the detached subtree rooted at root (possibly None) the whole tree."""
+        if root is not None:
+            root._parent = None
+        self._root = root
+        self._size = root._size if root is not None else 0
+
+    def _link(self, node, left, right):
+        """Make detached subtrees left and right (possibly None) the children of node, and return node.
+
+        Subclasses extend this to recompute augmented fields of node.
+        """
+        node._parent = None
+        node._left = left
+        node._right = right
+        if left is not None:
+            left._parent = node
+        if right is not None:
+            right._parent = node
+        node._size = 1 + node.left_size() + node.right_size()
+        return node
+
+    def _graft(self, parent, node, make_left_child):
+        """Replace a child of parent by the subtree rooted at node, and fix the sizes of its ancestors."""
+        old = parent._left if make_left_child else parent._right
+        grow = node._size - (old._size if old is not None else 0)
+        self._relink(parent, node, make_left_child)
+        while parent is not None:
+            parent._size += grow
+            parent = parent._parent
+
+    def _subtree_root(self, node):
+        """Return the root of the (detached) subtree containing node."""
+        while node._parent is not None:
+            node = node._parent
+        return node
+
+    def _build(self, items):
+        """Return root of a new perfectly balanced subtree holding items, which are sorted by strictly
+        increasing key (or None if there are no items)."""
+        # 时间复杂度: O(n)
+        return self._build_subtree(items, 0, len(items), 0, len(items).bit_length() - 1)
+
+    def _build_subtree(self, items, lo, hi, depth, max_depth):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2  # middle item becomes the root, so subtree sizes differ by at most one
+        node = self._Node(items[mid])
+        self._rebalance_build(node, depth, max_depth)  # hook for balanced tree subclasses
+        left = self._build_subtree(items, lo, mid, depth + 1, max_depth)
+        right = self._build_subtree(items, mid + 1, hi, depth + 1, max_depth)
+        return self._link(node, left, right)
+
+    def _build_pairs(self, pairs):
+        """Return root of a new balanced subtree holding (k,v) pairs of an iterable (or a mapping).
+
+        When a key occurs more than once, its last value is kept.
+        """
+        if isinstance(pairs, Mapping):
+            pairs = pairs.items()
+        batch = sorted(pairs, key=itemgetter(0))  # stable: last value of a repeated key sorts last
+        items = []
+        for b in range(len(batch)):
+            k, v = batch[b]
+            if b + 1 < len(batch) and batch[b + 1][0] == k:
+                continue  # a later value for k follows
+            items.append(self._Item(k, v))
+        return self._build(items)
+
+    def _subtree_nodes(self, node):
+        """Generate the nodes of the subtree at node in order, without calling the access hook."""
+        stack = []
+        while stack or node is not None:  # iterative inorder traversal, confined to the subtree
+            if node is not None:
+                stack.append(node)
+                node = node._left
+            else:
+                node = stack.pop()
+                yield node
+                node = node._right
+
+    def _subtree_contains(self, node, k):
+        """Return True if the subtree at node (possibly None) has a node with key k."""
+        return node is not None and self._subtree_search_node(node, k)._element._key == k
+
+    def _copy_subtree(self, node):
+        """Return root of a new balanced subtree holding copies of the items in the subtree at node."""
+        return self._build([self._Item(n._element._key, n._element._value) for n in self._subtree_nodes(node)])
+
+    def _other_root(self, other, with_values):
+        """Return the root of other's tree, building a temporary one if other is not a TreeMap."""
+        if isinstance(other, TreeMap):
+            if other._BALANCED or not self._BALANCED:
+                return other._root
+            return self._copy_subtree(other._root)  # keeps the recursion of the set operations shallow
+        if not with_values and not isinstance(other, Mapping):
+            other = ((k, None) for k in other)  # an iterable of keys
+        return self._build_pairs(other)
+
+    def _join(self, left, node, right):
+        """Return root of a subtree holding the nodes of left, then node, then the nodes of right.
+
+        All keys of left are less than node's key, which is less than all keys of right.
+        Balanced tree subclasses override this to keep their balance in O(|h(left) - h(right)| + 1).
+        """
+        return self._link(node, left, right)
+
+    def _join2(self, left, right):
+        """Return root of a subtree holding the nodes of left, then the nodes of right."""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        last = self._subtree_last_node(left)
+        rest, last, _ = self._split(left, last._element._key)
+        return self._join(rest, last, right)
+
+    def _split(self, node, k):
+        """Split the detached subtree at node by key k.
+
+        Return (left, match, right): subtrees with keys less than and greater than k, and the node
+        having key k (or None if not found).  Keys are compared before any node is moved, so the
+        subtree is unchanged if a comparison raises an exception.
+        """
+        # 时间复杂度: O(h), h为子树的高度
+        path = []  # (node, True if the search went left) for the nodes above k's position
+        while node is not None:
+            key = node._element._key
+            if k == key:
+                break
+            went_left = k < key
+            path.append((node, went_left))
+            node = node._left if went_left else node._right
+        match = node
+        less = greater = None
+        if match is not None:
+            less, greater = match._left, match._right
+            if less is not None:
+                less._parent = None
+            if greater is not None:
+                greater._parent = None
+        for node, went_left in reversed(path):  # bottom-up, each node joins the side it lies on
+            if went_left:
+                right = node._right
+                if right is not None:
+                    right._parent = None
+                greater = self._join(greater, node, right)
+            else:
+                left = node._left
+                if left is not None:
+                    left._parent = None
+                less = self._join(left, node, less)
+        return less, match, greater
+
+    def _rejoin(self, left, node, right):
+        """Return root of a subtree holding the nodes of left, then node (unless None), then right."""
+        return self._join2(left, right) if node is None else self._join(left, node, right)
+
+    def _apply(self, operation, other):
+        """Replace the tree by operation(root, other), a recursive set operation.
+
+        If the operation raises an exception, the tree is replaced by the subtree the
+        operation left in self._salvage, so the map remains valid.
+        """
+        root = self._detach_root()
+        try:
+            root = operation(root, other)
+        except BaseException:
+            root = self._salvage
+            raise
+        finally:
+            self._salvage = None
+            self._replace_root(root)
+
+    def _union_by_key(self, other):
+        """Add copies of the items in other's subtree one key at a time."""
+        for node in self._subtree_nodes(other):
+            self[node._element._key] = node._element._value
+
+    # 以下三个递归方法在出错时把已拆开的部分重新合并，放在 self._salvage 中交给上一层
+    def _union(self, root, other):
+        """Return root of the union of the detached subtree at root and a copy of other's subtree."""
+        self._salvage = root
+        if other is None:
+            return root
+        if root is None:
+            return self._copy_subtree(other)
+        item = other._element
+        less, match, greater = self._split(root, item._key)  # root is unchanged if this raises
+        try:
+            left = self._union(less, other._left)
+        except BaseException:
+            self._salvage = self._rejoin(self._salvage, match, greater)
+            raise
+        try:
+            right = self._union(greater, other._right)
+        except BaseException:
+            self._salvage = self._rejoin(left, match, self._salvage)
+            raise
+        if match is None:
+            match = self._Node(self._Item(item._key, item._value))
+        else:
+            match._element._value = item._value  # other's value is kept
+        return self._join(left, match, right)
+
+    def _intersection(self, root, other):
+        """Return root of the nodes of the detached subtree at root whose keys are in other's subtree."""
+        self._salvage = root
+        if root is None or other is None:
+            return None
+        less, match, greater = self._split(root, other._element._key)
+        try:
+            left = self._intersection(less, other._left)
+        except BaseException:
+            self._salvage = self._rejoin(self._salvage, match, greater)
+            raise
+        try:
+            right = self._intersection(greater, other._right)
+        except BaseException:
+            self._salvage = self._rejoin(left, match, self._salvage)
+            raise
+        if match is None:
+            return self._join2(left, right)
+        return self._join(left, match, right)
+
+    def _difference(self, root, other):
+        """Return root of the nodes of the detached subtree at root whose keys are not in other's subtree."""
+        self._salvage = root
+        if root is None or other is None:
+            return root
+        less, match, greater = self._split(root, other._element._key)
+        if match is not None:
+            match._parent = match  # convention for deprecated node
+        try:
+            left = self._difference(less, other._left)
+        except BaseException:
+            self._salvage = self._join2(self._salvage, greater)
+            raise
+        try:
+            right = self._difference(greater, other._right)
+        except BaseException:
+            self._salvage = self._join2(left, self._salvage)
+            raise
+        return self._join2(left, right)
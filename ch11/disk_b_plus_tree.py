@@ -0,0 +1,783 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import pickle
+import struct
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
+from operator import itemgetter
+
+from ch10.map_base import MapBase
+
+
+class DiskBPlusTreeMap(MapBase):
+    """Persistent sorted map stored as a B+-tree of fixed-size pages in one file.
+
+    Page 0 holds a header; every other page is a leaf, an internal node or free.
+    A leaf holds pickled keys and values, an internal node pickled separator keys
+    and child page numbers, and leaves are doubly linked in key order for range
+    scans. Nodes split by their encoded size, so keys and values of any size
+    share a page as long as one item takes at most a quarter of it.
+
+    Pages are read and written with os.pread/os.pwrite through an LRU buffer pool
+    of decoded nodes; a changed node is written back when it is evicted or when
+    the map is flushed. A leaf is freed only once it is empty ("free-at-empty"),
+    so a deletion never has to move items between pages; a map emptied by heavy
+    deletions is compacted by bulk loading it again.
+
+    The file is consistent after flush or close. Before a page of the last
+    flushed state is overwritten, its old contents are saved in a rollback
+    journal (the path followed by '-journal'), so a map that was not closed
+    cleanly is restored to its last flushed state when it is opened again.
+    Keys must be mutually comparable.
+    """
+
+    _MAGIC = b'DBPTREE1'
+    _HEADER = struct.Struct('<8sIIQQQQ')  # magic, page size, dirty, root, n, page count, free list
+    _NODE = struct.Struct('<BHQQ')  # kind, count, prev leaf (first child of an internal node), next leaf
+    _LEAF_ENTRY = struct.Struct('<II')  # key length, value length; followed by key and value
+    _INNER_ENTRY = struct.Struct('<IQ')  # key length, child page; followed by key
+    _JOURNAL_ENTRY = struct.Struct('<Q')  # page number; followed by the old page (the journal starts with the header)
+    _FREE, _LEAF, _INNER = 0, 1, 2
+    FILL = 0.9  # fraction of a page filled by bulk loading, leaving room for later insertions
+
+    # -------------------------- nested node classes --------------------------
+    class _Leaf:
+        """Decoded leaf page: keys, their encodings and encoded values."""
+        __slots__ = '_id', '_keys', '_kbs', '_vbs', '_prev', '_next', '_used'
+        _is_leaf = True
+
+        def __init__(self, pid):
+            self._id = pid
+            self._keys = []
+            self._kbs = []  # pickled keys, kept to write the page back
+            self._vbs = []  # pickled values, unpickled only when requested
+            self._prev = 0  # page numbers of neighboring leaves (0 for none)
+            self._next = 0
+            self._used = 0  # encoded size of the entries
+
+    class _Inner:
+        """Decoded internal page; the keys of _children[i+1] are at least _keys[i], those of _children[i] are less."""
+        __slots__ = '_id', '_keys', '_kbs', '_children', '_used'
+        _is_leaf = False
+
+        def __init__(self, pid):
+            self._id = pid
+            self._keys = []
+            self._kbs = []
+            self._children = []  # page numbers
+            self._used = 0
+
+    # -------------------------- nested Position class --------------------------
+    class Position:
+        """The location of an item; it remains valid only until a key is added or removed."""
+
+        def __init__(self, container, pid, index):
+            """Constructor should not be invoked by user."""
+            self._container = container
+            self._pid = pid  # a page number, since the node itself may be evicted from the pool
+            self._index = index
+            self._version = container._version
+
+        def key(self):
+            """Return key of map's key-value pair."""
+            leaf, i = self._container._validate(self)
+            return leaf._keys[i]
+
+        def value(self):
+            """Return value of map's key-value pair."""
+            leaf, i = self._container._validate(self)
+            return pickle.loads(leaf._vbs[i])
+
+        def __eq__(self, other):
+            """Return True if other is a Position representing the same location."""
+            return (type(other) is type(self) and other._container is self._container
+                    and other._pid == self._pid and other._index == self._index)
+
+        def __ne__(self, other):
+            """Return True if other does not represent the same location."""
+            return not (self == other)  # opposite of __eq__
+
+    # ----------------------------- nonpublic behaviors -----------------------------
+    def _validate(self, p):
+        """Return (leaf, index) of position p, if it is valid."""
+        if not isinstance(p, self.Position):
+            raise TypeError('p must be proper Position type')
+        if p._container is not self:
+            raise ValueError('p does not belong to this container')
+        if p._version != self._version:  # keys were added or removed since p was made
+            raise ValueError('p is no longer valid')
+        leaf = self._get(p._pid)
+        self._trim()
+        return leaf, p._index
+
+    def _make_position(self, leaf, i):
+        """Return Position instance for given location (or None if no leaf), ending a lookup."""
+        self._trim()
+        return self.Position(self, leaf._id, i) if leaf is not None else None
+
+    # --------------- page I/O and buffer pool ---------------
+    def _read_page(self, pid):
+        """Read and decode page pid."""
+        data = os.pread(self._fd, self._page_size, pid * self._page_size)
+        self._reads += 1
+        kind, count, prev, nxt = self._NODE.unpack_from(data)
+        pos = self._NODE.size
+        if kind == self._LEAF:
+            node = self._Leaf(pid)
+            node._prev, node._next = prev, nxt
+            for _ in range(count):
+                kl, vl = self._LEAF_ENTRY.unpack_from(data, pos)
+                pos += self._LEAF_ENTRY.size
+                kb = data[pos:pos + kl]
+                node._kbs.append(kb)
+                node._keys.append(pickle.loads(kb))
+                node._vbs.append(data[pos + kl:pos + kl + vl])
+                pos += kl + vl
+        elif kind == self._INNER:
+            node = self._Inner(pid)
+            node._children.append(prev)
+            for _ in range(count):
+                kl, child = self._INNER_ENTRY.unpack_from(data, pos)
+                pos += self._INNER_ENTRY.size
+                kb = data[pos:pos + kl]
+                node._kbs.append(kb)
+                node._keys.append(pickle.loads(kb))
+                node._children.append(child)
+                pos += kl
+        else:
+            raise ValueError('page {0} is not a node'.format(pid))
+        node._used = pos - self._NODE.size
+        return node
+
+    def _write_page(self, node):
+        """Encode node and write it to its page."""
+        self._save_originals((node._id,))
+        if node._is_leaf:
+            parts = [self._NODE.pack(self._LEAF, len(node._keys), node._prev, node._next)]
+            for kb, vb in zip(node._kbs, node._vbs):
+                parts.append(self._LEAF_ENTRY.pack(len(kb), len(vb)))
+                parts.append(kb)
+                parts.append(vb)
+        else:
+            parts = [self._NODE.pack(self._INNER, len(node._keys), node._children[0], 0)]
+            for kb, child in zip(node._kbs, node._children[1:]):
+                parts.append(self._INNER_ENTRY.pack(len(kb), child))
+                parts.append(kb)
+        os.pwrite(self._fd, b''.join(parts), node._id * self._page_size)
+        self._writes += 1
+
+    def _get(self, pid):
+        """Return the node of page pid, from the buffer pool if possible."""
+        node = self._pool.get(pid)
+        if node is None:
+            node = self._pool[pid] = self._read_page(pid)
+        else:
+            self._pool.move_to_end(pid)  # most recently used
+        return node
+
+    def _mark(self, node):
+        """Record that node was changed and must be written back."""
+        self._dirty.add(node._id)
+        if not self._changed:
+            self._begin_changes()
+
+    # --------------- rollback journal ---------------
+    def _begin_changes(self):
+        """Start a journal holding the clean header, then mark the file as inconsistent until the next flush."""
+        self._journal = os.open(self._journal_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0))
+        os.write(self._journal, os.pread(self._fd, self._HEADER.size, 0))
+        os.fsync(self._journal)
+        self._changed = True
+        self._write_header(dirty=1)
+        os.fsync(self._fd)  # the flag is on disk before any page is overwritten
+
+    def _save_originals(self, pids):
+        """Copy to the journal each page of the last flushed state among pids that it does not hold yet."""
+        # 每个页面在两次 flush 之间最多保存一次; 日志先写入磁盘, 才能覆盖原页面
+        saved = False
+        for pid in pids:
+            if pid < self._flushed_pages and pid not in self._journaled:
+                self._journaled.add(pid)
+                page = os.pread(self._fd, self._page_size, pid * self._page_size)  # the last page may be short
+                os.write(self._journal, self._JOURNAL_ENTRY.pack(pid) + page.ljust(self._page_size, b'\0'))
+                saved = True
+        if saved:
+            os.fsync(self._journal)
+
+    def _end_changes(self):
+        """Commit the flushed pages by emptying the journal, then mark the file as consistent."""
+        # 清空日志是提交点: 此前崩溃会回滚, 此后崩溃时文件已经是新的一致状态
+        os.ftruncate(self._journal, 0)
+        os.fsync(self._journal)
+        self._write_header()
+        os.fsync(self._fd)
+        os.close(self._journal)
+        os.remove(self._journal_path)
+        self._journal = None
+        self._journaled.clear()
+        self._changed = False
+        self._flushed_pages = self._pages
+
+    def _recover(self):
+        """Bring a file left by a crash back to a consistent state.
+
+        Return False if the file is marked inconsistent and has no journal to recover it.
+        """
+        data = None
+        if os.path.exists(self._journal_path):
+            with open(self._journal_path, 'rb') as journal:
+                data = journal.read()
+        if data is not None and len(data) >= self._HEADER.size and data.startswith(self._MAGIC):
+            self._roll_back(data)  # the changes since the last flush were never committed
+        else:
+            header = self._HEADER.unpack(os.pread(self._fd, self._HEADER.size, 0))
+            if header[2]:  # dirty flag
+                if data is None:
+                    return False
+                # an emptied journal: the last flush committed, but did not get to clear the flag
+                os.pwrite(self._fd, self._HEADER.pack(header[0], header[1], 0, *header[3:]), 0)
+                os.fsync(self._fd)
+        if data is not None:
+            os.remove(self._journal_path)
+        return True
+
+    def _roll_back(self, data):
+        """Restore the pages saved in journal data, returning the file to its last flushed state."""
+        header = data[:self._HEADER.size]
+        _, page_size, _, _, _, pages, _ = self._HEADER.unpack(header)
+        pos = self._HEADER.size
+        while pos + self._JOURNAL_ENTRY.size + page_size <= len(data):  # a torn last entry was never applied
+            pid, = self._JOURNAL_ENTRY.unpack_from(data, pos)
+            pos += self._JOURNAL_ENTRY.size
+            os.pwrite(self._fd, data[pos:pos + page_size], pid * page_size)
+            pos += page_size
+        os.pwrite(self._fd, header, 0)
+        os.ftruncate(self._fd, pages * page_size)  # pages allocated after the flush
+        os.fsync(self._fd)
+
+    def _trim(self):
+        """Evict least recently used nodes beyond the pool capacity, writing back changed ones."""
+        # 只在每个操作结束时淘汰页面，所以操作进行中持有的节点不会被换出
+        while len(self._pool) > self._cache_pages:
+            pid, node = self._pool.popitem(last=False)
+            if pid in self._dirty:
+                self._dirty.discard(pid)
+                self._write_page(node)
+
+    def _allocate(self):
+        """Return a page number that is not in use, preferring the free list."""
+        if self._free:
+            pid = self._free
+            self._free = self._NODE.unpack(os.pread(self._fd, self._NODE.size, pid * self._page_size))[3]
+            return pid
+        self._pages += 1
+        return self._pages - 1
+
+    def _new_node(self, node_type):
+        node = node_type(self._allocate())
+        self._pool[node._id] = node
+        self._mark(node)
+        return node
+
+    def _release(self, node):
+        """Return node's page to the free list."""
+        self._pool.pop(node._id, None)
+        self._dirty.discard(node._id)
+        self._save_originals((node._id,))
+        os.pwrite(self._fd, self._NODE.pack(self._FREE, 0, 0, self._free), node._id * self._page_size)
+        self._free = node._id
+
+    def _write_header(self, dirty=0):
+        os.pwrite(self._fd, self._HEADER.pack(self._MAGIC, self._page_size, dirty, self._root, self._n,
+                                              self._pages, self._free), 0)
+
+    # --------------- tree navigation ---------------
+    def _find_leaf(self, k, path=None):
+        """Return the leaf where key k belongs, appending each (internal node, child index) to path."""
+        # 时间复杂度: O(log n) 个页面
+        node = self._get(self._root)
+        while not node._is_leaf:
+            i = bisect_right(node._keys, k)
+            if path is not None:
+                path.append((node, i))
+            node = self._get(node._children[i])
+        return node
+
+    def _end_leaf(self, last):
+        """Return the first (or last) leaf."""
+        node = self._get(self._root)
+        while not node._is_leaf:
+            node = self._get(node._children[-1 if last else 0])
+        return node
+
+    def _locate(self, k, after=False):
+        """Return (leaf, i) of the least key >= k (> k if after is True), or (None, 0) if there is none."""
+        leaf = self._find_leaf(k)
+        i = bisect_right(leaf._keys, k) if after else bisect_left(leaf._keys, k)
+        if i == len(leaf._keys):  # the answer starts the next leaf
+            return (self._get(leaf._next), 0) if leaf._next else (None, 0)
+        return leaf, i
+
+    def _previous(self, leaf, i):
+        """Return (leaf, i) just before the given location (leaf None is past the end), or (None, 0)."""
+        if leaf is None:
+            leaf = self._end_leaf(True)
+            i = len(leaf._keys)
+        if i > 0:
+            return leaf, i - 1
+        if not leaf._prev:
+            return None, 0
+        leaf = self._get(leaf._prev)
+        return leaf, len(leaf._keys) - 1
+
+    def _next(self, leaf, i):
+        """Return (leaf, i) just after the given location, or (None, 0)."""
+        if i + 1 < len(leaf._keys):
+            return leaf, i + 1
+        return (self._get(leaf._next), 0) if leaf._next else (None, 0)
+
+    def _item(self, leaf, i):
+        """Return (key,value) pair at the given location (or None if leaf is None), ending a lookup."""
+        self._trim()
+        return (leaf._keys[i], pickle.loads(leaf._vbs[i])) if leaf is not None else None
+
+    # --------------- structural changes ---------------
+    def _split(self, node, path):
+        """Split the overfull node, and its ancestors in turn while they overflow."""
+        while node._used > self._payload:
+            if node._is_leaf:
+                right = self._new_node(self._Leaf)
+                m = self._split_index([self._LEAF_ENTRY.size + len(kb) + len(vb)
+                                       for kb, vb in zip(node._kbs, node._vbs)], node._used)
+                right._keys, right._kbs, right._vbs = node._keys[m:], node._kbs[m:], node._vbs[m:]
+                del node._keys[m:], node._kbs[m:], node._vbs[m:]
+                right._prev, right._next = node._id, node._next  # link right into the list of leaves
+                if node._next:
+                    after = self._get(node._next)
+                    after._prev = right._id
+                    self._mark(after)
+                node._next = right._id
+                key, kb = right._keys[0], right._kbs[0]
+            else:
+                right = self._new_node(self._Inner)
+                m = self._split_index([self._INNER_ENTRY.size + len(kb) for kb in node._kbs], node._used)
+                key, kb = node._keys[m], node._kbs[m]  # moves up to the parent
+                right._keys, right._kbs, right._children = node._keys[m + 1:], node._kbs[m + 1:], node._children[m + 1:]
+                del node._keys[m:], node._kbs[m:], node._children[m + 1:]
+            self._recount(node)
+            self._recount(right)
+            self._mark(node)
+            if not path:  # node was the root; the tree grows one level
+                root = self._new_node(self._Inner)
+                root._children = [node._id]
+                self._insert_separator(root, 0, key, kb, right._id)
+                self._root = root._id
+                return
+            parent, i = path.pop()
+            self._insert_separator(parent, i, key, kb, right._id)
+            node = parent
+
+    @staticmethod
+    def _split_index(sizes, used):
+        """Return the index that splits entries of given sizes into two halves of about equal size."""
+        total = 0
+        for i, size in enumerate(sizes):
+            total += size
+            if 2 * total >= used:
+                return max(1, min(i + 1, len(sizes) - 1))
+        return len(sizes) - 1
+
+    def _recount(self, node):
+        """Recompute the encoded size of node's entries."""
+        if node._is_leaf:
+            node._used = sum(self._LEAF_ENTRY.size + len(kb) + len(vb) for kb, vb in zip(node._kbs, node._vbs))
+        else:
+            node._used = sum(self._INNER_ENTRY.size + len(kb) for kb in node._kbs)
+
+    def _insert_separator(self, parent, i, key, kb, child):
+        """Insert key, separating child i of parent from the new child i+1."""
+        parent._keys.insert(i, key)
+        parent._kbs.insert(i, kb)
+        parent._children.insert(i + 1, child)
+        parent._used += self._INNER_ENTRY.size + len(kb)
+        self._mark(parent)
+
+    def _remove_empty(self, leaf, path):
+        """Free the empty leaf, and every ancestor that is left without children."""
+        if leaf._prev:  # unlink leaf from the list of leaves
+            before = self._get(leaf._prev)
+            before._next = leaf._next
+            self._mark(before)
+        if leaf._next:
+            after = self._get(leaf._next)
+            after._prev = leaf._prev
+            self._mark(after)
+        node = leaf
+        while True:
+            self._release(node)
+            parent, i = path.pop()
+            del parent._children[i]
+            if parent._keys:
+                j = i - 1 if i > 0 else 0  # drop the separator on one side of the child
+                parent._used -= self._INNER_ENTRY.size + len(parent._kbs[j])
+                del parent._keys[j], parent._kbs[j]
+            self._mark(parent)
+            if parent._children:
+                break
+            node = parent
+        root = self._get(self._root)
+        while not root._is_leaf and len(root._children) == 1:  # the tree shrinks one level
+            self._root = root._children[0]
+            self._release(root)
+            root = self._get(self._root)
+
+    def _bulk_load(self, items):
+        """Replace the empty tree by one built bottom-up from (kb, key, vb) entries in increasing key order."""
+        # 时间复杂度: O(n), 每个页面只写一次, 叶子页面在文件中连续存放
+        self._release(self._get(self._root))
+        limit = int(self.FILL * self._payload)
+        level = []  # (key, kb, page) of the first key of each node of the level being built
+        leaf = None
+        for kb, key, vb in items:
+            size = self._LEAF_ENTRY.size + len(kb) + len(vb)
+            if leaf is None or leaf._used + size > limit:
+                previous, leaf = leaf, self._Leaf(self._allocate())
+                if previous is not None:
+                    previous._next, leaf._prev = leaf._id, previous._id
+                    self._write_page(previous)
+                level.append((key, kb, leaf._id))
+            leaf._keys.append(key)
+            leaf._kbs.append(kb)
+            leaf._vbs.append(vb)
+            leaf._used += size
+        if leaf is None:  # no items
+            leaf = self._Leaf(self._allocate())
+        self._write_page(leaf)
+        self._root = leaf._id
+        while len(level) > 1:  # build the next level up
+            upper = []
+            node = None
+            for key, kb, pid in level:
+                size = self._INNER_ENTRY.size + len(kb)
+                if node is None or node._used + size > limit:
+                    if node is not None:
+                        self._write_page(node)
+                    node = self._Inner(self._allocate())
+                    node._children.append(pid)
+                    upper.append((key, kb, node._id))  # the first key of a node moves up
+                else:
+                    node._keys.append(key)
+                    node._kbs.append(kb)
+                    node._children.append(pid)
+                    node._used += size
+            self._write_page(node)
+            self._root = node._id
+            level = upper
+
+    # ----------------------------- public behaviors -----------------------------
+    def __init__(self, path, page_size=4096, cache_pages=1024):
+        """Open the map stored at path, creating it if needed (or rolling it back to its last flush).
+
+        page_size    size in bytes of a page of a new file (an existing file keeps its own)
+        cache_pages  number of decoded pages kept in the buffer pool
+        """
+        if page_size < 256:
+            raise ValueError('page_size must be at least 256')
+        if cache_pages < 1:
+            raise ValueError('cache_pages must be positive')
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0))
+        self._cache_pages = cache_pages
+        self._pool = OrderedDict()  # page number -> decoded node, least recently used first
+        self._dirty = set()  # page numbers of nodes changed since they were written
+        self._changed = False
+        self._journal_path = path + '-journal'
+        self._journal = None  # file descriptor of the journal while there are unflushed changes
+        self._journaled = set()  # page numbers saved in the journal
+        self._reads = self._writes = 0  # page I/O counters
+        self._version = 0  # counts insertions and removals, to invalidate positions
+        data = os.pread(self._fd, self._HEADER.size, 0)
+        if len(data) == self._HEADER.size:
+            magic, page_size, dirty, self._root, self._n, self._pages, self._free = self._HEADER.unpack(data)
+            if magic != self._MAGIC:
+                os.close(self._fd)
+                raise ValueError('not a DiskBPlusTreeMap file')
+            if not self._recover():
+                os.close(self._fd)
+                raise ValueError('the map was not closed cleanly and has no journal')
+            data = os.pread(self._fd, self._HEADER.size, 0)  # the header may have been restored
+            magic, page_size, dirty, self._root, self._n, self._pages, self._free = self._HEADER.unpack(data)
+            self._page_size = page_size
+        else:  # a new file: header page and an empty root leaf
+            self._page_size = page_size
+            self._root, self._n, self._pages, self._free = 1, 0, 2, 0
+            self._flushed_pages = 0  # nothing to journal before the first flush
+            self._write_page(self._Leaf(1))
+            self._write_header()
+        self._flushed_pages = self._pages
+        self._payload = self._page_size - self._NODE.size  # room for the entries of a node
+        self._max_item = self._payload // 4
+
+    def __len__(self):
+        """Return number of items in the map."""
+        return self._n
+
+    def __getitem__(self, k):
+        """Return value associated with key k (raise KeyError if not found)."""
+        # 时间复杂度: O(log n) 个页面
+        leaf = self._find_leaf(k)
+        self._trim()
+        i = bisect_left(leaf._keys, k)
+        if i == len(leaf._keys) or leaf._keys[i] != k:
+            raise KeyError('Key Error: ' + repr(k))
+        return pickle.loads(leaf._vbs[i])
+
+    def __setitem__(self, k, v):
+        """Assign value v to key k, overwriting existing value if present."""
+        vb = pickle.dumps(v, pickle.HIGHEST_PROTOCOL)
+        path = []
+        leaf = self._find_leaf(k, path)
+        i = bisect_left(leaf._keys, k)
+        if i < len(leaf._keys) and leaf._keys[i] == k:
+            kb = leaf._kbs[i]
+            self._check_size(kb, vb)
+            leaf._used += len(vb) - len(leaf._vbs[i])
+            leaf._vbs[i] = vb  # reassign value
+        else:
+            kb = pickle.dumps(k, pickle.HIGHEST_PROTOCOL)
+            self._check_size(kb, vb)
+            leaf._keys.insert(i, k)
+            leaf._kbs.insert(i, kb)
+            leaf._vbs.insert(i, vb)
+            leaf._used += self._LEAF_ENTRY.size + len(kb) + len(vb)
+            self._n += 1
+            self._version += 1
+        self._mark(leaf)
+        self._split(leaf, path)  # a larger value may also overflow the page
+        self._trim()
+
+    def _check_size(self, kb, vb):
+        if self._LEAF_ENTRY.size + len(kb) + len(vb) > self._max_item:
+            raise ValueError('item takes more than a quarter of a page')
+
+    def __delitem__(self, k):
+        """Remove item associated with key k (raise KeyError if not found)."""
+        path = []
+        leaf = self._find_leaf(k, path)
+        i = bisect_left(leaf._keys, k)
+        if i == len(leaf._keys) or leaf._keys[i] != k:
+            self._trim()
+            raise KeyError('Key Error: ' + repr(k))
+        leaf._used -= self._LEAF_ENTRY.size + len(leaf._kbs[i]) + len(leaf._vbs[i])
+        del leaf._keys[i], leaf._kbs[i], leaf._vbs[i]
+        self._n -= 1
+        self._version += 1
+        self._mark(leaf)
+        if not leaf._keys and path:
+            self._remove_empty(leaf, path)
+        self._trim()
+
+    def __iter__(self):
+        """Generate keys of the map ordered from minimum to maximum."""
+        leaf = self._end_leaf(False)
+        while True:
+            yield from leaf._keys
+            if not leaf._next:
+                return
+            leaf = self._get(leaf._next)
+            self._trim()
+
+    def __reversed__(self):
+        """Generate keys of the map ordered from maximum to minimum."""
+        leaf = self._end_leaf(True)
+        while True:
+            yield from reversed(leaf._keys)
+            if not leaf._prev:
+                return
+            leaf = self._get(leaf._prev)
+            self._trim()
+
+    # --------------------- public methods providing "positional" support ---------------------
+    def first(self):
+        """Return the first Position in the map (or None if empty)."""
+        return self._make_position(self._end_leaf(False), 0) if self._n > 0 else None
+
+    def last(self):
+        """Return the last Position in the map (or None if empty)."""
+        if self._n == 0:
+            return None
+        leaf = self._end_leaf(True)
+        return self._make_position(leaf, len(leaf._keys) - 1)
+
+    def before(self, p):
+        """Return the Position just before p in the natural order.
+
+        Return None if p is the first position.
+        """
+        return self._make_position(*self._previous(*self._validate(p)))
+
+    def after(self, p):
+        """Return the Position just after p in the natural order.
+
+        Return None if p is the last position.
+        """
+        return self._make_position(*self._next(*self._validate(p)))
+
+    def find_position(self, k):
+        """Return position with key k, or else neighbor (or None if empty)."""
+        leaf, i = self._locate(k)
+        if leaf is None:  # k is larger than every key
+            return self.last()
+        return self._make_position(leaf, i)
+
+    def delete(self, p):
+        """Remove the item at given Position."""
+        leaf, i = self._validate(p)
+        del self[leaf._keys[i]]
+
+    # --------------------- public methods for sorted map interface ---------------------
+    def find_min(self):
+        """Return (key,value) pair with minimum key (or None if empty)."""
+        return self._item(self._end_leaf(False), 0) if self._n > 0 else None
+
+    def find_max(self):
+        """Return (key,value) pair with maximum key (or None if empty)."""
+        return self._item(self._end_leaf(True), -1) if self._n > 0 else None
+
+    def find_le(self, k):
+        """Return (key,value) pair with greatest key less than or equal to k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._previous(*self._locate(k, after=True)))
+
+    def find_lt(self, k):
+        """Return (key,value) pair with greatest key strictly less than k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._previous(*self._locate(k)))
+
+    def find_ge(self, k):
+        """Return (key,value) pair with least key greater than or equal to k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._locate(k))
+
+    def find_gt(self, k):
+        """Return (key,value) pair with least key strictly greater than k.
+
+        Return None if there does not exist such a key.
+        """
+        return self._item(*self._locate(k, after=True))
+
+    def find_range(self, start, stop):
+        """Iterate all (key,value) pairs such that start <= key < stop.
+
+        If start is None, iteration begins with minimum key of map.
+        If stop is None, iteration continues through the maximum key of map.
+        """
+        # 时间复杂度: O(s + log n), s是区间范围内元素的个数; 读取 O(s/B + log n) 个页面, B为每页的元素个数
+        leaf, i = (self._end_leaf(False), 0) if start is None else self._locate(start)
+        self._trim()
+        while leaf is not None:
+            keys = leaf._keys
+            if stop is None or not keys or keys[-1] < stop:
+                end = len(keys)
+            else:
+                end = bisect_left(keys, stop, i)  # range ends within this leaf
+            vbs = leaf._vbs
+            for j in range(i, end):
+                yield (keys[j], pickle.loads(vbs[j]))
+            if end < len(keys) or not leaf._next:
+                return
+            leaf, i = self._get(leaf._next), 0
+            self._trim()
+
+    # ----------------------------- bulk operations -----------------------------
+    def update_many(self, pairs):
+        """Assign every (k,v) pair of an iterable (or the items of a mapping).
+
+        An empty map is bulk loaded: the batch is sorted once (which is O(n) for
+        sorted input) and written bottom-up, one write per page.
+        """
+        if self._n > 0:
+            MapBase.update_many(self, pairs)
+            return
+        if isinstance(pairs, Mapping):
+            pairs = pairs.items()
+        batch = sorted(pairs, key=itemgetter(0))  # stable: last value of a repeated key sorts last
+        items = []
+        for b in range(len(batch)):
+            k, v = batch[b]
+            if b + 1 < len(batch) and batch[b + 1][0] == k:
+                continue  # a later value for k follows
+            kb = pickle.dumps(k, pickle.HIGHEST_PROTOCOL)
+            vb = pickle.dumps(v, pickle.HIGHEST_PROTOCOL)
+            self._check_size(kb, vb)
+            items.append((kb, k, vb))
+        if not self._changed:
+            self._begin_changes()
+        self._bulk_load(items)
+        self._n = len(items)
+        self._version += 1
+
+    def flush(self):
+        """Write every changed page, commit them by emptying the journal, then mark the file as consistent."""
+        if not self._changed:
+            return
+        pids = sorted(self._dirty)  # in file order
+        self._save_originals(pids)  # one journal sync for the whole batch
+        for pid in pids:
+            self._write_page(self._pool[pid])
+        self._dirty.clear()
+        self._write_header(dirty=1)  # the new root, size and free list, still marked inconsistent
+        os.fsync(self._fd)
+        self._end_changes()
+
+    def close(self):
+        """Flush the map and close its file."""
+        if self._fd is not None:
+            self.flush()
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'demo.bpt')
+    with DiskBPlusTreeMap(path, page_size=256, cache_pages=4) as m:
+        m.update_many((i, 'v%d' % i) for i in range(0, 200, 2))  # bulk loaded
+        m[51] = 'new'
+        del m[52]
+        print(len(m), m._pages, list(m.find_range(48, 58)))
+    with DiskBPlusTreeMap(path) as m:  # reopened from disk
+        print(len(m), m[51], m.find_le(53), m.find_gt(198))
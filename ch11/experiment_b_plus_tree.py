@@ -0,0 +1,81 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+import tracemalloc
+from functools import partial
+from random import shuffle
+from time import perf_counter
+
+from ch10.sorted_table_map import SortedTableMap
+from ch11.avl_tree import AVLTreeMap
+from ch11.b_plus_tree import BPlusTreeMap
+from ch11.red_black_tree import RedBlackTreeMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 200000
+
+SCAN = 100  # number of keys in each range query
+
+
+def run_map(map_factory, keys):
+    """Return memory (MB) of a map holding keys, and elapsed times of setitem, getitem, find_range, delitem."""
+    tracemalloc.start()
+    m = map_factory()
+    start = perf_counter()
+    for k in keys:
+        m[k] = k
+    times = [perf_counter() - start]
+    memory = tracemalloc.get_traced_memory()[0] / 2 ** 20
+    tracemalloc.stop()
+    start = perf_counter()
+    for k in keys:
+        m[k]
+    times.append(perf_counter() - start)
+    start = perf_counter()
+    for k in keys[:len(keys) // SCAN]:
+        for _ in m.find_range(k, k + SCAN):
+            pass
+    times.append(perf_counter() - start)
+    start = perf_counter()
+    for k in keys:
+        del m[k]
+    times.append(perf_counter() - start)
+    return [memory] + times
+
+
+if __name__ == '__main__':
+    # B+树与二叉平衡树、有序表的内存(单位: MB)与耗时(单位: 秒)对比, 插入时计时包含了 tracemalloc 的开销
+    keys = list(range(maxN))
+    shuffle(keys)
+    print('n = {0}, find_range over {1} keys, {2} times'.format(maxN, SCAN, maxN // SCAN))
+    print('{0:<24}{1:>10}{2:>10}{3:>10}{4:>12}{5:>10}'.format(
+        'map', 'memory', 'setitem', 'getitem', 'find_range', 'delitem'))
+    maps = [('AVLTreeMap', AVLTreeMap), ('RedBlackTreeMap', RedBlackTreeMap), ('SortedTableMap', SortedTableMap)]
+    maps += [('BPlusTreeMap(order={0})'.format(order), partial(BPlusTreeMap, order)) for order in (16, 64, 256)]
+    for name, map_factory in maps:
+        gc.disable()  # as timeit does, keep collector pauses out of the measurement
+        results = run_map(map_factory, keys)
+        gc.enable()
+        print('{0:<24}{1:>10.1f}{2:>10.3f}{3:>10.3f}{4:>12.3f}{5:>10.3f}'.format(name, *results))
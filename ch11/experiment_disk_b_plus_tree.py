@@ -0,0 +1,81 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import os
+import sys
+import tempfile
+from random import randrange
+from time import perf_counter
+
+from ch11.disk_b_plus_tree import DiskBPlusTreeMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 200000
+
+QUERIES = 1000
+SCAN = 100  # number of keys in each range query
+
+
+def scans(m, starts):
+    """Run a range query of SCAN keys from each start; return elapsed time and pages read."""
+    reads = m._reads
+    start = perf_counter()
+    for k in starts:
+        for _ in m.find_range(k, k + SCAN):
+            pass
+    return perf_counter() - start, m._reads - reads
+
+
+if __name__ == '__main__':
+    # 批量加载与逐个插入的耗时对比, 以及冷/热缓冲池下区间查询的耗时(单位: 秒)与读取的页面数
+    # 注意: "冷" 只表示缓冲池为空, 操作系统的文件缓存可能仍然保存着这些页面
+    folder = tempfile.mkdtemp()
+    pairs = [(i, 'value%d' % i) for i in range(maxN)]
+    print('n = {0}, {1} range queries over {2} keys'.format(maxN, QUERIES, SCAN))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    start = perf_counter()
+    with DiskBPlusTreeMap(os.path.join(folder, 'one.bpt')) as m:
+        for k, v in pairs:
+            m[k] = v
+        pages = m._pages
+    print('{0:<28}{1:>10.3f} s{2:>10} pages'.format('setitem one by one', perf_counter() - start, pages))
+    path = os.path.join(folder, 'bulk.bpt')
+    start = perf_counter()
+    with DiskBPlusTreeMap(path) as m:
+        m.update_many(pairs)
+        pages = m._pages
+    print('{0:<28}{1:>10.3f} s{2:>10} pages'.format('update_many (bulk load)', perf_counter() - start, pages))
+    gc.enable()
+
+    starts = [randrange(maxN) for _ in range(QUERIES)]
+    print()
+    print('{0:<28}{1:>12}{2:>12}{3:>20}'.format('buffer pool', 'cold (s)', 'warm (s)', 'pages read (c/w)'))
+    for cache_pages in (16, 256, 4096):
+        gc.disable()
+        with DiskBPlusTreeMap(path, cache_pages=cache_pages) as m:  # a newly opened map has an empty pool
+            cold, cold_reads = scans(m, starts)
+            warm, warm_reads = scans(m, starts)
+        gc.enable()
+        print('{0:<28}{1:>12.4f}{2:>12.4f}{3:>20}'.format(
+            '{0} pages'.format(cache_pages), cold, warm, '{0}/{1}'.format(cold_reads, warm_reads)))
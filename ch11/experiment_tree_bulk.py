@@ -0,0 +1,81 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from random import sample
+from time import perf_counter
+
+from ch11.avl_tree import AVLTreeMap
+from ch11.red_black_tree import RedBlackTreeMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 200000
+
+
+def time_build(map_type, pairs):
+    """Return elapsed times of building map_type from sorted pairs one key at a time, and with from_items."""
+    start = perf_counter()
+    tree = map_type()
+    for k, v in pairs:
+        tree[k] = v
+    one_by_one = perf_counter() - start
+    start = perf_counter()
+    map_type.from_items(pairs)
+    bulk = perf_counter() - start
+    return one_by_one, bulk
+
+
+def time_union(map_type, base, batch):
+    """Return elapsed times of adding batch to a map of base pairs one key at a time, and with union."""
+    tree = map_type.from_items(base)
+    start = perf_counter()
+    for k, v in batch:
+        tree[k] = v
+    one_by_one = perf_counter() - start
+    tree = map_type.from_items(base)
+    other = map_type.from_items(batch)
+    start = perf_counter()
+    tree.union(other)
+    join = perf_counter() - start
+    return one_by_one, join
+
+
+if __name__ == '__main__':
+    # 由已排序数据构建平衡树，以及向 n 个元素的树中合并 m 个元素的耗时对比(单位: 秒)
+    pairs = [(2 * i, i) for i in range(maxN)]
+    print('n = {0}'.format(maxN))
+    print('{0:<18}{1:>12}{2:>12}'.format('build', 'setitem', 'from_items'))
+    gc.disable()  # as timeit does, keep collector pauses out of the measurement
+    for map_type in (AVLTreeMap, RedBlackTreeMap):
+        print('{0:<18}{1:>12.3f}{2:>12.3f}'.format(map_type.__name__, *time_build(map_type, pairs)))
+    gc.enable()
+    print()
+    print('{0:<18}{1:>10}{2:>12}{3:>12}'.format('merge', 'm', 'setitem', 'union'))
+    for m in (maxN // 1000, maxN // 100, maxN // 10, maxN):
+        batch = sorted((2 * k + 1, k) for k in sample(range(maxN), m))  # new keys, spread over the map
+        for map_type in (AVLTreeMap, RedBlackTreeMap):
+            gc.disable()
+            times = time_union(map_type, pairs, batch)
+            gc.enable()
+            print('{0:<18}{1:>10}{2:>12.4f}{3:>12.4f}'.format(map_type.__name__, m, *times))
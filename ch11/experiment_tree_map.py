@@ -0,0 +1,106 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from random import shuffle
+from time import perf_counter
+
+from ch08.linked_binary_tree import LinkedBinaryTree
+from ch11.avl_tree import AVLTreeMap
+from ch11.red_black_tree import RedBlackTreeMap
+from ch11.splay_tree import SplayTreeMap
+
+try:
+    maxN = int(sys.argv[1])
+except:
+    maxN = 100000
+
+OPERATIONS = ('setitem', 'getitem', 'find_le', 'find_range', 'delitem')
+
+
+def workload(tree, keys, operation):
+    """Apply one kind of operation to tree for every key in keys."""
+    if operation == 'setitem':
+        for k in keys:
+            tree[k] = k
+    elif operation == 'getitem':
+        for k in keys:
+            tree[k]
+    elif operation == 'find_le':
+        for k in keys:
+            tree.find_le(k + 0.5)
+    elif operation == 'find_range':
+        for k in keys:
+            for _ in tree.find_range(k, k + 8):
+                pass
+    else:
+        for k in keys:
+            del tree[k]
+
+
+def count_positions(map_type, keys):
+    """Return the number of Positions created by every operation, run in order on a new map_type."""
+    created = [0]
+    original = LinkedBinaryTree.Position.__init__
+
+    def counting_init(self, container, node):
+        created[0] += 1
+        original(self, container, node)
+
+    tree = map_type()
+    counts = []
+    LinkedBinaryTree.Position.__init__ = counting_init
+    try:
+        for operation in OPERATIONS:
+            created[0] = 0
+            workload(tree, keys, operation)
+            counts.append(created[0])
+    finally:
+        LinkedBinaryTree.Position.__init__ = original
+    return counts
+
+
+def time_operations(map_type, keys):
+    """Return the elapsed time of every operation, run in order on a new map_type."""
+    tree = map_type()
+    elapsed = []
+    for operation in OPERATIONS:
+        start = perf_counter()
+        workload(tree, keys, operation)
+        elapsed.append(perf_counter() - start)
+    return elapsed
+
+
+if __name__ == '__main__':
+    # 各操作的吞吐量(单位: 千次/秒)及每次操作平均创建的 Position 对象数
+    keys = list(range(maxN))
+    shuffle(keys)
+    print('n = {0}'.format(maxN))
+    print('{0:<18}'.format('tree') + ''.join('{0:>22}'.format(op) for op in OPERATIONS))
+    for map_type in (AVLTreeMap, RedBlackTreeMap, SplayTreeMap):
+        gc.disable()  # as timeit does, keep collector pauses out of the measurement
+        elapsed = time_operations(map_type, keys)
+        gc.enable()
+        counts = count_positions(map_type, keys)
+        print('{0:<18}'.format(map_type.__name__) + ''.join(
+            '{0:>10.1f}k/s{1:>6.1f} pos'.format(maxN / seconds / 1000, positions / maxN)
+            for seconds, positions in zip(elapsed, counts)))
@@ -24,113 +24,188 @@ from ch11.binary_search_tree import TreeMap
 
 class RedBlackTreeMap(TreeMap):
     """Sorted map implementation using a red-black tree."""
+    _BALANCED = True
 
     # -------------------------- nested _Node class --------------------------
     class _Node(TreeMap._Node):
         """Node class for red-black tree maintains bit that denotes color."""
-        __slots__ = '_red'  # add additional data member to the Node class
+        __slots__ = '_red', '_black_height'  # add additional data members to the Node class
 
         def __init__(self, element, parent=None, left=None, right=None):
             super().__init__(element, parent, left, right)
             self._red = True  # new node red by default
+            self._black_height = 0  # black nodes on a path down from here, counting this node
 
-    # ------------------------- positional-based utility methods -------------------------
+        def child_black_height(self):
+            child = self._left if self._left is not None else self._right
+            return child._black_height if child is not None else 0
+
+    # ---------------------------- node-based utility methods ----------------------------
     # we consider a nonexistent child to be trivially black
-    def _set_red(self, p):
-        p._node._red = True
+    # 黑高度(black height)用于合并两棵树(_join)，这里在改变颜色时一并更新
+    def _set_red(self, node):
+        node._red = True
+        self._recompute_black_height(node)
+
+    def _set_black(self, node):
+        node._red = False
+        self._recompute_black_height(node)
+
+    def _set_color(self, node, make_red):
+        node._red = make_red
+        self._recompute_black_height(node)
 
-    def _set_black(self, p):
-        p._node._red = False
+    def _recompute_black_height(self, node):
+        node._black_height = node.child_black_height() + (0 if node._red else 1)
 
-    def _set_color(self, p, make_red):
-        p._node._red = make_red
+    def _recompute_black_heights(self, node):
+        """Recompute black heights from node up to the root, after the rebalancing below node is done."""
+        while node is not None:
+            self._recompute_black_height(node)
+            node = node._parent
 
-    def _is_red(self, p):
-        return p is not None and p._node._red
+    def _is_red(self, node):
+        return node is not None and node._red
 
-    def _is_red_leaf(self, p):
-        return self._is_red(p) and self.is_leaf(p)
+    def _is_red_leaf(self, node):
+        return self._is_red(node) and node._left is None and node._right is None
 
-    def _get_red_child(self, p):
-        """Return a red child of p (or None if no such child)."""
-        for child in (self.left(p), self.right(p)):
+    def _get_red_child(self, node):
+        """Return a red child of node (or None if no such child)."""
+        for child in (node._left, node._right):
             if self._is_red(child):
                 return child
         return None
 
-    # ------------------------- support for insertions -------------------------
-    def _rebalance_insert(self, p):
-        self._resolve_red(p)  # new node is always red
+    def _sibling_node(self, node):
+        """Return the sibling of node (or None if no sibling)."""
+        parent = node._parent
+        return parent._right if node is parent._left else parent._left
 
-    def _resolve_red(self, p):
-        if self.is_root(p):
-            # 红黑树的根节点是黑色的
-            self._set_black(p)  # make root black
-        else:
-            parent = self.parent(p)  # parent 即是 y
+    # ------------------------- support for insertions -------------------------
+    def _rebalance_insert(self, node):
+        self._resolve_red(node)  # new node is always red
+        self._recompute_black_heights(node)
+
+    def _resolve_red(self, x):
+        # 迭代实现：Case 2 不再递归，而是继续处理红色的祖父节点
+        while True:
+            if x._parent is None:
+                # 红黑树的根节点是黑色的
+                self._set_black(x)  # make root black
+                return
+            parent = x._parent  # parent 即是 y
             # 解决双红色问题
-            if self._is_red(parent):  # double red problem
-                uncle = self.sibling(parent)
-                if not self._is_red(uncle):  # Case 1: misshapen 4-node
-                    middle = self._restructure(p)  # do trinode restructuring
-                    self._set_black(middle)  # and then fix colors
-                    self._set_red(self.left(middle))
-                    self._set_red(self.right(middle))
-                else:  # Case 2: overfull 5-node
-                    grand = self.parent(parent)  # grand 即是 z
-                    self._set_red(grand)  # grandparent becomes red
-                    self._set_black(self.left(grand))  # its children become black
-                    self._set_black(self.right(grand))
-                    self._resolve_red(grand)  # recur at red grandparent
+            if not self._is_red(parent):
+                return
+            uncle = self._sibling_node(parent)  # double red problem
+            if not self._is_red(uncle):  # Case 1: misshapen 4-node
+                middle = self._restructure(x)  # do trinode restructuring
+                self._set_black(middle)  # and then fix colors
+                self._set_red(middle._left)
+                self._set_red(middle._right)
+                return
+            # Case 2: overfull 5-node
+            grand = parent._parent  # grand 即是 z
+            self._set_red(grand)  # grandparent becomes red
+            self._set_black(grand._left)  # its children become black
+            self._set_black(grand._right)
+            x = grand  # repeat at red grandparent
 
     # ------------------------- support for deletions -------------------------
-    def _rebalance_delete(self, p):
-        """p 是被删除节点的父节点"""
+    def _rebalance_delete(self, node):
+        """node 是被删除节点的父节点"""
         if len(self) == 1:
-            self._set_black(self.root())  # special case: ensure that root is black
-        elif p is not None:
-            n = self.num_children(p)
+            self._set_black(self._root)  # special case: ensure that root is black
+        elif node is not None:
+            left, right = node._left, node._right
             # 需要结合书中P-307页 图11-6来理解
-            if n == 1:  # deficit exists unless child is a red leaf
-                c = next(self.children(p))  # c是y，p是z
+            if (left is None) != (right is None):  # deficit exists unless child is a red leaf
+                c = left if left is not None else right  # c是y，node是z
                 if not self._is_red_leaf(c):  # 如果c是红色的叶子节点，那么被删除的节点也是红色叶子节点
-                    # 被删除的节点是节点p的黑色叶子节点（可以根据红黑树的特性，推断出来）
-                    self._fix_deficit(p, c)
-            elif n == 2:  # removed black node with red child
+                    # 被删除的节点是node的黑色叶子节点（可以根据红黑树的特性，推断出来）
+                    self._fix_deficit(node, c)
+            elif left is not None:  # removed black node with red child
                 # 书中P-338页，最上边描述的情况。另见P-340 图11-41 b) 右侧的描述。
-                if self._is_red_leaf(self.left(p)):
-                    self._set_black(self.left(p))
+                if self._is_red_leaf(left):
+                    self._set_black(left)
                 else:
-                    self._set_black(self.right(p))
+                    self._set_black(right)
+            self._recompute_black_heights(node)
 
     def _fix_deficit(self, z, y):
         """Resolve black deficit at z, where y is the root of z's heavier subtree."""
-        if not self._is_red(y):  # y is black; will apply Case 1 or 2
+        # 迭代实现：Case 2 中向上传递的亏损通过循环处理
+        while True:
+            if self._is_red(y):  # Case 3: y is red; rotate misaligned 3-node and repeat
+                self._rotate(y)
+                self._set_black(y)
+                self._set_red(z)
+                # 再执行一次 情况1 或者 情况2中的第一种情况(因为此时z节点是红色的)
+                y = z._left if z is y._right else z._right
+            # y is black; will apply Case 1 or 2
             x = self._get_red_child(y)
             if x is not None:  # Case 1: y is black and has red child x; do "transfer". (对应（2，4）树)
                 # 书中P-338页，情况1
                 old_color = self._is_red(z)  # 重组前，z的颜色
                 middle = self._restructure(x)
                 self._set_color(middle, old_color)  # middle gets old color of z
-                self._set_black(self.left(middle))  # children become black
-                self._set_black(self.right(middle))
-            else:  # Case 2: y is black, but no red children; recolor as "fusion". (对应（2，4）树)
-                self._set_red(y)
-                if self._is_red(z):
-                    # 书中P-338页，情况2中的第一种情况（z节点原先是红色的）
-                    self._set_black(z)  # this resolves the problem
-                elif not self.is_root(z):  # 如果z是整个树的根节点，那就不需再向上传递了，因为在删除节点并进行了一系列的结构调整后，整个树的黑色深度减少了1
-                    # 书中P-338页，情况2中的第二种情况（z节点原先是黑色的）
-                    self._fix_deficit(self.parent(z), self.sibling(z))  # recur upward
-        else:  # Case 3: y is red; rotate misaligned 3-node and repeat
-            self._rotate(y)
-            self._set_black(y)
-            self._set_red(z)
-            # 在执行一次 情况1 或者 情况2中的第一种情况(因为下面的代执行之前，z节点是红色的)
-            if z == self.right(y):
-                self._fix_deficit(z, self.left(z))
-            else:
-                self._fix_deficit(z, self.right(z))
+                self._set_black(middle._left)  # children become black
+                self._set_black(middle._right)
+                return
+            # Case 2: y is black, but no red children; recolor as "fusion". (对应（2，4）树)
+            self._set_red(y)
+            if self._is_red(z):
+                # 书中P-338页，情况2中的第一种情况（z节点原先是红色的）
+                self._set_black(z)  # this resolves the problem
+                return
+            if z._parent is None:  # 如果z是整个树的根节点，那就不需再向上传递了，因为在删除节点并进行了一系列的结构调整后，整个树的黑色深度减少了1
+                return
+            # 书中P-338页，情况2中的第二种情况（z节点原先是黑色的）
+            z, y = z._parent, self._sibling_node(z)  # repeat upward
+
+    # ------------------------- support for bulk operations -------------------------
+    def _rotate(self, x):
+        y = x._parent
+        super()._rotate(x)
+        self._recompute_black_height(y)  # y is now a child of x
+        self._recompute_black_height(x)
+
+    def _link(self, node, left, right):
+        super()._link(node, left, right)
+        self._recompute_black_height(node)
+        return node
+
+    def _rebalance_build(self, node, depth, max_depth):
+        # 完全平衡的树中，只有最深一层的节点为红色，其余为黑色
+        node._red = depth == max_depth and depth > 0
+
+    def _join(self, left, node, right):
+        """Return root of a red-black subtree holding the nodes of left, then node, then the nodes of right."""
+        # 时间复杂度: O(|bh(left) - bh(right)| + 1), bh为黑高度
+        for root in (left, right):
+            if root is not None and root._red:
+                self._set_black(root)  # a red root may always be made black
+        left_height = left._black_height if left is not None else 0
+        right_height = right._black_height if right is not None else 0
+        if left_height == right_height:
+            node._red = False
+            return self._link(node, left, right)  # node can simply be the new root
+        # walk down the inner spine of the taller tree to a black node of equal black height
+        go_right = left_height > right_height
+        target = min(left_height, right_height)
+        parent, walk = None, (left if go_right else right)
+        while walk is not None and (walk._red or walk._black_height > target):
+            parent, walk = walk, (walk._right if go_right else walk._left)
+        node._red = True  # like an insertion, a red node takes walk's place
+        if go_right:
+            self._link(node, walk, right)
+        else:
+            self._link(node, left, walk)
+        self._graft(parent, node, not go_right)
+        self._resolve_red(node)
+        self._recompute_black_heights(node)
+        return self._subtree_root(node)
 
     def __repr__(self):
         """print返回的数据"""
@@ -167,3 +242,7 @@ if __name__ == '__main__':
     red_black_tree.delete(red_black_tree.last())
     print(f'red_black_tree={red_black_tree}')
     print('- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - ')
+
+    print(f"key '5' 的排名={red_black_tree.rank('5')}, 排名为 0 的key={red_black_tree.select(0)}")
+    print(f"中位数key={red_black_tree.median()}, ['3', '6') 之间的key个数={red_black_tree.count_range('3', '6')}")
+    print('- - - - - - - - - - - - - - - - - - - - - - - - - - - - - - ')
@@ -26,29 +26,29 @@ class SplayTreeMap(TreeMap):
     """Sorted map implementation using a splay tree."""
 
     # --------------------------------- splay operation --------------------------------
-    def _splay(self, p):
-        while p != self.root():
-            parent = self.parent(p)
-            grand = self.parent(parent)
+    def _splay(self, x):
+        while x._parent is not None:  # until x is the root
+            parent = x._parent
+            grand = parent._parent
             if grand is None:
                 # zig case
-                self._rotate(p)
-            elif (parent == self.left(grand)) == (p == self.left(parent)):
+                self._rotate(x)
+            elif (parent is grand._left) == (x is parent._left):
                 # zig-zig case
                 self._rotate(parent)  # move PARENT up
-                self._rotate(p)  # then move p up
+                self._rotate(x)  # then move x up
             else:
                 # zig-zag case
-                self._rotate(p)  # move p up
-                self._rotate(p)  # move p up again
+                self._rotate(x)  # move x up
+                self._rotate(x)  # move x up again
 
     # ---------------------------- override balancing hooks ----------------------------
-    def _rebalance_insert(self, p):
-        self._splay(p)
+    def _rebalance_insert(self, node):
+        self._splay(node)
 
-    def _rebalance_delete(self, p):
-        if p is not None:
-            self._splay(p)
+    def _rebalance_delete(self, node):
+        if node is not None:
+            self._splay(node)
 
-    def _rebalance_access(self, p):
-        self._splay(p)
+    def _rebalance_access(self, node):
+        self._splay(node)
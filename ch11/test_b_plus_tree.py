@@ -0,0 +1,145 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from random import Random
+
+import pytest
+
+from ch11.b_plus_tree import BPlusTreeMap
+
+
+def _check_node(t, node, lo, hi, is_root, leaves):
+    """Return the depth of the leaves below node, checking sizes and key bounds."""
+    if node._is_leaf:
+        assert node._keys == sorted(node._keys) and len(node._keys) == len(node._values)
+        assert is_root or t._min <= len(node._keys) <= t._order
+        assert all((lo is None or lo <= k) and (hi is None or k < hi) for k in node._keys)
+        leaves.append(node)
+        return 0
+    assert (len(node._children) >= 2) if is_root else (t._min <= len(node._children) <= t._order)
+    assert len(node._keys) == len(node._children) - 1
+    bounds = [lo] + node._keys + [hi]
+    depths = {_check_node(t, c, bounds[i], bounds[i + 1], False, leaves) for i, c in enumerate(node._children)}
+    assert len(depths) == 1  # every leaf at the same depth
+    return 1 + depths.pop()
+
+
+def _check_tree(t):
+    """Check the node invariants and the doubly linked leaf chain."""
+    leaves = []
+    _check_node(t, t._root, None, None, True, leaves)
+    assert leaves[0]._prev is None and leaves[-1]._next is None
+    for a, b in zip(leaves, leaves[1:]):
+        assert a._next is b and b._prev is a
+    assert sum(len(leaf._keys) for leaf in leaves) == len(t)
+
+
+def _check_queries(t, ref, rng):
+    """Compare the sorted-map queries of t with answers computed from dict ref."""
+    keys = sorted(ref)
+    pair = lambda i: (keys[i], ref[keys[i]]) if 0 <= i < len(keys) else None
+    k = rng.randrange(-5, 505)
+    assert t.get(k) == ref.get(k)
+    assert t.find_le(k) == pair(bisect_right(keys, k) - 1)
+    assert t.find_lt(k) == pair(bisect_left(keys, k) - 1)
+    assert t.find_ge(k) == pair(bisect_left(keys, k))
+    assert t.find_gt(k) == pair(bisect_right(keys, k))
+    start, stop = rng.randrange(520), rng.randrange(520)
+    assert list(t.find_range(start, stop)) == [(j, ref[j]) for j in keys if start <= j < stop]
+    assert list(t.find_range(None, stop)) == [(j, ref[j]) for j in keys if j < stop]
+    assert list(t.find_range(start, None)) == [(j, ref[j]) for j in keys if start <= j]
+    assert list(t) == keys and list(reversed(t)) == keys[::-1]
+    assert t.find_min() == pair(0) and t.find_max() == pair(len(keys) - 1)
+    walked = []
+    p = t.first()
+    while p is not None:
+        walked.append(p.key())
+        p = t.after(p)
+    assert walked == keys
+    walked = []
+    p = t.last()
+    while p is not None:
+        walked.append(p.key())
+        p = t.before(p)
+    assert walked == keys[::-1]
+
+
+def test_agrees_with_dict():
+    rng = Random(37)
+    for order in (4, 5, 9, 64):
+        for _ in range(3):
+            t = BPlusTreeMap(order)
+            ref = {}
+            for step in range(1500):
+                k = rng.randrange(500)
+                op = rng.random()
+                if op < 0.45:
+                    t[k] = step
+                    ref[k] = step
+                elif op < 0.7:
+                    if k in ref:
+                        del t[k]
+                        del ref[k]
+                    else:
+                        with pytest.raises(KeyError):
+                            del t[k]
+                elif op < 0.75 and ref:
+                    p = t.find_position(k)  # the nearest position if k is absent
+                    del ref[p.key()]
+                    t.delete(p)
+                else:
+                    _check_queries(t, ref, rng)
+                assert len(t) == len(ref)
+                _check_tree(t)
+            for k in list(ref):
+                del t[k]
+            _check_tree(t)
+            assert len(t) == 0 and t.first() is None and list(t.find_range(None, None)) == []
+
+
+def test_sequential_keys():
+    for order in (4, 64):
+        t = BPlusTreeMap(order)
+        for k in range(3000):
+            t[k] = -k
+        _check_tree(t)
+        assert list(t.find_range(1500, 1505)) == [(k, -k) for k in range(1500, 1505)]
+        for k in range(2999, -1, -2):  # remove from the right end
+            del t[k]
+        _check_tree(t)
+        assert list(t) == list(range(0, 3000, 2))
+
+
+def test_positions_are_invalidated():
+    t = BPlusTreeMap(4)
+    for k in range(20):
+        t[k] = k
+    p = t.find_position(5)
+    t[5] = 'five'  # reassigning a value keeps positions valid
+    assert p.value() == 'five' and t.after(p).key() == 6
+    t[100] = 100
+    with pytest.raises(ValueError):
+        t.after(p)
+    with pytest.raises(ValueError):
+        t.delete(p)
+    with pytest.raises(ValueError):
+        BPlusTreeMap(3)
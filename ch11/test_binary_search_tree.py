@@ -0,0 +1,267 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from bisect import bisect_left, bisect_right
+from random import Random
+
+import pytest
+
+from ch11.avl_tree import AVLTreeMap
+from ch11.binary_search_tree import TreeMap
+from ch11.red_black_tree import RedBlackTreeMap
+from ch11.splay_tree import SplayTreeMap
+
+
+def _check_avl(node):
+    """Return the height of an AVL subtree, checking balance and the stored heights."""
+    if node is None:
+        return 0
+    a, b = _check_avl(node._left), _check_avl(node._right)
+    assert abs(a - b) <= 1 and node._height == 1 + max(a, b)
+    return 1 + max(a, b)
+
+
+def _check_red_black(node):
+    """Return the black height of a red-black subtree, checking the red and black rules."""
+    if node is None:
+        return 1
+    if node._red:
+        assert not (node._left and node._left._red) and not (node._right and node._right._red)
+    a, b = _check_red_black(node._left), _check_red_black(node._right)
+    assert a == b
+    return a + (0 if node._red else 1)
+
+
+def _check_links(node, parent):
+    """Return the size of a subtree, checking the parent links and stored sizes."""
+    if node is None:
+        return 0
+    assert node._parent is parent
+    size = 1 + _check_links(node._left, node) + _check_links(node._right, node)
+    assert node._size == size
+    return size
+
+
+def _check_tree(t):
+    """Check every invariant that applies to the type of tree t."""
+    assert _check_links(t._root, None) == len(t)
+    if isinstance(t, AVLTreeMap):
+        _check_avl(t._root)
+    if isinstance(t, RedBlackTreeMap):
+        assert t._root is None or not t._root._red
+        _check_red_black(t._root)
+
+
+MAP_TYPES = (TreeMap, AVLTreeMap, RedBlackTreeMap, SplayTreeMap)
+
+
+def _check_queries(t, ref, rng):
+    """Compare the sorted-map queries of t with answers computed from dict ref."""
+    keys = sorted(ref)
+    pair = lambda i: (keys[i], ref[keys[i]]) if 0 <= i < len(keys) else None
+    k = rng.randrange(-5, 205)
+    assert t.get(k) == ref.get(k)
+    assert t.find_le(k) == pair(bisect_right(keys, k) - 1)
+    assert t.find_lt(k) == pair(bisect_left(keys, k) - 1)
+    assert t.find_ge(k) == pair(bisect_left(keys, k))
+    assert t.find_gt(k) == pair(bisect_right(keys, k))
+    start, stop = sorted(rng.randrange(-5, 205) for _ in range(2))
+    assert list(t.find_range(start, stop)) == [(j, ref[j]) for j in keys if start <= j < stop]
+    assert list(t.find_range(None, stop)) == [(j, ref[j]) for j in keys if j < stop]
+    assert list(t) == keys and list(reversed(t)) == keys[::-1]
+    assert t.find_min() == pair(0) and t.find_max() == pair(len(keys) - 1)
+    if keys:
+        assert t.first().key() == keys[0] and t.last().key() == keys[-1]
+        i = len(keys) // 2
+        p = t.find_position(keys[i])
+        q = t.after(p)
+        assert (q.key() if q else None) == (keys[i + 1] if i + 1 < len(keys) else None)
+        q = t.before(p)
+        assert (q.key() if q else None) == (keys[i - 1] if i > 0 else None)
+
+
+def test_agrees_with_dict():
+    rng = Random(34)
+    for map_type in MAP_TYPES:
+        for _ in range(10):
+            t = map_type()
+            ref = {}
+            for _ in range(400):
+                k = rng.randrange(200)
+                op = rng.random()
+                if op < 0.5:
+                    t[k] = 3 * k
+                    ref[k] = 3 * k
+                elif op < 0.75:
+                    if k in ref:
+                        del t[k]
+                        del ref[k]
+                    else:
+                        with pytest.raises(KeyError):
+                            del t[k]
+                elif op < 0.8 and ref:
+                    p = t.find_position(k)  # the nearest position if k is absent
+                    del ref[p.key()]
+                    t.delete(p)
+                else:
+                    _check_queries(t, ref, rng)
+                assert len(t) == len(ref)
+                _check_tree(t)
+
+
+def test_deep_trees_do_not_recurse():
+    for map_type in (TreeMap, SplayTreeMap):
+        t = map_type()
+        for k in range(5000):  # sorted insertions build a path for an unbalanced tree
+            t[k] = k
+        assert t[0] == 0 and t.find_le(4999.5) == (4999, 4999)
+        assert list(t.find_range(4990, None)) == [(k, k) for k in range(4990, 5000)]
+        for k in range(0, 5000, 2):
+            del t[k]
+        assert len(t) == 2500 and t.find_min() == (1, 1)
+
+
+def test_order_statistics():
+    rng = Random(35)
+    for map_type in MAP_TYPES:
+        t = map_type()
+        ref = {}
+        for _ in range(2000):
+            k = rng.randrange(150)
+            op = rng.random()
+            if op < 0.45:
+                t[k] = k
+                ref[k] = k
+            elif op < 0.65:
+                if k in ref:
+                    del t[k]
+                    del ref[k]
+            elif op < 0.75 and ref:
+                p = t.find_position(k)
+                del ref[p.key()]
+                t.delete(p)
+            else:
+                keys = sorted(ref)
+                assert t.rank(k) == bisect_left(keys, k)
+                if keys:
+                    i = rng.randrange(-len(keys), len(keys))
+                    assert t.select(i) == keys[i]
+                    assert t.median() == keys[(len(keys) - 1) // 2]
+                else:
+                    assert t.median() is None
+                start, stop = rng.randrange(160), rng.randrange(160)
+                assert t.count_range(start, stop) == max(0, bisect_left(keys, stop) - bisect_left(keys, start))
+                assert t.count_range(None, stop) == bisect_left(keys, stop)
+                assert t.count_range(start, None) == len(keys) - bisect_left(keys, start)
+            _check_tree(t)
+        with pytest.raises(IndexError):
+            t.select(len(t))
+        with pytest.raises(IndexError):
+            t.select(-len(t) - 1)
+
+
+def test_set_operations():
+    rng = Random(36)
+    for map_type in MAP_TYPES:
+        for _ in range(40):
+            a = {rng.randrange(400): rng.random() for _ in range(rng.choice([0, 1, 5, 50, 300]))}
+            b = {rng.randrange(400): rng.random() for _ in range(rng.choice([0, 1, 5, 50, 300]))}
+            for other_type in MAP_TYPES + (dict,):
+                other = other_type(b) if other_type is dict else other_type.from_items(b)
+                t = map_type.from_items(a)
+                t.union(other)
+                _check_tree(t)
+                assert dict(t.items()) == {**a, **b}
+                t = map_type.from_items(a)
+                t.intersection(other)
+                _check_tree(t)
+                assert dict(t.items()) == {k: v for k, v in a.items() if k in b}
+                t = map_type.from_items(a)
+                t.difference(other)
+                _check_tree(t)
+                assert dict(t.items()) == {k: v for k, v in a.items() if k not in b}
+                assert dict(other.items()) == b  # other is only read
+            t = map_type.from_items(a)
+            t.update_many(b.items())
+            _check_tree(t)
+            assert dict(t.items()) == {**a, **b}
+
+
+def test_failed_set_operation_keeps_map():
+    for map_type in MAP_TYPES:
+        for op in ('union', 'intersection', 'difference', 'update_many'):
+            t = map_type.from_items((k, k) for k in range(100))
+            with pytest.raises(TypeError):  # 'a' cannot be compared with the int keys
+                getattr(t, op)({'a': 1} if op != 'update_many' else [('a', 1)])
+            _check_tree(t)
+            assert list(t.items()) == [(k, k) for k in range(100)]
+            t[100] = 100  # the map remains usable
+            t.union({k: -k for k in range(50, 150)})
+            _check_tree(t)
+            assert len(t) == 150 and t[60] == -60
+
+
+class _Poison:
+    """A key ordered among floats that cannot be compared with an int."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def _compare(self, other):
+        if type(other) is int:
+            raise TypeError('poisoned comparison')
+        return self._value - (other._value if isinstance(other, _Poison) else other)
+
+    __lt__ = lambda self, other: self._compare(other) < 0
+    __gt__ = lambda self, other: self._compare(other) > 0
+    __eq__ = lambda self, other: self._compare(other) == 0
+    __hash__ = object.__hash__
+
+
+def test_failure_midway_keeps_map_valid():
+    for map_type in MAP_TYPES:
+        for op in ('union', 'intersection', 'difference'):
+            t = map_type.from_items((k, k) for k in range(200))
+            other = AVLTreeMap.from_items([(k + 0.5, 0) for k in range(0, 200, 3)] + [(_Poison(77.7), 0)])
+            with pytest.raises(TypeError):
+                getattr(t, op)(other)
+            _check_tree(t)
+            ints = [k for k in t if type(k) is int]
+            if op == 'union':  # some float keys may have been added
+                assert ints == list(range(200))
+            else:  # some int keys may have been removed
+                assert set(ints) <= set(range(200)) and len(ints) == len(t)
+            t.update_many((k, k) for k in range(300, 310))
+            _check_tree(t)
+
+
+def test_set_operations_on_deep_trees():
+    for map_type in (TreeMap, SplayTreeMap):
+        t = map_type()
+        for k in range(3000):  # sorted insertions build a path
+            t[k] = k
+        t.update_many([(5000, 1)])
+        t.union({5001: 2})
+        assert len(t) == 3002 and t[5000] == 1 and t.find_max() == (5001, 2)
+        t.difference(range(0, 3000, 2))
+        t.intersection(TreeMap.from_items((k, k) for k in range(1000)))
+        assert list(t) == list(range(1, 1000, 2))
+        _check_tree(t)
@@ -0,0 +1,242 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from bisect import bisect_left, bisect_right
+from random import Random
+
+import pytest
+
+from ch11.disk_b_plus_tree import DiskBPlusTreeMap
+
+
+def _check_tree(t):
+    """Check the key bounds, the leaf chain and that every page is either in the tree or free."""
+    seen = set()
+    leaves = []
+    stack = [(t._root, None, None)]
+    while stack:
+        pid, lo, hi = stack.pop()
+        assert pid not in seen
+        seen.add(pid)
+        node = t._get(pid)
+        assert node._used <= t._payload and node._keys == sorted(node._keys)
+        assert all((lo is None or lo <= k) and (hi is None or k < hi) for k in node._keys)
+        if node._is_leaf:
+            leaves.append(node)
+        else:
+            bounds = [lo] + node._keys + [hi]
+            stack.extend((c, bounds[i], bounds[i + 1]) for i, c in reversed(list(enumerate(node._children))))
+    assert leaves[0]._prev == 0 and leaves[-1]._next == 0
+    for a, b in zip(leaves, leaves[1:]):
+        assert a._next == b._id and b._prev == a._id
+    assert sum(len(leaf._keys) for leaf in leaves) == len(t)
+    free = set()
+    pid = t._free
+    while pid:
+        free.add(pid)
+        pid = t._NODE.unpack(os.pread(t._fd, t._NODE.size, pid * t._page_size))[3]
+    assert not free & seen and len(free) + len(seen) + 1 == t._pages
+    t._trim()
+
+
+def _crash(t):
+    """Abandon t without flushing, as if the process had died."""
+    os.close(t._fd)
+    if t._journal is not None:
+        os.close(t._journal)
+    t._fd = None
+
+
+def _mutate(t, ref, rng, steps):
+    for step in range(steps):
+        k = rng.randrange(1000)
+        if rng.random() < 0.6:
+            v = ('x' * rng.randrange(10), step)
+            t[k] = v
+            ref[k] = v
+        elif k in ref:
+            del t[k]
+            del ref[k]
+
+
+def test_agrees_with_dict(tmp_path):
+    rng = Random(38)
+    for page_size, cache_pages in ((256, 1), (256, 4), (4096, 100)):
+        t = DiskBPlusTreeMap(str(tmp_path / str(page_size * cache_pages)), page_size, cache_pages)
+        ref = {}
+        for step in range(2000):
+            k = rng.randrange(1000)
+            op = rng.random()
+            if op < 0.45:
+                v = ('x' * rng.randrange(8), step)
+                t[k] = v
+                ref[k] = v
+            elif op < 0.75:
+                if k in ref:
+                    del t[k]
+                    del ref[k]
+                else:
+                    with pytest.raises(KeyError):
+                        del t[k]
+            elif op < 0.8 and ref:
+                p = t.find_position(k)  # the nearest position if k is absent
+                del ref[p.key()]
+                t.delete(p)
+            else:
+                keys = sorted(ref)
+                pair = lambda i: (keys[i], ref[keys[i]]) if 0 <= i < len(keys) else None
+                assert t.find_ge(k) == pair(bisect_left(keys, k)) and t.find_gt(k) == pair(bisect_right(keys, k))
+                assert t.find_lt(k) == pair(bisect_left(keys, k) - 1) and t.find_le(k) == pair(bisect_right(keys, k) - 1)
+                start, stop = rng.randrange(1100), rng.randrange(1100)
+                assert list(t.find_range(start, stop)) == [(j, ref[j]) for j in keys if start <= j < stop]
+                assert t.find_min() == pair(0) and t.find_max() == pair(len(keys) - 1)
+                assert list(t) == keys and list(reversed(t)) == keys[::-1]
+                walked = []
+                p = t.first()
+                while p is not None:
+                    walked.append((p.key(), p.value()))
+                    p = t.after(p)
+                assert walked == [(j, ref[j]) for j in keys]
+                walked = []
+                p = t.last()
+                while p is not None:
+                    walked.append(p.key())
+                    p = t.before(p)
+                assert walked == keys[::-1]
+            assert len(t) == len(ref)
+            if step % 100 == 0:
+                _check_tree(t)
+        t.close()
+
+
+def test_bulk_load_and_reopen(tmp_path):
+    path = str(tmp_path / 'map')
+    pairs = [(k, str(k)) for k in range(5000, 0, -3)] + [(2, 'again')]
+    with DiskBPlusTreeMap(path, page_size=512, cache_pages=8) as t:
+        t.update_many(pairs)
+        _check_tree(t)
+        del t[2]
+        t[2] = 'two'
+    ref = dict(pairs)
+    ref[2] = 'two'
+    with DiskBPlusTreeMap(path, page_size=4096) as t:  # an existing file keeps its page size
+        assert t._page_size == 512 and len(t) == len(ref)
+        assert list(t.find_range(None, None)) == sorted(ref.items())
+        _check_tree(t)
+        with pytest.raises(ValueError):
+            t[10 ** 6] = 'x' * 200  # more than a quarter of a page
+    with open(path, 'r+b') as f:
+        f.write(b'NOTATREE')
+    with pytest.raises(ValueError):
+        DiskBPlusTreeMap(path)
+
+
+def test_positions_are_invalidated(tmp_path):
+    with DiskBPlusTreeMap(str(tmp_path / 'map'), page_size=256, cache_pages=1) as t:
+        assert t.first() is None and t.last() is None and t.find_position(3) is None
+        t.update_many((k, k) for k in range(100))
+        p = t.find_position(50)
+        t[50] = 'fifty'  # reassigning a value keeps positions valid
+        assert p.value() == 'fifty' and t.after(p).key() == 51 and t.before(p).key() == 49
+        assert p == t.find_position(50) and p != t.find_position(51)
+        assert t.find_position(1000) == t.last() and t.last().key() == 99
+        t[100] = 100
+        with pytest.raises(ValueError):
+            t.after(p)
+        with pytest.raises(ValueError):
+            t.delete(p)
+        with pytest.raises(TypeError):
+            t.delete(50)
+
+
+def test_crash_rolls_back_to_last_flush(tmp_path):
+    rng = Random(39)
+    for cache_pages in (1, 4, 1000):
+        path = str(tmp_path / str(cache_pages))
+        t = DiskBPlusTreeMap(path, page_size=256, cache_pages=cache_pages)
+        ref = {}
+        _mutate(t, ref, rng, 300)  # a crash before the first flush returns to the new file
+        _crash(t)
+        t = DiskBPlusTreeMap(path)
+        assert len(t) == 0 and list(t) == []
+        t.update_many((k, k) for k in range(0, 1000, 2))
+        ref = {k: k for k in range(0, 1000, 2)}
+        for _ in range(3):
+            t.flush()
+            flushed = dict(ref)
+            _mutate(t, ref, rng, 500)  # splits, evictions and freed pages after the flush
+            _crash(t)
+            assert os.path.exists(path + '-journal')
+            t = DiskBPlusTreeMap(path, cache_pages=cache_pages)
+            assert not os.path.exists(path + '-journal')
+            assert dict(t.find_range(None, None)) == flushed and len(t) == len(flushed)
+            _check_tree(t)
+            ref = flushed
+        _mutate(t, ref, rng, 200)  # the recovered map remains usable
+        t.close()
+        with DiskBPlusTreeMap(path) as t:
+            assert dict(t.find_range(None, None)) == ref
+            _check_tree(t)
+
+
+def test_dirty_file_without_journal(tmp_path):
+    path = str(tmp_path / 'map')
+    t = DiskBPlusTreeMap(path)
+    t[1] = 'one'
+    _crash(t)
+    os.remove(path + '-journal')
+    with pytest.raises(ValueError):
+        DiskBPlusTreeMap(path)
+
+
+def _set_dirty_flag(path, dirty):
+    """Overwrite the dirty flag of the header, as if only some writes had reached the disk."""
+    with open(path, 'r+b') as f:
+        f.seek(12)  # after the magic and the page size
+        f.write(dirty.to_bytes(4, 'little'))
+
+
+def test_journal_is_used_even_if_the_flag_was_lost(tmp_path):
+    path = str(tmp_path / 'map')
+    with DiskBPlusTreeMap(path, page_size=256, cache_pages=1) as t:
+        t.update_many((k, k) for k in range(500))
+    t = DiskBPlusTreeMap(path, cache_pages=1)
+    _mutate(t, {}, Random(40), 300)  # evicted pages are overwritten
+    _crash(t)
+    _set_dirty_flag(path, 0)
+    with DiskBPlusTreeMap(path) as t:
+        assert dict(t.find_range(None, None)) == {k: k for k in range(500)}
+        _check_tree(t)
+
+
+def test_emptied_journal_means_committed(tmp_path):
+    path = str(tmp_path / 'map')
+    with DiskBPlusTreeMap(path, page_size=256) as t:
+        t.update_many((k, k) for k in range(500))
+        t.flush()
+        del t[7]
+    _set_dirty_flag(path, 1)  # a crash after the journal was emptied, before the flag was cleared
+    open(path + '-journal', 'wb').close()
+    with DiskBPlusTreeMap(path) as t:
+        assert len(t) == 499 and 7 not in t
+        _check_tree(t)
+    assert not os.path.exists(path + '-journal')
@@ -0,0 +1,69 @@
+# Copyright 2013, Michael H. Goldwasser
+#
+# Developed for use with the book:
+#
+#    Data Structures and Algorithms in Python
+#    Michael T. Goodrich, Roberto Tamassia, and Michael H. Goldwasser
+#    John Wiley & Sons, 2013
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gc
+import sys
+from random import randrange, random
+from time import perf_counter
+
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ch09.pairing_heap_priority_queue import PairingHeapPriorityQueue
+from ch14.graph import Graph
+from ch14.mst import MST_PrimJarnik
+from ch14.shortest_paths import shortest_path_lengths
+
+try:
+  maxN = int(sys.argv[1])
+except:
+  maxN = 20000
+
+DEGREE = 4                          # average number of edges per vertex
+
+def random_sparse_graph(n, m):
+  """Return a connected, undirected graph with n vertices and about m random weighted edges."""
+  g = Graph()
+  verts = [g.insert_vertex(j) for j in range(n)]
+  for j in range(1, n):             # a random spanning tree keeps the graph connected
+    g.insert_edge(verts[randrange(j)], verts[j], random())
+  for _ in range(m - (n - 1)):
+    u, v = randrange(n), randrange(n)
+    if u != v and g.get_edge(verts[u], verts[v]) is None:
+      g.insert_edge(verts[u], verts[v], random())
+  return g
+
+def timed(fn, *args, **kwargs):
+  """Return elapsed time of fn(*args, **kwargs)."""
+  start = perf_counter()
+  fn(*args, **kwargs)
+  return perf_counter() - start
+
+if __name__ == '__main__':
+  # 不同的可适应优先队列在 Dijkstra 与 Prim-Jarnik 算法上的耗时对比(单位: 秒)
+  g = random_sparse_graph(maxN, DEGREE * maxN)
+  src = next(iter(g.vertices()))
+  print('n = {0}, m = {1}'.format(g.vertex_count(), g.edge_count()))
+  print('{0:<30}{1:>10}{2:>10}'.format('priority queue', 'dijkstra', 'prim'))
+  gc.disable()                      # as timeit does, keep collector pauses out of the measurement
+  for pq_type in (AdaptableHeapPriorityQueue, PairingHeapPriorityQueue):
+    print('{0:<30}{1:>10.3f}{2:>10.3f}'.format(pq_type.__name__,
+          timed(shortest_path_lengths, g, src, pq_type=pq_type),
+          timed(MST_PrimJarnik, g, pq_type=pq_type)))
+  gc.enable()
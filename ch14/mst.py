@@ -19,17 +19,21 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from ..ch09.pq import HeapPriorityQueue,AdaptableHeapPriorityQueue
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ch09.heap_priority_queue import HeapPriorityQueue
 from .partition import Partition
 
-def MST_PrimJarnik(g):
+def MST_PrimJarnik(g, pq_type=AdaptableHeapPriorityQueue):
   """Compute a minimum spanning tree of weighted graph g.
 
   Return a list of edges that comprise the MST (in arbitrary order).
+
+  pq_type is the adaptable priority queue class to use; it must provide the
+  Locator API of AdaptableHeapPriorityQueue (e.g. PairingHeapPriorityQueue).
   """
   d = {}                               # d[v] is bound on distance to tree
   tree = []                            # list of edges in spanning tree
-  pq = AdaptableHeapPriorityQueue()   # d[v] maps to value (v, e=(u,v))
+  pq = pq_type()                      # d[v] maps to value (v, e=(u,v))
   pqlocator = {}                       # map from vertex to its pq locator
 
   # for each vertex v of the graph, add an entry to the priority queue, with
@@ -19,19 +19,22 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from ..ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
+from ch09.adaptable_heap_priority_queue import AdaptableHeapPriorityQueue
 
-def shortest_path_lengths(g, src):
+def shortest_path_lengths(g, src, pq_type=AdaptableHeapPriorityQueue):
   """Compute shortest-path distances from src to reachable vertices of g.
 
   Graph g can be undirected or directed, but must be weighted such that
   e.element() returns a numeric weight for each edge e.
 
+  pq_type is the adaptable priority queue class to use; it must provide the
+  Locator API of AdaptableHeapPriorityQueue (e.g. PairingHeapPriorityQueue).
+
   Return dictionary mapping each reachable vertex to its distance from src.
   """
   d = {}                                        # d[v] is upper bound from s to v
   cloud = {}                                    # map reachable v to its d[v] value
-  pq = AdaptableHeapPriorityQueue()             # vertex v will have key d[v]
+  pq = pq_type()                                # vertex v will have key d[v]
   pqlocator = {}                                # map from vertex to its pq locator
 
   # for each vertex v of the graph, add an entry to the priority queue, with